@@ -7,34 +7,123 @@ A sophisticated analysis agent powered by X's Phoenix recommendation system:
 - Text summarization (extractive)
 - Statistical analysis
 - Keyword extraction with relevance scoring
+- Batch analysis of many short texts in one job
 - **Content Recommendations** (Phoenix Grok-based model)
 - Multi-language support preparation
 
 This agent uses Masumi for automated payment verification on Cardano blockchain.
 No manual blockchain integration needed - Masumi handles everything!
 """
+import asyncio
+import heapq
 import logging
 from datetime import datetime
 import json
 from typing import Dict, Any, List, Optional, Tuple
+import os
 import re
+import time
+from operator import itemgetter
+
+from cache import LRUCache, content_hash, text_digest
+from executors import ANALYSIS_PROCESS_WORKERS, run_in_process_pool, run_in_thread_pool
+import json_codec
+from keyword_index import get_document_frequency_table
+from metrics import (
+    JOBS_IN_FLIGHT,
+    RESULT_CACHE_HITS,
+    RESULT_CACHE_MISSES,
+    VALIDATION_FAILURES,
+    observe_stage,
+    time_stage
+)
+from summarizer import textrank
+from text_document import TextDocument
 
 logger = logging.getLogger(__name__)
 
 # Optional: Import Phoenix model service
 try:
-    from model_service import get_model_service
+    from model_service import CandidateInputError, get_model_service, serving_model_version
+    import model_workers
     PHOENIX_AVAILABLE = True
 except ImportError:
     PHOENIX_AVAILABLE = False
     logger.warning("Phoenix model service not available - recommendations disabled")
 
+    class CandidateInputError(ValueError):
+        """Stand-in for model_service.CandidateInputError (never raised without it)."""
+
 # Configuration
 MAX_TEXT_LENGTH = 100000  # Maximum text length to process
 MIN_TEXT_LENGTH = 10      # Minimum text length required
 DEFAULT_SUMMARY_SENTENCES = 3
 DEFAULT_TOP_KEYWORDS = 10
 
+# Per-request cost budget for recommendations, in scored candidates. Large
+# requests are ranked in streaming chunks, so this bounds latency rather
+# than memory
+RECOMMENDATION_MAX_CANDIDATES = int(os.getenv("RECOMMENDATION_MAX_CANDIDATES", "100000"))
+
+# 'candidates' strings at least this long are not parsed up front: they are
+# decoded incrementally while ranking, so the raw string and the full list
+# of parsed candidates are never held together
+CANDIDATES_STREAMING_MIN_CHARS = int(os.getenv("CANDIDATES_STREAMING_MIN_CHARS", str(1024 * 1024)))
+
+# Result cache: identical (analysis_type, input, parameters, model) jobs are
+# served from memory instead of being recomputed
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "300"))
+ANALYZER_VERSION = "3"  # Bump when analyzer output changes to invalidate cached results
+
+# Texts up to this length are analyzed inline; shipping them to a worker
+# process costs more than the analysis itself
+ANALYSIS_INLINE_MAX_CHARS = int(os.getenv("ANALYSIS_INLINE_MAX_CHARS", "2000"))
+
+# Batch jobs: many texts analyzed in one paid job. Batches larger than
+# ANALYSIS_INLINE_MAX_CHARS are split into chunks of about
+# BATCH_CHUNK_CHARS characters that run in parallel on the process pool.
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+BATCH_MAX_TOTAL_CHARS = int(os.getenv("BATCH_MAX_TOTAL_CHARS", "1000000"))
+BATCH_CHUNK_CHARS = int(os.getenv("BATCH_CHUNK_CHARS", "20000"))
+BATCH_ITEM_TYPES = ["sentiment", "summary", "stats", "keywords", "general"]
+
+_result_cache = LRUCache(max_entries=RESULT_CACHE_MAX_ENTRIES, ttl_seconds=RESULT_CACHE_TTL_SECONDS)
+
+# Extended sentiment lexicon
+POSITIVE_WORDS = (
+    'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic',
+    'love', 'best', 'perfect', 'happy', 'awesome', 'brilliant',
+    'superb', 'outstanding', 'exceptional', 'impressive', 'beautiful',
+    'delightful', 'fabulous', 'incredible', 'magnificent', 'marvelous',
+    'phenomenal', 'splendid', 'terrific', 'positive', 'success'
+)
+NEGATIVE_WORDS = (
+    'bad', 'terrible', 'awful', 'horrible', 'worst', 'hate', 'poor',
+    'disappointing', 'sad', 'angry', 'ugly', 'dreadful', 'pathetic',
+    'disgusting', 'abysmal', 'atrocious', 'inferior', 'nasty',
+    'offensive', 'repulsive', 'useless', 'worthless', 'negative',
+    'failure', 'disaster', 'frustrating', 'annoying'
+)
+
+# Common stop words excluded from keyword extraction
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'as', 'by', 'with', 'from', 'is', 'was', 'are', 'were', 'be',
+    'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'should', 'could', 'may', 'might', 'must', 'can', 'this',
+    'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
+})
+KEYWORD_SCORING_MODES = ["frequency", "tfidf"]
+
+# Compiled once at import: one alternation with word boundaries matches every
+# lexicon word, so a single pass over the text finds all sentiment hits.
+_SENTIMENT_POLARITY = {word: 1 for word in POSITIVE_WORDS}
+_SENTIMENT_POLARITY.update({word: -1 for word in NEGATIVE_WORDS})
+_SENTIMENT_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(sorted(_SENTIMENT_POLARITY, key=len, reverse=True)) + r')\b'
+)
+
 async def process_job(identifier_from_purchaser: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     X-Analyst: Production-ready text analysis agent
@@ -49,6 +138,7 @@ async def process_job(identifier_from_purchaser: str, input_data: Dict[str, Any]
     - keywords: Extract relevant keywords with frequency
     - recommendations: Phoenix-powered content recommendations (ML-based)
     - general: Combined analysis (sentiment + stats + keywords)
+    - batch: Many texts in one job, each with its own analysis type
 
     Args:
         identifier_from_purchaser: 26-character hex identifier from buyer's wallet
@@ -56,7 +146,11 @@ async def process_job(identifier_from_purchaser: str, input_data: Dict[str, Any]
             "text": str,                           # Required: Text to analyze
             "analysis_type": str,                  # Optional: Type of analysis (default: "general")
             "max_keywords": int,                   # Optional: Max keywords to extract (default: 10)
-            "summary_sentences": int               # Optional: Summary length (default: 3)
+            "keyword_scoring": str,                # Optional: "frequency" or "tfidf" (default: "frequency")
+            "summary_sentences": int,              # Optional: Summary length (default: 3)
+            "texts": str | list,                   # Batch only: JSON array of texts or
+                                                   #   {"text", "analysis_type"} objects
+            "item_analysis_type": str              # Batch only: type for items without one (default: "general")
         }
 
     Returns:
@@ -73,6 +167,8 @@ async def process_job(identifier_from_purchaser: str, input_data: Dict[str, Any]
     - Provides audit trail
     """
     start_time = datetime.utcnow()
+    JOBS_IN_FLIGHT.inc()
+    parse_start = time.perf_counter()
 
     try:
         # Extract and validate inputs
@@ -80,33 +176,19 @@ async def process_job(identifier_from_purchaser: str, input_data: Dict[str, Any]
 
         # Handle analysis_type - can be string value or array index from UI
         analysis_type_raw = input_data.get("analysis_type", "general")
-        valid_types = ["sentiment", "summary", "stats", "keywords", "recommendations", "general"]
+        valid_types = ["sentiment", "summary", "stats", "keywords", "recommendations", "general", "batch"]
 
         logger.debug(f"Raw analysis_type value: {repr(analysis_type_raw)} (type: {type(analysis_type_raw).__name__})")
 
-        # If it's a number or numeric string (array index from option type), convert to value
-        if isinstance(analysis_type_raw, int):
-            # It's an index
-            analysis_type = valid_types[analysis_type_raw] if 0 <= analysis_type_raw < len(valid_types) else "general"
-        elif isinstance(analysis_type_raw, str) and analysis_type_raw.isdigit():
-            # It's a numeric string
-            idx = int(analysis_type_raw)
-            analysis_type = valid_types[idx] if 0 <= idx < len(valid_types) else "general"
-        elif isinstance(analysis_type_raw, str) and analysis_type_raw.startswith('[') and analysis_type_raw.endswith(']'):
-            # It's array notation like "[0]" - extract the index
-            try:
-                idx = int(analysis_type_raw.strip('[]'))
-                analysis_type = valid_types[idx] if 0 <= idx < len(valid_types) else "general"
-            except (ValueError, IndexError):
-                analysis_type = "general"
-        else:
-            # It's the actual string value
-            analysis_type = analysis_type_raw if analysis_type_raw in valid_types else "general"
+        analysis_type = resolve_option(analysis_type_raw, valid_types, "general")
 
         logger.info(f"Converted analysis_type to: {analysis_type}")
 
         max_keywords = input_data.get("max_keywords", DEFAULT_TOP_KEYWORDS)
         summary_sentences = input_data.get("summary_sentences", DEFAULT_SUMMARY_SENTENCES)
+        keyword_scoring = resolve_option(
+            input_data.get("keyword_scoring", "frequency"), KEYWORD_SCORING_MODES, "frequency"
+        )
 
         # Parse JSON strings for recommendations (they come as text fields but need to be lists)
         if analysis_type == "recommendations":
@@ -116,75 +198,118 @@ async def process_job(identifier_from_purchaser: str, input_data: Dict[str, Any]
             # Parse JSON strings if they're strings
             if isinstance(user_history_str, str):
                 try:
-                    input_data["user_history"] = json.loads(user_history_str)
+                    input_data["user_history"] = json_codec.loads(user_history_str)
                 except json.JSONDecodeError:
+                    VALIDATION_FAILURES.labels(analysis_type=analysis_type).inc()
                     return {
                         "error": "Invalid JSON in 'user_history' field",
                         "status": "failed",
                         "purchaser": identifier_from_purchaser
                     }
             
-            if isinstance(candidates_str, str):
+            if isinstance(candidates_str, str) and len(candidates_str) < CANDIDATES_STREAMING_MIN_CHARS:
                 try:
-                    input_data["candidates"] = json.loads(candidates_str)
+                    input_data["candidates"] = json_codec.loads(candidates_str)
                 except json.JSONDecodeError:
+                    VALIDATION_FAILURES.labels(analysis_type=analysis_type).inc()
                     return {
                         "error": "Invalid JSON in 'candidates' field",
                         "status": "failed",
                         "purchaser": identifier_from_purchaser
                     }
 
+        # Parse the batch texts (a JSON string from the UI) and give every
+        # item its analysis type
+        if analysis_type == "batch":
+            texts = input_data.get("texts")
+            if isinstance(texts, str):
+                try:
+                    texts = json_codec.loads(texts)
+                except json.JSONDecodeError:
+                    VALIDATION_FAILURES.labels(analysis_type=analysis_type).inc()
+                    return {
+                        "error": "Invalid JSON in 'texts' field",
+                        "status": "failed",
+                        "purchaser": identifier_from_purchaser
+                    }
+            # Unknown types are kept as given so validation can report them
+            item_type_raw = input_data.get("item_analysis_type", "general")
+            item_type = resolve_option(item_type_raw, BATCH_ITEM_TYPES, item_type_raw)
+            input_data["item_analysis_type"] = item_type
+            if isinstance(texts, list):
+                texts = normalize_batch_items(texts, item_type)
+            input_data["texts"] = texts
+
+        observe_stage(analysis_type, "parse", time.perf_counter() - parse_start)
+
         logger.info(f"Processing {analysis_type} analysis for purchaser: {identifier_from_purchaser[:8]}...")
         logger.info(f"Text length: {len(text)} characters")
 
         # Input validation
-        validation_error = validate_input(input_data, analysis_type, max_keywords, summary_sentences)
+        with time_stage(analysis_type, "validate"):
+            validation_error = validate_input(input_data, analysis_type, max_keywords, summary_sentences)
         if validation_error:
+            VALIDATION_FAILURES.labels(analysis_type=analysis_type).inc()
             return {
                 "error": validation_error,
                 "status": "failed",
                 "purchaser": identifier_from_purchaser
             }
 
-        # Perform analysis based on type
-        result = {}
-
-        if analysis_type == "sentiment":
-            result = analyze_sentiment(text)
-        elif analysis_type == "summary":
-            result = summarize_text(text, max_sentences=summary_sentences)
-        elif analysis_type == "stats":
-            result = calculate_statistics(text)
-        elif analysis_type == "keywords":
-            result = extract_keywords(text, top_n=max_keywords)
-        elif analysis_type == "recommendations":
-            # Phoenix-powered recommendations
-            result = generate_recommendations(input_data, max_keywords)
+        analyze_start = time.perf_counter()
+
+        # Serve repeated jobs from the result cache
+        cache_key = None
+        if _result_cache.enabled:
+            cache_key = build_cache_key(input_data, analysis_type, max_keywords, summary_sentences, keyword_scoring)
+            cached_result = _result_cache.get(cache_key)
+            if cached_result is not None:
+                RESULT_CACHE_HITS.labels(analysis_type=analysis_type).inc()
+                observe_stage(analysis_type, "analyze", time.perf_counter() - analyze_start)
+                logger.info(f"Serving cached {analysis_type} result for {identifier_from_purchaser[:8]}...")
+                return build_job_response(
+                    identifier_from_purchaser, analysis_type, input_length(input_data, analysis_type),
+                    cached_result, start_time, cached=True
+                )
+            RESULT_CACHE_MISSES.labels(analysis_type=analysis_type).inc()
+
+        # Perform analysis off the event loop so other requests stay responsive
+        if analysis_type == "recommendations":
+            # Phoenix-powered recommendations (NumPy/JAX release the GIL)
+            result = await run_in_thread_pool(generate_recommendations, input_data, max_keywords)
+        elif analysis_type == "batch":
+            result = await run_batch_analysis(input_data["texts"], max_keywords, summary_sentences, keyword_scoring)
+        elif len(text) <= ANALYSIS_INLINE_MAX_CHARS:
+            result = run_text_analysis(analysis_type, text, max_keywords, summary_sentences, keyword_scoring)
+        elif keyword_scoring == "tfidf":
+            # TF-IDF reads and updates this process's document-frequency table
+            result = await run_in_thread_pool(
+                run_text_analysis, analysis_type, text, max_keywords, summary_sentences, keyword_scoring
+            )
         else:
-            # General analysis combines multiple insights
-            result = {
-                "sentiment": analyze_sentiment(text),
-                "stats": calculate_statistics(text),
-                "keywords": extract_keywords(text, top_n=min(5, max_keywords))
-            }
+            result = await run_in_process_pool(
+                run_text_analysis, analysis_type, text, max_keywords, summary_sentences, keyword_scoring
+            )
+        observe_stage(analysis_type, "analyze", time.perf_counter() - analyze_start)
 
         logger.info(f"Analysis completed successfully for {identifier_from_purchaser[:8]}...")
 
-        # Calculate processing time
-        end_time = datetime.utcnow()
-        processing_time = (end_time - start_time).total_seconds()
+        # Failed recommendation results are not cached so they can be retried
+        if cache_key is not None and not (isinstance(result, dict) and "error" in result):
+            _result_cache.put(cache_key, result)
 
-        # Return comprehensive result
+        return build_job_response(
+            identifier_from_purchaser, analysis_type, input_length(input_data, analysis_type), result, start_time
+        )
+
+    except CandidateInputError as e:
+        # Streamed candidates (see CANDIDATES_STREAMING_MIN_CHARS) are only
+        # validated while they are decoded for ranking
+        VALIDATION_FAILURES.labels(analysis_type="recommendations").inc()
         return {
-            "result": result,
-            "metadata": {
-                "purchaser": identifier_from_purchaser,
-                "analysis_type": analysis_type,
-                "processing_time_seconds": processing_time,
-                "timestamp": end_time.isoformat(),
-                "text_length": len(text)
-            },
-            "status": "completed"
+            "error": str(e),
+            "status": "failed",
+            "purchaser": identifier_from_purchaser
         }
 
     except Exception as e:
@@ -195,6 +320,381 @@ async def process_job(identifier_from_purchaser: str, input_data: Dict[str, Any]
             "purchaser": identifier_from_purchaser
         }
 
+    finally:
+        JOBS_IN_FLIGHT.dec()
+
+
+async def process_job_json(identifier_from_purchaser: str, input_data: Dict[str, Any]) -> str:
+    """
+    Run process_job and render its response as the JSON string masumi stores.
+
+    masumi would serialize a non-string result with json.dumps; rendering
+    it here lets the serialize stage be measured and use the faster JSON
+    backend when available (see json_codec). The stored text is compact
+    JSON, so it is not byte-for-byte what masumi's json.dumps would store
+    (that puts a space after every "," and ":"), but it parses to the same
+    value.
+
+    Args:
+        identifier_from_purchaser: Buyer identifier
+        input_data: Job input (see process_job)
+
+    Returns:
+        JSON-encoded job response
+    """
+    response = await process_job(identifier_from_purchaser, input_data)
+    analysis_type = response.get("metadata", {}).get("analysis_type", "unknown")
+    with time_stage(analysis_type, "serialize"):
+        return json_codec.dumps(response)
+
+
+def run_text_analysis(
+    analysis_type: str,
+    text: str,
+    max_keywords: int,
+    summary_sentences: int,
+    keyword_scoring: str = "frequency"
+) -> Dict[str, Any]:
+    """
+    Run the text analyzers for one validated job
+
+    Module-level and synchronous so it can be shipped to a worker process.
+
+    Args:
+        analysis_type: Normalized analysis type (any type except recommendations)
+        text: Text to analyze
+        max_keywords: Maximum number of keywords
+        summary_sentences: Number of summary sentences
+        keyword_scoring: Keyword scoring mode ("frequency" or "tfidf")
+
+    Returns:
+        Analysis result
+    """
+    # Tokenize once per job; every text analyzer reads from this document
+    doc = TextDocument(text)
+
+    if analysis_type == "sentiment":
+        return analyze_sentiment(text, doc=doc)
+    elif analysis_type == "summary":
+        return summarize_text(text, max_sentences=summary_sentences, doc=doc)
+    elif analysis_type == "stats":
+        return calculate_statistics(text, doc=doc)
+    elif analysis_type == "keywords":
+        return extract_keywords(text, top_n=max_keywords, doc=doc, scoring=keyword_scoring)
+
+    # General analysis combines multiple insights
+    return {
+        "sentiment": analyze_sentiment(text, doc=doc),
+        "stats": calculate_statistics(text, doc=doc),
+        "keywords": extract_keywords(text, top_n=min(5, max_keywords), doc=doc, scoring=keyword_scoring)
+    }
+
+
+def normalize_batch_items(texts: List[Any], default_type: str) -> List[Dict[str, Any]]:
+    """
+    Normalize batch items to {"text", "analysis_type"} dicts
+
+    Items are either plain strings, analyzed with default_type, or objects
+    with a "text" and an optional "analysis_type" (value or option index).
+    Invalid items keep a None text, and unknown analysis types their raw
+    value, so validation can report them.
+
+    Args:
+        texts: Raw batch items
+        default_type: Analysis type for items without one
+
+    Returns:
+        One dict per item, in order
+    """
+    items = []
+    for item in texts:
+        if isinstance(item, dict):
+            item_type = item.get("analysis_type", default_type)
+            items.append({
+                "text": item.get("text"),
+                "analysis_type": resolve_option(item_type, BATCH_ITEM_TYPES, item_type)
+            })
+        else:
+            items.append({"text": item if isinstance(item, str) else None, "analysis_type": default_type})
+    return items
+
+
+def analyze_batch_items(
+    items: List[Dict[str, Any]],
+    max_keywords: int,
+    summary_sentences: int,
+    keyword_scoring: str = "frequency"
+) -> List[Any]:
+    """
+    Run the text analyzers for a list of batch items
+
+    Module-level and synchronous so a chunk of items can be shipped to a
+    worker process as one task.
+
+    Returns:
+        One analysis result per item, in order
+    """
+    return [
+        run_text_analysis(item["analysis_type"], item["text"], max_keywords, summary_sentences, keyword_scoring)
+        for item in items
+    ]
+
+
+def chunk_batch_items(items: List[Dict[str, Any]], chunk_chars: int) -> List[List[Dict[str, Any]]]:
+    """Split items into consecutive chunks of about chunk_chars characters each."""
+    chunks = []
+    current = []
+    current_chars = 0
+    for item in items:
+        current.append(item)
+        current_chars += len(item["text"])
+        if current_chars >= chunk_chars:
+            chunks.append(current)
+            current = []
+            current_chars = 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def run_batch_analysis(
+    items: List[Dict[str, Any]],
+    max_keywords: int,
+    summary_sentences: int,
+    keyword_scoring: str = "frequency"
+) -> Dict[str, Any]:
+    """
+    Analyze every item of a validated batch job
+
+    Small batches run inline. Larger ones are split into chunks analyzed in
+    parallel on the process pool, so per-task overhead is paid per chunk
+    rather than per item. TF-IDF batches run on one thread because they
+    read and update this process's document-frequency table.
+
+    Args:
+        items: Normalized batch items
+        max_keywords: Maximum number of keywords per item
+        summary_sentences: Number of summary sentences per item
+        keyword_scoring: Keyword scoring mode
+
+    Returns:
+        {"results": [{"index", "analysis_type", "result"}], "aggregate": {...}}
+    """
+    total_chars = sum(len(item["text"]) for item in items)
+
+    if total_chars <= ANALYSIS_INLINE_MAX_CHARS:
+        results = analyze_batch_items(items, max_keywords, summary_sentences, keyword_scoring)
+    elif keyword_scoring == "tfidf":
+        results = await run_in_thread_pool(
+            analyze_batch_items, items, max_keywords, summary_sentences, keyword_scoring
+        )
+    else:
+        # Enough chunks to keep every worker busy, none smaller than BATCH_CHUNK_CHARS
+        chunk_chars = max(BATCH_CHUNK_CHARS, -(-total_chars // max(ANALYSIS_PROCESS_WORKERS, 1)))
+        chunk_results = await asyncio.gather(*(
+            run_in_process_pool(analyze_batch_items, chunk, max_keywords, summary_sentences, keyword_scoring)
+            for chunk in chunk_batch_items(items, chunk_chars)
+        ))
+        results = [result for chunk in chunk_results for result in chunk]
+
+    return {
+        "results": [
+            {"index": index, "analysis_type": item["analysis_type"], "result": result}
+            for index, (item, result) in enumerate(zip(items, results))
+        ],
+        "aggregate": aggregate_batch_results(items, results, max_keywords)
+    }
+
+
+def aggregate_batch_results(items: List[Dict[str, Any]], results: List[Any], top_n: int) -> Dict[str, Any]:
+    """
+    Aggregate statistics across the items of a batch
+
+    Sentiment, word and keyword aggregates only cover the items whose
+    analysis produced them (general analysis produces all three).
+
+    Args:
+        items: Normalized batch items
+        results: Analysis result per item
+        top_n: Number of combined keywords to return
+
+    Returns:
+        Item counts, total characters and, when present, the sentiment
+        distribution, total word count and top keywords across items
+    """
+    by_type = {}
+    sentiment_counts = {}
+    keyword_freq = {}
+    word_count = None
+
+    for item, result in zip(items, results):
+        item_type = item["analysis_type"]
+        by_type[item_type] = by_type.get(item_type, 0) + 1
+
+        # General results bundle several analyses; the others are one each
+        sections = result if item_type == "general" else {item_type: result}
+        if "sentiment" in sections:
+            label = sections["sentiment"]["sentiment"]
+            sentiment_counts[label] = sentiment_counts.get(label, 0) + 1
+        if "stats" in sections:
+            word_count = (word_count or 0) + sections["stats"]["word_count"]
+        for keyword in sections.get("keywords", []):
+            keyword_freq[keyword["keyword"]] = keyword_freq.get(keyword["keyword"], 0) + keyword["frequency"]
+
+    aggregate = {
+        "items": len(items),
+        "by_analysis_type": by_type,
+        "total_characters": sum(len(item["text"]) for item in items)
+    }
+    if sentiment_counts:
+        aggregate["sentiment_distribution"] = sentiment_counts
+    if word_count is not None:
+        aggregate["total_words"] = word_count
+    if keyword_freq:
+        # Partial top-N selection instead of sorting the whole vocabulary
+        aggregate["top_keywords"] = [
+            {"keyword": word, "frequency": freq}
+            for word, freq in heapq.nlargest(top_n, keyword_freq.items(), key=itemgetter(1))
+        ]
+    return aggregate
+
+
+def build_job_response(
+    identifier_from_purchaser: str,
+    analysis_type: str,
+    text_length: int,
+    result: Any,
+    start_time: datetime,
+    cached: bool = False
+) -> Dict[str, Any]:
+    """
+    Wrap an analysis result with processing metadata
+
+    Args:
+        identifier_from_purchaser: Buyer identifier
+        analysis_type: Normalized analysis type
+        text_length: Characters of text analyzed (see input_length)
+        result: Analysis result
+        start_time: When the job started processing
+        cached: Whether the result was served from the result cache
+
+    Returns:
+        Completed job response
+    """
+    # Calculate processing time
+    end_time = datetime.utcnow()
+    processing_time = (end_time - start_time).total_seconds()
+
+    # Return comprehensive result
+    return {
+        "result": result,
+        "metadata": {
+            "purchaser": identifier_from_purchaser,
+            "analysis_type": analysis_type,
+            "processing_time_seconds": processing_time,
+            "timestamp": end_time.isoformat(),
+            "text_length": text_length,
+            "cached": cached
+        },
+        "status": "completed"
+    }
+
+
+def input_length(input_data: Dict[str, Any], analysis_type: str) -> int:
+    """Characters of text analyzed by a validated job (all items for batches)."""
+    if analysis_type == "batch":
+        return sum(len(item["text"]) for item in input_data["texts"])
+    return len(input_data.get("text", ""))
+
+
+def build_cache_key(
+    input_data: Dict[str, Any],
+    analysis_type: str,
+    max_keywords: int,
+    summary_sentences: int,
+    keyword_scoring: str = "frequency"
+) -> str:
+    """
+    Build the content-addressed result cache key for a validated job
+
+    Args:
+        input_data: Full input data dictionary (JSON fields already parsed)
+        analysis_type: Normalized analysis type
+        max_keywords: Maximum number of keywords
+        summary_sentences: Number of summary sentences
+        keyword_scoring: Keyword scoring mode
+
+    Returns:
+        Hex digest identifying the job's inputs, parameters and model version
+    """
+    model_version = None
+    if analysis_type == "recommendations":
+        if PHOENIX_AVAILABLE:
+            # Never builds the model service (it lives in the model workers
+            # when they are enabled)
+            model_version = serving_model_version()
+        candidates = input_data.get("candidates")
+        if isinstance(candidates, str):
+            # Streamed candidates stay one unparsed string; digest it in
+            # chunks rather than copying it into the JSON-encoded key payload
+            candidates = {"sha256": text_digest(candidates)}
+        payload = [input_data.get("user_history"), candidates]
+    elif analysis_type == "batch":
+        payload = input_data.get("texts")
+    else:
+        payload = input_data.get("text", "")
+
+    return content_hash(
+        ANALYZER_VERSION,
+        analysis_type,
+        payload,
+        max_keywords,
+        summary_sentences,
+        input_data.get("top_k", max_keywords),
+        keyword_scoring,
+        model_version
+    )
+
+
+def resolve_option(raw_value: Any, valid_values: List[str], default: str) -> str:
+    """
+    Convert an option field to its string value
+
+    Option fields from the UI can arrive as the value itself, an array index
+    (int or numeric string) or array notation like "[0]".
+
+    Args:
+        raw_value: Raw field value from input_data
+        valid_values: Allowed values, in schema order
+        default: Value used when raw_value is unknown or out of range
+
+    Returns:
+        One of valid_values
+    """
+    # If it's a number or numeric string (array index from option type), convert to value
+    if isinstance(raw_value, int):
+        # It's an index
+        return valid_values[raw_value] if 0 <= raw_value < len(valid_values) else default
+    elif isinstance(raw_value, str) and raw_value.isdigit():
+        # It's a numeric string
+        idx = int(raw_value)
+        return valid_values[idx] if 0 <= idx < len(valid_values) else default
+    elif isinstance(raw_value, str) and raw_value.startswith('[') and raw_value.endswith(']'):
+        # It's array notation like "[0]" - extract the index
+        try:
+            idx = int(raw_value.strip('[]'))
+            return valid_values[idx] if 0 <= idx < len(valid_values) else default
+        except (ValueError, IndexError):
+            return default
+
+    # It's the actual string value
+    return raw_value if raw_value in valid_values else default
+
+
+def get_result_cache() -> LRUCache:
+    """Return the process-wide result cache (exposes hit/miss counters via stats())."""
+    return _result_cache
+
 
 def validate_input(
     input_data: Dict[str, Any],
@@ -216,7 +716,7 @@ def validate_input(
     """
     # Validate analysis type (note: analysis_type is already processed in process_job)
     # This validation is redundant but kept for safety
-    valid_types = ["sentiment", "summary", "stats", "keywords", "recommendations", "general"]
+    valid_types = ["sentiment", "summary", "stats", "keywords", "recommendations", "general", "batch"]
     if analysis_type not in valid_types:
         return f"Invalid analysis_type '{analysis_type}'. Must be one of: {', '.join(valid_types)}"
 
@@ -232,11 +732,53 @@ def validate_input(
         if not candidates:
             return "Missing 'candidates' field - required for recommendations"
 
-        if not isinstance(user_history, list) or not isinstance(candidates, list):
+        # A large 'candidates' string is left unparsed by process_job and
+        # validated while it is decoded for ranking
+        if not isinstance(user_history, list) or not isinstance(candidates, (list, str)):
             return "'user_history' and 'candidates' must be arrays"
 
-        if len(candidates) > 1000:
-            return "Too many candidates - maximum 1000 allowed"
+        if isinstance(candidates, list) and len(candidates) > RECOMMENDATION_MAX_CANDIDATES:
+            return f"Too many candidates - maximum {RECOMMENDATION_MAX_CANDIDATES} allowed"
+
+        top_k = input_data.get("top_k", max_keywords)
+        if not isinstance(top_k, int) or top_k < 1:
+            return "top_k must be a positive integer"
+
+    elif analysis_type == "batch":
+        # Batch items were normalized by process_job (see normalize_batch_items)
+        texts = input_data.get("texts")
+
+        if not texts:
+            return "Missing 'texts' field - required for batch analysis"
+
+        if not isinstance(texts, list):
+            return "'texts' must be an array"
+
+        if len(texts) > BATCH_MAX_ITEMS:
+            return f"Too many texts - maximum {BATCH_MAX_ITEMS} allowed"
+
+        item_type = input_data.get("item_analysis_type", "general")
+        if item_type not in BATCH_ITEM_TYPES:
+            return f"Invalid item_analysis_type '{item_type}'. Must be one of: {', '.join(BATCH_ITEM_TYPES)}"
+
+        total_length = 0
+        for index, item in enumerate(texts):
+            if item["analysis_type"] not in BATCH_ITEM_TYPES:
+                return (
+                    f"Item {index}: invalid analysis_type '{item['analysis_type']}'. "
+                    f"Must be one of: {', '.join(BATCH_ITEM_TYPES)}"
+                )
+            item_text = item["text"]
+            if not item_text or not isinstance(item_text, str):
+                return f"Item {index}: missing or invalid text - must be a non-empty string"
+            if len(item_text) < MIN_TEXT_LENGTH:
+                return f"Item {index}: text too short - minimum {MIN_TEXT_LENGTH} characters required"
+            if len(item_text) > MAX_TEXT_LENGTH:
+                return f"Item {index}: text too long - maximum {MAX_TEXT_LENGTH} characters allowed"
+            total_length += len(item_text)
+
+        if total_length > BATCH_MAX_TOTAL_CHARS:
+            return f"Batch too large - maximum {BATCH_MAX_TOTAL_CHARS} characters in total"
 
     else:
         # All other analysis types require text
@@ -261,7 +803,7 @@ def validate_input(
     return None
 
 
-def analyze_sentiment(text: str) -> Dict[str, Any]:
+def analyze_sentiment(text: str, doc: Optional[TextDocument] = None) -> Dict[str, Any]:
     """
     Analyze sentiment of text using keyword-based approach
 
@@ -273,31 +815,19 @@ def analyze_sentiment(text: str) -> Dict[str, Any]:
 
     Args:
         text: Input text to analyze
+        doc: Shared tokenized document for this text (built if omitted)
 
     Returns:
         Sentiment analysis with confidence score and insights
     """
-    text_lower = text.lower()
+    if doc is None:
+        doc = TextDocument(text)
+    text_lower = doc.lower
 
-    # Extended sentiment lexicon
-    positive_words = [
-        'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic',
-        'love', 'best', 'perfect', 'happy', 'awesome', 'brilliant',
-        'superb', 'outstanding', 'exceptional', 'impressive', 'beautiful',
-        'delightful', 'fabulous', 'incredible', 'magnificent', 'marvelous',
-        'phenomenal', 'splendid', 'terrific', 'positive', 'success'
-    ]
-    negative_words = [
-        'bad', 'terrible', 'awful', 'horrible', 'worst', 'hate', 'poor',
-        'disappointing', 'sad', 'angry', 'ugly', 'dreadful', 'pathetic',
-        'disgusting', 'abysmal', 'atrocious', 'inferior', 'nasty',
-        'offensive', 'repulsive', 'useless', 'worthless', 'negative',
-        'failure', 'disaster', 'frustrating', 'annoying'
-    ]
-
-    # Count with word boundary awareness
-    positive_count = sum(1 for word in positive_words if re.search(r'\b' + word + r'\b', text_lower))
-    negative_count = sum(1 for word in negative_words if re.search(r'\b' + word + r'\b', text_lower))
+    # Collect the distinct lexicon words present in a single scan of the text
+    matched_words = set(_SENTIMENT_PATTERN.findall(text_lower))
+    positive_count = sum(1 for word in matched_words if _SENTIMENT_POLARITY[word] > 0)
+    negative_count = len(matched_words) - positive_count
 
     total_sentiment_words = positive_count + negative_count
 
@@ -323,26 +853,25 @@ def analyze_sentiment(text: str) -> Dict[str, Any]:
     }
 
 
-def summarize_text(text: str, max_sentences: int = 3) -> Dict[str, Any]:
+def summarize_text(text: str, max_sentences: int = 3, doc: Optional[TextDocument] = None) -> Dict[str, Any]:
     """
-    Generate text summary
+    Generate an extractive text summary
 
-    In production, use:
-    - Hugging Face summarization models
-    - OpenAI API
-    - Custom transformer models
+    Selects the max_sentences most central sentences with TextRank (see
+    summarizer) and returns them in document order. Texts with at most
+    max_sentences sentences are returned unchanged.
     """
-    # Simple extractive summarization (replace with real model)
-    sentences = [s.strip() for s in text.split('.') if s.strip()]
+    if doc is None:
+        doc = TextDocument(text)
+
+    sentences = doc.sentences
 
     if len(sentences) <= max_sentences:
         summary = text
         reduction = 0
     else:
-        # Take first, middle, and last sentences (simple heuristic)
-        key_indices = [0, len(sentences) // 2, len(sentences) - 1]
-        summary_sentences = [sentences[i] for i in key_indices if i < len(sentences)]
-        summary = '. '.join(summary_sentences) + '.'
+        selected = textrank(sentences, max_sentences, stop_words=STOP_WORDS)
+        summary = ' '.join(sentences[i] for i in selected)
         reduction = round((1 - len(summary) / len(text)) * 100, 1)
 
     return {
@@ -355,75 +884,102 @@ def summarize_text(text: str, max_sentences: int = 3) -> Dict[str, Any]:
     }
 
 
-def calculate_statistics(text: str) -> Dict[str, Any]:
+def calculate_statistics(text: str, doc: Optional[TextDocument] = None) -> Dict[str, Any]:
     """
     Calculate text statistics
-    """
-    words = text.split()
-    sentences = [s.strip() for s in text.split('.') if s.strip()]
 
-    # Calculate averages
-    avg_word_length = sum(len(word) for word in words) / max(len(words), 1)
-    avg_sentence_length = len(words) / max(len(sentences), 1)
+    Every count comes from the document's single character classification
+    pass: words and sentences are spans over its whitespace, and the total
+    word length is the number of non-whitespace characters.
+    """
+    if doc is None:
+        doc = TextDocument(text)
 
-    # Character analysis
     char_count = len(text)
-    alpha_count = sum(1 for c in text if c.isalpha())
-    digit_count = sum(1 for c in text if c.isdigit())
-    space_count = sum(1 for c in text if c.isspace())
+    char_classes = doc.char_classes
+    alpha_count = char_classes["alpha"]
+    digit_count = char_classes["digit"]
+    space_count = char_classes["space"]
+
+    word_count = len(doc.words)
+    sentence_count = len(doc.sentences)
+    unique_count = len(doc.unique_words)
+
+    # Words are the maximal runs of non-whitespace characters
+    avg_word_length = (char_count - space_count) / max(word_count, 1)
+    avg_sentence_length = word_count / max(sentence_count, 1)
 
     return {
-        "word_count": len(words),
-        "sentence_count": len(sentences),
+        "word_count": word_count,
+        "sentence_count": sentence_count,
         "character_count": char_count,
         "average_word_length": round(avg_word_length, 2),
         "average_sentence_length": round(avg_sentence_length, 2),
         "alphabetic_characters": alpha_count,
         "numeric_characters": digit_count,
         "whitespace_characters": space_count,
-        "unique_words": len(set(word.lower() for word in words)),
-        "lexical_diversity": round(len(set(word.lower() for word in words)) / max(len(words), 1), 2)
+        "unique_words": unique_count,
+        "lexical_diversity": round(unique_count / max(word_count, 1), 2)
     }
 
 
-def extract_keywords(text: str, top_n: int = 10) -> List[Dict[str, Any]]:
+def extract_keywords(
+    text: str,
+    top_n: int = 10,
+    doc: Optional[TextDocument] = None,
+    scoring: str = "frequency"
+) -> List[Dict[str, Any]]:
     """
     Extract keywords from text
 
+    Scoring modes:
+    - frequency: rank by raw frequency, relevance = frequency / token count
+    - tfidf: rank by TF-IDF against the persisted document-frequency table,
+      which is updated with this document (comparable across documents)
+
     In production, use:
     - spaCy for NER and keyword extraction
     - RAKE algorithm
-    - TF-IDF scoring
     - BERT-based keyword extraction
     """
-    # Simple frequency-based extraction (replace with real NLP)
-    # Remove common stop words
-    stop_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'as', 'by', 'with', 'from', 'is', 'was', 'are', 'were', 'be',
-        'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-        'would', 'should', 'could', 'may', 'might', 'must', 'can', 'this',
-        'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
-    }
+    if doc is None:
+        doc = TextDocument(text)
 
-    # Count word frequencies
-    words = [word.lower().strip('.,!?;:()[]{}') for word in text.split()]
+    # Count word frequencies (common stop words removed)
+    tokens = doc.keyword_tokens
     word_freq = {}
 
-    for word in words:
-        if len(word) > 3 and word not in stop_words and word.isalpha():
+    for word in tokens:
+        if len(word) > 3 and word not in STOP_WORDS and word.isalpha():
             word_freq[word] = word_freq.get(word, 0) + 1
 
-    # Sort by frequency and get top N
-    sorted_keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+    token_count = max(len(tokens), 1)
+
+    if scoring == "tfidf":
+        df_table = get_document_frequency_table()
+        df_table.add_document(word_freq)
+        scores = {word: freq / token_count * df_table.idf(word) for word, freq in word_freq.items()}
+        # Partial top-N selection instead of sorting the whole vocabulary
+        top_words = heapq.nlargest(top_n, scores, key=scores.__getitem__)
+        return [
+            {
+                "keyword": word,
+                "frequency": word_freq[word],
+                "relevance": round(scores[word], 3)
+            }
+            for word in top_words
+        ]
+
+    # Partial top-N selection instead of sorting the whole vocabulary
+    top_keywords = heapq.nlargest(top_n, word_freq.items(), key=itemgetter(1))
 
     return [
         {
             "keyword": word,
             "frequency": freq,
-            "relevance": round(freq / max(len(words), 1), 3)
+            "relevance": round(freq / token_count, 3)
         }
-        for word, freq in sorted_keywords[:top_n]
+        for word, freq in top_keywords
     ]
 
 
@@ -463,7 +1019,8 @@ def generate_recommendations(input_data: Dict[str, Any], top_k: int = 10) -> Dic
     Args:
         input_data: {
             "user_history": [{"post_id": str, "action": str, "timestamp": int}],
-            "candidates": [{"post_id": str, "text": str, "author_id": str}],
+            "candidates": [{"post_id": str, "text": str, "author_id": str}]
+                (or the same array as an unparsed JSON string),
             "top_k": int (optional, defaults to 10)
         }
         top_k: Number of recommendations to return
@@ -488,6 +1045,10 @@ def generate_recommendations(input_data: Dict[str, Any], top_k: int = 10) -> Dic
                 "using_mock": bool
             }
         }
+
+    Raises:
+        CandidateInputError: If a candidates JSON string turns out to be
+            invalid (or too long) while it is decoded
     """
     if not PHOENIX_AVAILABLE:
         return {
@@ -515,36 +1076,58 @@ def generate_recommendations(input_data: Dict[str, Any], top_k: int = 10) -> Dic
                 "status": "failed"
             }
 
-        if len(candidates) > 1000:
+        if isinstance(candidates, list) and len(candidates) > RECOMMENDATION_MAX_CANDIDATES:
             return {
-                "error": "Too many candidates - maximum 1000 allowed",
+                "error": f"Too many candidates - maximum {RECOMMENDATION_MAX_CANDIDATES} allowed",
                 "status": "failed"
             }
 
-        # Get model service
-        model_service = get_model_service()
-
-        # Generate recommendations
-        recommendations = model_service.rank_candidates(
-            user_history=user_history,
-            candidates=candidates,
-            top_k=requested_top_k
-        )
+        # Generate recommendations, in a model worker process when enabled
+        if isinstance(candidates, str):
+            # Decoded incrementally while ranking
+            if model_workers.model_workers_enabled():
+                recommendations, total_candidates, using_mock = model_workers.rank_candidates_json(
+                    user_history, candidates, requested_top_k, RECOMMENDATION_MAX_CANDIDATES
+                )
+            else:
+                model_service = get_model_service()
+                recommendations, total_candidates = model_service.rank_candidates_json(
+                    user_history, candidates, requested_top_k, RECOMMENDATION_MAX_CANDIDATES
+                )
+                using_mock = model_service.use_mock
+        elif model_workers.model_workers_enabled():
+            recommendations, using_mock = model_workers.rank_candidates(
+                user_history, candidates, requested_top_k
+            )
+            total_candidates = len(candidates)
+        else:
+            model_service = get_model_service()
+            recommendations = model_service.rank_candidates(
+                user_history=user_history,
+                candidates=candidates,
+                top_k=requested_top_k
+            )
+            using_mock = model_service.use_mock
+            total_candidates = len(candidates)
 
         return {
             "recommendations": recommendations,
             "model_info": {
                 "model_type": "Phoenix Grok-based Transformer",
-                "using_mock": model_service.use_mock,
-                "total_candidates": len(candidates),
+                "using_mock": using_mock,
+                "total_candidates": total_candidates,
                 "returned_count": len(recommendations)
             },
             "insights": [
-                f"Ranked {len(candidates)} candidates based on user engagement history",
+                f"Ranked {total_candidates} candidates based on user engagement history",
                 f"Top recommendation has score: {recommendations[0]['score']:.3f}" if recommendations else "No recommendations generated"
             ]
         }
 
+    except CandidateInputError:
+        # Fails the job like invalid candidates caught by validate_input
+        raise
+
     except Exception as e:
         logger.error(f"Error generating recommendations: {e}", exc_info=True)
         return {
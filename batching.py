@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Dynamic Micro-Batching for Model Inference
+
+Concurrent callers submit single requests; a dispatcher thread takes every
+request already queued (up to the batch size limit), runs them through one
+batched call, and hands each caller its own result. Requests that arrive
+while a batch is running form the next batch, so batching needs no wait;
+an optional window additionally holds the first request for stragglers.
+When a batched call fails, its requests are retried one by one so an
+error only reaches the caller whose request caused it.
+
+Request latency is recorded as the "score" stage (see metrics) and batch
+sizes in their own histogram.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from metrics import observe_batch_size, observe_stage
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent single requests into batched calls.
+
+    batch_fn receives a list of requests and must return a list of results
+    in the same order. submit() blocks the calling thread until its result
+    is ready.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        single_fn: Optional[Callable[[Any], Any]] = None,
+        window_ms: float = 0.0,
+        max_batch_size: int = 16,
+        name: str = "micro-batcher",
+        analysis_type: str = "recommendations"
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_fn: Function processing a list of requests
+            single_fn: Function processing one request, used to retry the
+                requests of a failed batch individually (without it the
+                batch's error is passed to every caller)
+            window_ms: How long to wait for more requests after the first
+                arrives (0 dispatches at once with whatever is queued)
+            max_batch_size: Dispatch immediately once this many requests are queued
+            name: Dispatcher thread name
+            analysis_type: Label of the request latency metric
+        """
+        self.batch_fn = batch_fn
+        self.single_fn = single_fn
+        self.window_seconds = max(0.0, window_ms) / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.name = name
+        self.analysis_type = analysis_type
+        self.batches = 0
+        self.requests = 0
+        self.largest_batch = 0
+        self.failed_batches = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def submit(self, request: Any) -> Any:
+        """
+        Submit one request and wait for its result.
+
+        Raises:
+            Exception: Whatever batch_fn raised for the batch containing request
+        """
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((request, future, time.perf_counter()))
+        return future.result()
+
+    def _gather(self) -> List[Any]:
+        """Block for the first request, then collect queued ones until the window closes or the batch is full."""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._gather()
+            observe_batch_size(len(batch))
+            with self._lock:
+                self.batches += 1
+                self.requests += len(batch)
+                self.largest_batch = max(self.largest_batch, len(batch))
+
+            try:
+                results = self.batch_fn([request for request, _, _ in batch])
+            except Exception as e:
+                with self._lock:
+                    self.failed_batches += 1
+                if self.single_fn is None:
+                    logger.error(f"Batched call failed for {len(batch)} requests: {e}")
+                    for _, future, _ in batch:
+                        future.set_exception(e)
+                    continue
+                logger.warning(f"Batched call failed for {len(batch)} requests: {e}. Retrying them one by one.")
+                self._run_each(batch)
+                continue
+
+            now = time.perf_counter()
+            for (_, future, submitted_at), result in zip(batch, results):
+                observe_stage(self.analysis_type, "score", now - submitted_at)
+                future.set_result(result)
+
+    def _run_each(self, batch: List[Any]) -> None:
+        """Process the requests of a failed batch individually, failing only those that raise."""
+        for request, future, submitted_at in batch:
+            try:
+                result = self.single_fn(request)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            observe_stage(self.analysis_type, "score", time.perf_counter() - submitted_at)
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Window settings and batch counters (latency histograms are in /metrics)."""
+        with self._lock:
+            return {
+                "window_ms": self.window_seconds * 1000.0,
+                "max_batch_size": self.max_batch_size,
+                "batches": self.batches,
+                "requests": self.requests,
+                "mean_batch_size": round(self.requests / self.batches, 3) if self.batches else None,
+                "largest_batch": self.largest_batch,
+                "failed_batches": self.failed_batches
+            }
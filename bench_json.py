@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+JSON Backend Benchmark
+
+Compares the stdlib json module with orjson on recommendation payloads
+shaped like test_recommendations.json, scaled up to many candidates:
+- parse: decoding the user_history and candidates string fields
+- render: encoding a completed recommendations job response
+
+Usage:
+    python bench_json.py [--repeats N] [--json report.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CANDIDATE_COUNTS = (10, 100, 1000, 10000)
+PAYLOAD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_recommendations.json")
+
+
+def scaled_payload(num_candidates: int) -> Dict[str, str]:
+    """user_history/candidates string fields with the sample candidates repeated to num_candidates."""
+    with open(PAYLOAD_FILE, "r", encoding="utf-8") as f:
+        sample = json.load(f)
+
+    base = sample["candidates"]
+    candidates = [
+        {**base[i % len(base)], "post_id": f"cand{i}", "media_type": "text"}
+        for i in range(num_candidates)
+    ]
+    history = [
+        {**item, "post_id": f"post{i}"}
+        for i, item in enumerate(sample["user_history"] * 10)
+    ]
+    return {"user_history": json.dumps(history), "candidates": json.dumps(candidates)}
+
+
+def job_response(num_candidates: int) -> Dict[str, Any]:
+    """A completed recommendations response ranking every candidate."""
+    recommendations = [
+        {
+            "post_id": f"cand{i}",
+            "score": 0.5 + (i % 997) / 2000,
+            "predictions": {head: 0.1 + (i % 89) / 100 for head in ("like", "repost", "reply", "click", "profile_click", "video_view")},
+            "rank": i + 1
+        }
+        for i in range(num_candidates)
+    ]
+    return {
+        "result": {
+            "recommendations": recommendations,
+            "model_info": {"model_type": "Phoenix Grok-based Transformer", "using_mock": True},
+            "insights": ["Ranked candidates based on user engagement history"]
+        },
+        "metadata": {"purchaser": "benchmark", "analysis_type": "recommendations", "cached": False},
+        "status": "completed"
+    }
+
+
+def best_of(func: Callable[[], Any], repeats: int) -> float:
+    """Median seconds per call over repeats runs (after one warmup call)."""
+    func()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(repeats: int) -> List[Dict[str, Any]]:
+    """Parse and render timings per candidate count and backend."""
+    results = []
+    for count in CANDIDATE_COUNTS:
+        payload = scaled_payload(count)
+        response = job_response(count)
+        backends = {
+            "stdlib": (
+                lambda: (json.loads(payload["user_history"]), json.loads(payload["candidates"])),
+                lambda: json.dumps(response, ensure_ascii=False)
+            )
+        }
+        if orjson is not None:
+            backends["orjson"] = (
+                lambda: (orjson.loads(payload["user_history"]), orjson.loads(payload["candidates"])),
+                lambda: orjson.dumps(response, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+            )
+
+        entry = {
+            "candidates": count,
+            "payload_bytes": len(payload["candidates"]) + len(payload["user_history"]),
+            "response_bytes": len(json.dumps(response, ensure_ascii=False)),
+            "parse_ms": {},
+            "render_ms": {}
+        }
+        for name, (parse, render) in backends.items():
+            entry["parse_ms"][name] = round(best_of(parse, repeats) * 1000, 4)
+            entry["render_ms"][name] = round(best_of(render, repeats) * 1000, 4)
+        results.append(entry)
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Human-readable table with orjson speedups."""
+    print(f"{'candidates':>10} {'payload KB':>11} {'parse stdlib':>13} {'parse orjson':>13} "
+          f"{'render stdlib':>14} {'render orjson':>14}")
+    for entry in results:
+        parse, render = entry["parse_ms"], entry["render_ms"]
+        orjson_parse = f"{parse['orjson']:.3f} ({parse['stdlib'] / parse['orjson']:.1f}x)" if "orjson" in parse else "n/a"
+        orjson_render = f"{render['orjson']:.3f} ({render['stdlib'] / render['orjson']:.1f}x)" if "orjson" in render else "n/a"
+        print(f"{entry['candidates']:>10} {entry['payload_bytes'] / 1024:>11.1f} {parse['stdlib']:>13.3f} "
+              f"{orjson_parse:>13} {render['stdlib']:>14.3f} {orjson_render:>14}")
+    print("(milliseconds per call, median)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare stdlib json and orjson on recommendation payloads")
+    parser.add_argument("--repeats", type=int, default=50, help="Timed calls per measurement")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed - only the stdlib backend is measured (pip install orjson)\n")
+
+    results = run(max(1, args.repeats))
+    print_results(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote results to {args.json_path}")
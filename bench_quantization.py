@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Int8 vs float32 Phoenix Inference Report
+
+Scores the same synthetic requests with float32 and int8-quantized weights
+and reports accuracy (score error, top-k agreement, rank correlation) next
+to latency (p50/p99 per request shape) and parameter memory.
+
+Uses the checkpoint at PHOENIX_MODEL_PATH when set, otherwise a randomly
+initialized model with the default config.
+
+Usage:
+    python bench_quantization.py [--repeats N] [--json report.json]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from phoenix_model import ACTIONS, MEDIA_TYPES, PhoenixConfig, PhoenixInference, init_params, load_checkpoint
+
+# (history length, candidate count) per benchmarked request shape
+REQUEST_SHAPES = ((16, 16), (64, 256), (256, 1024))
+TOP_K = 10
+
+
+def synthetic_requests(count: int, history_len: int, num_candidates: int, seed: int) -> List[Tuple[list, list]]:
+    """Deterministic (user_history, candidates) requests."""
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        history = [
+            {"post_id": f"post_{rng.randrange(100000)}", "action": rng.choice(ACTIONS[1:-1])}
+            for _ in range(history_len)
+        ]
+        candidates = [
+            {
+                "post_id": f"post_{rng.randrange(100000)}",
+                "author_id": f"user_{rng.randrange(5000)}",
+                "media_type": rng.choice(MEDIA_TYPES[1:-1])
+            }
+            for _ in range(num_candidates)
+        ]
+        requests.append((history, candidates))
+    return requests
+
+
+def rank_correlation(a: np.ndarray, b: np.ndarray) -> float:
+    """Spearman rank correlation (no tie correction)."""
+    ranks_a = np.argsort(np.argsort(a))
+    ranks_b = np.argsort(np.argsort(b))
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+def time_requests(model: PhoenixInference, requests: List[Tuple[list, list]]) -> Tuple[List[np.ndarray], np.ndarray]:
+    """Per-request scores and latencies in seconds (after one warmup call)."""
+    model.predict(*requests[0])
+    scores, latencies = [], []
+    for history, candidates in requests:
+        start = time.perf_counter()
+        request_scores, _ = model.predict(history, candidates)
+        latencies.append(time.perf_counter() - start)
+        scores.append(request_scores)
+    return scores, np.array(latencies)
+
+
+def compare(reference: PhoenixInference, quantized: PhoenixInference, repeats: int) -> Dict[str, Any]:
+    """
+    Accuracy and latency of quantized against reference, per request shape.
+
+    Args:
+        reference: float32 inference
+        quantized: int8 inference
+        repeats: Requests scored per shape
+
+    Returns:
+        Report dict
+    """
+    report: Dict[str, Any] = {
+        "param_bytes": {"float32": reference.param_bytes, "int8": quantized.param_bytes},
+        "shapes": []
+    }
+
+    for history_len, num_candidates in REQUEST_SHAPES:
+        requests = synthetic_requests(repeats, history_len, num_candidates, seed=history_len * 7919 + num_candidates)
+        reference_scores, reference_latency = time_requests(reference, requests)
+        quantized_scores, quantized_latency = time_requests(quantized, requests)
+
+        errors = np.concatenate([np.abs(r - q) for r, q in zip(reference_scores, quantized_scores)])
+        k = min(TOP_K, num_candidates)
+        overlaps = [
+            len(set(np.argsort(-r)[:k]) & set(np.argsort(-q)[:k])) / k
+            for r, q in zip(reference_scores, quantized_scores)
+        ]
+        correlations = [rank_correlation(r, q) for r, q in zip(reference_scores, quantized_scores)]
+
+        report["shapes"].append({
+            "history_len": history_len,
+            "num_candidates": num_candidates,
+            "score_abs_error_max": float(errors.max()),
+            "score_abs_error_mean": float(errors.mean()),
+            f"top{k}_overlap_mean": float(np.mean(overlaps)),
+            "rank_correlation_mean": float(np.mean(correlations)),
+            "latency_ms": {
+                mode: {
+                    "p50": round(float(np.percentile(latency, 50)) * 1000, 3),
+                    "p99": round(float(np.percentile(latency, 99)) * 1000, 3)
+                }
+                for mode, latency in (("float32", reference_latency), ("int8", quantized_latency))
+            }
+        })
+
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Human-readable summary of a compare() report."""
+    param_bytes = report["param_bytes"]
+    print(f"Parameters: float32 {param_bytes['float32'] / 2**20:.1f} MiB, "
+          f"int8 {param_bytes['int8'] / 2**20:.1f} MiB "
+          f"({param_bytes['float32'] / param_bytes['int8']:.2f}x smaller)")
+    print()
+    print(f"{'history x cands':>16} {'max err':>9} {'mean err':>9} {'top-k':>6} {'rank r':>7} "
+          f"{'fp32 p50/p99 ms':>17} {'int8 p50/p99 ms':>17}")
+    for shape in report["shapes"]:
+        overlap = next(value for key, value in shape.items() if key.endswith("_overlap_mean"))
+        latency = shape["latency_ms"]
+        print(
+            f"{shape['history_len']:>7} x {shape['num_candidates']:<6} "
+            f"{shape['score_abs_error_max']:>9.5f} {shape['score_abs_error_mean']:>9.5f} "
+            f"{overlap:>6.2f} {shape['rank_correlation_mean']:>7.4f} "
+            f"{latency['float32']['p50']:>8.2f}/{latency['float32']['p99']:<8.2f} "
+            f"{latency['int8']['p50']:>8.2f}/{latency['int8']['p99']:<8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="Compare int8-quantized and float32 Phoenix inference")
+    parser.add_argument("--repeats", type=int, default=20, help="Requests scored per shape")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    model_path = os.getenv("PHOENIX_MODEL_PATH")
+    if model_path:
+        config, params = load_checkpoint(model_path)
+    else:
+        config = PhoenixConfig()
+        params = init_params(config)
+
+    reference = PhoenixInference(config, params)
+    quantized = PhoenixInference(config, params, quantization="int8")
+    report = compare(reference, quantized, max(1, args.repeats))
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote report to {args.json_path}")
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+X-Analyst Benchmark Suite
+
+Drives process_job end to end for every analysis type over a range of
+input sizes (10 characters up to MAX_TEXT_LENGTH, 1 to 1000 candidates
+or batch texts) and reports throughput, p50/p99 latency and peak memory
+as JSON, so runs can be compared across changes.
+
+Inputs are generated from a fixed seed, and the result cache is cleared
+before every timed call, so each run does the same work. Peak memory is
+measured with tracemalloc in a separate, untimed call. It covers the
+serving process only; pass --inline to run all text analysis in-process
+so large inputs are included too.
+
+Usage:
+    python benchmark.py [--iterations N] [--concurrency N] [--types a,b]
+                        [--inline] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+
+import agent
+from agent import (
+    MAX_TEXT_LENGTH,
+    MIN_TEXT_LENGTH,
+    NEGATIVE_WORDS,
+    POSITIVE_WORDS,
+    get_result_cache,
+    process_job
+)
+from executors import shutdown_executors, start_executors
+
+TEXT_ANALYSIS_TYPES = ("sentiment", "summary", "stats", "keywords", "general")
+ANALYSIS_TYPES = TEXT_ANALYSIS_TYPES + ("recommendations", "batch")
+TEXT_SIZES = (MIN_TEXT_LENGTH, 100, 1000, 10000, MAX_TEXT_LENGTH)
+CANDIDATE_COUNTS = (1, 10, 100, 1000)
+BATCH_SIZES = (1, 10, 100, 1000)
+
+PURCHASER_ID = "benchmark000000000000000000"
+SEED = 1234
+
+_FILLER_WORDS = (
+    "the", "model", "data", "team", "product", "market", "users", "system", "report", "growth",
+    "analysis", "results", "feature", "release", "customers", "quarter", "service", "research",
+    "platform", "network", "ai", "tech", "news", "update", "and", "with", "for", "from", "is", "was"
+)
+_ACTIONS = ("like", "repost", "reply", "click")
+_MEDIA_TYPES = ("text", "image", "video")
+
+
+def generate_text(length: int, rng: random.Random) -> str:
+    """Deterministic English-like text of exactly length characters."""
+    vocabulary = _FILLER_WORDS * 4 + POSITIVE_WORDS + NEGATIVE_WORDS
+    sentences = []
+    size = 0
+    while size < length:
+        words = rng.choices(vocabulary, k=rng.randint(6, 16))
+        sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(sentences)[:length]
+
+
+def generate_recommendation_input(num_candidates: int, rng: random.Random) -> Dict[str, Any]:
+    """Recommendation job input with JSON-encoded history and candidates, as buyers send them."""
+    history = [
+        {"post_id": f"post{rng.randrange(100000)}", "action": rng.choice(_ACTIONS), "timestamp": 1734567890 + i}
+        for i in range(20)
+    ]
+    candidates = [
+        {
+            "post_id": f"cand{i}",
+            "text": generate_text(rng.randint(20, 280), rng),
+            "author_id": f"user{rng.randrange(1000)}",
+            "media_type": rng.choice(_MEDIA_TYPES)
+        }
+        for i in range(num_candidates)
+    ]
+    return {
+        "analysis_type": "recommendations",
+        "user_history": json.dumps(history),
+        "candidates": json.dumps(candidates),
+        "top_k": 10
+    }
+
+
+def generate_batch_input(num_texts: int, rng: random.Random) -> Dict[str, Any]:
+    """Batch job input with a JSON-encoded list of post-sized texts."""
+    texts = [generate_text(rng.randint(20, 280), rng) for _ in range(num_texts)]
+    return {"analysis_type": "batch", "texts": json.dumps(texts), "item_analysis_type": "general"}
+
+
+def build_cases(analysis_types: List[str]) -> List[Dict[str, Any]]:
+    """Every (analysis_type, input size) combination with its job input."""
+    rng = random.Random(SEED)
+    cases = []
+    for analysis_type in analysis_types:
+        if analysis_type == "recommendations":
+            for count in CANDIDATE_COUNTS:
+                cases.append({
+                    "analysis_type": analysis_type,
+                    "input_size": count,
+                    "size_unit": "candidates",
+                    "input_data": generate_recommendation_input(count, rng)
+                })
+        elif analysis_type == "batch":
+            for count in BATCH_SIZES:
+                cases.append({
+                    "analysis_type": analysis_type,
+                    "input_size": count,
+                    "size_unit": "texts",
+                    "input_data": generate_batch_input(count, rng)
+                })
+        else:
+            for length in TEXT_SIZES:
+                cases.append({
+                    "analysis_type": analysis_type,
+                    "input_size": length,
+                    "size_unit": "chars",
+                    "input_data": {"text": generate_text(length, rng), "analysis_type": analysis_type}
+                })
+    return cases
+
+
+async def run_job(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """One uncached process_job call (process_job parses JSON fields in place, so it gets a copy)."""
+    get_result_cache().clear()
+    return await process_job(PURCHASER_ID, dict(input_data))
+
+
+async def measure_case(case: Dict[str, Any], iterations: int, warmup: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Time one case and measure its peak traced memory.
+
+    Args:
+        case: Entry from build_cases
+        iterations: Timed process_job calls
+        warmup: Untimed calls before timing
+        concurrency: Calls in flight at once
+
+    Returns:
+        Result entry for the report
+    """
+    input_data = case["input_data"]
+    for _ in range(warmup):
+        await run_job(input_data)
+
+    async def timed_call() -> float:
+        start = time.perf_counter()
+        response = await run_job(input_data)
+        elapsed = time.perf_counter() - start
+        if response.get("status") != "completed":
+            raise RuntimeError(f"{case['analysis_type']} job failed: {response.get('error')}")
+        return elapsed
+
+    latencies: List[float] = []
+    wall_start = time.perf_counter()
+    for batch_start in range(0, iterations, concurrency):
+        batch = min(concurrency, iterations - batch_start)
+        latencies.extend(await asyncio.gather(*(timed_call() for _ in range(batch))))
+    wall_seconds = time.perf_counter() - wall_start
+
+    tracemalloc.start()
+    try:
+        await run_job(input_data)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latency_ms = np.array(latencies) * 1000
+    return {
+        "analysis_type": case["analysis_type"],
+        "input_size": case["input_size"],
+        "size_unit": case["size_unit"],
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "throughput_per_second": round(iterations / wall_seconds, 3),
+        "latency_ms": {
+            "mean": round(float(latency_ms.mean()), 4),
+            "p50": round(float(np.percentile(latency_ms, 50)), 4),
+            "p99": round(float(np.percentile(latency_ms, 99)), 4),
+            "max": round(float(latency_ms.max()), 4)
+        },
+        "peak_memory_bytes": peak_bytes
+    }
+
+
+def environment_info() -> Dict[str, Any]:
+    """Where and on what code the benchmark ran."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print p50/p99 and throughput changes against a baseline report."""
+    baseline_results = {
+        (entry["analysis_type"], entry["input_size"]): entry for entry in baseline.get("results", [])
+    }
+    print(f"\nCompared with {baseline.get('environment', {}).get('git_commit') or 'baseline'}:")
+    for entry in report["results"]:
+        before = baseline_results.get((entry["analysis_type"], entry["input_size"]))
+        if before is None:
+            continue
+        ratios = [
+            entry["latency_ms"][q] / before["latency_ms"][q] if before["latency_ms"][q] else float("nan")
+            for q in ("p50", "p99")
+        ]
+        throughput = entry["throughput_per_second"] / before["throughput_per_second"]
+        print(f"  {entry['analysis_type']:<16} {entry['input_size']:>7} {entry['size_unit']:<10} "
+              f"p50 x{ratios[0]:.2f}  p99 x{ratios[1]:.2f}  throughput x{throughput:.2f}")
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Human-readable table of the results."""
+    print(f"{'analysis_type':<16} {'size':>18} {'ops/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'peak MiB':>9}")
+    for entry in results:
+        print(
+            f"{entry['analysis_type']:<16} {entry['input_size']:>7} {entry['size_unit']:<10} "
+            f"{entry['throughput_per_second']:>10.1f} {entry['latency_ms']['p50']:>10.3f} "
+            f"{entry['latency_ms']['p99']:>10.3f} {entry['peak_memory_bytes'] / 2**20:>9.2f}"
+        )
+
+
+async def run_benchmarks(
+    analysis_types: List[str],
+    iterations: int,
+    warmup: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """Run every case and assemble the JSON report."""
+    cases = build_cases(analysis_types)
+    results = []
+    for case in cases:
+        result = await measure_case(case, iterations, warmup, concurrency)
+        results.append(result)
+        print(f"  {case['analysis_type']:<16} {case['input_size']:>7} {case['size_unit']:<10} "
+              f"p50 {result['latency_ms']['p50']:.3f}ms", file=sys.stderr)
+
+    return {
+        "environment": environment_info(),
+        "settings": {
+            "iterations": iterations,
+            "warmup": warmup,
+            "concurrency": concurrency,
+            "inline_max_chars": agent.ANALYSIS_INLINE_MAX_CHARS,
+            "seed": SEED
+        },
+        "results": results
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="Benchmark process_job across analysis types and input sizes")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed calls per case")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed calls per case before timing")
+    parser.add_argument("--concurrency", type=int, default=1, help="Calls in flight at once")
+    parser.add_argument("--types", default=",".join(ANALYSIS_TYPES), help="Comma-separated analysis types")
+    parser.add_argument("--inline", action="store_true", help="Analyze every text in the serving process")
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    args = parser.parse_args()
+
+    selected_types = [name.strip() for name in args.types.split(",") if name.strip()]
+    unknown = sorted(set(selected_types) - set(ANALYSIS_TYPES))
+    if unknown:
+        parser.error(f"Unknown analysis types: {', '.join(unknown)}")
+
+    if args.inline:
+        agent.ANALYSIS_INLINE_MAX_CHARS = MAX_TEXT_LENGTH
+
+    # Worker processes start before timing so no case pays for spawning them
+    start_executors()
+    try:
+        report = asyncio.run(run_benchmarks(
+            selected_types, max(1, args.iterations), max(0, args.warmup), max(1, args.concurrency)
+        ))
+    finally:
+        shutdown_executors()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print_results(report["results"])
+        print(f"\nWrote report to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare_reports(report, json.load(f))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+In-Process Caching for X-Analyst
+
+Provides a thread-safe, size-bounded LRU cache with optional TTL expiry and
+hit/miss counters, plus helpers for building content-addressed cache keys
+(text_digest covers strings too large to copy into a key payload).
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Build a stable content-addressed key from JSON-serializable parts.
+
+    Args:
+        parts: Values that together identify the cached content
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding of the parts
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    # Lone surrogates are valid in JSON input, so they must be hashable too
+    return hashlib.sha256(payload.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def text_digest(text: str, chunk_chars: int = 1 << 20) -> str:
+    """
+    Hex SHA-256 digest of a string's UTF-8 encoding, computed chunk by chunk.
+
+    Only one chunk is encoded at a time, so digesting a very large string
+    makes no full-size copy of it.
+    """
+    digest = hashlib.sha256()
+    for offset in range(0, len(text), chunk_chars):
+        digest.update(text[offset:offset + chunk_chars].encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """
+    Size-bounded least-recently-used cache with optional TTL.
+
+    Entries beyond max_entries (or beyond max_bytes, when a sizeof function
+    is given) evict the least recently used items; entries older than
+    ttl_seconds are treated as misses and dropped on access.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept (0 disables caching)
+            ttl_seconds: Entry lifetime in seconds (None or 0 means no expiry)
+            max_bytes: Memory budget for all values (None means unbounded)
+            sizeof: Returns a value's size in bytes (required with max_bytes)
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = ttl_seconds or None
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            stored_at, value, size = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.total_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries."""
+        if not self.enabled:
+            return
+
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[2]
+            self._entries[key] = (time.monotonic(), value, size)
+            self.total_bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Checkpoints for the Phoenix Model
+
+Stores every parameter tensor as its own .npy file, listed in a manifest:
+
+    checkpoint/
+        config.json
+        manifest.json            {"format": ..., "tensors": {name: {file, dtype, shape}}}
+        tensors/0000_<name>.npy
+
+Tensors are opened with memory mapping instead of being read onto the heap,
+so worker processes loading the same checkpoint share the OS page cache,
+and cold start only pays for the pages inference actually touches.
+
+Usage:
+    python checkpoint.py convert <npz_checkpoint_dir> <mmap_checkpoint_dir>
+"""
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+from typing import Dict, Mapping
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+TENSOR_DIR = "tensors"
+FORMAT_VERSION = "phoenix-mmap-v1"
+
+
+def is_mmap_checkpoint(path: str) -> bool:
+    """Whether path is a directory in the memory-mapped checkpoint layout."""
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+def save_mmap_checkpoint(path: str, tensors: Mapping[str, np.ndarray]) -> None:
+    """
+    Write flat parameter tensors in the memory-mapped layout.
+
+    Args:
+        path: Checkpoint directory (config.json is written separately)
+        tensors: Flat {"module/name": array} parameters
+    """
+    tensor_dir = os.path.join(path, TENSOR_DIR)
+    os.makedirs(tensor_dir, exist_ok=True)
+
+    manifest = {"format": FORMAT_VERSION, "tensors": {}}
+    for index, (name, value) in enumerate(sorted(tensors.items())):
+        array = np.ascontiguousarray(value)
+        filename = f"{index:04d}_{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}.npy"
+        # np.save pads the header so the data starts 64-byte aligned
+        np.save(os.path.join(tensor_dir, filename), array)
+        manifest["tensors"][name] = {
+            "file": f"{TENSOR_DIR}/{filename}",
+            "dtype": array.dtype.str,
+            "shape": list(array.shape)
+        }
+
+    with open(os.path.join(path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def load_mmap_checkpoint(path: str) -> Dict[str, np.ndarray]:
+    """
+    Open every tensor of a memory-mapped checkpoint read-only.
+
+    Args:
+        path: Checkpoint directory
+
+    Returns:
+        Flat {"module/name": read-only memmap} parameters
+
+    Raises:
+        ValueError: If the manifest format or a tensor's dtype/shape mismatches
+    """
+    with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format: {manifest.get('format')}")
+
+    tensors = {}
+    for name, entry in manifest["tensors"].items():
+        array = np.load(os.path.join(path, entry["file"]), mmap_mode="r")
+        if array.dtype.str != entry["dtype"] or list(array.shape) != entry["shape"]:
+            raise ValueError(
+                f"Tensor {name} is {array.dtype.str}{list(array.shape)}, "
+                f"manifest expects {entry['dtype']}{entry['shape']}"
+            )
+        tensors[name] = array
+
+    logger.info(f"Memory-mapped {len(tensors)} tensors from {path}")
+    return tensors
+
+
+def convert_npz_checkpoint(source: str, destination: str, params_file: str = "params.npz") -> None:
+    """
+    Convert a config.json + params.npz checkpoint to the memory-mapped layout.
+
+    Args:
+        source: Directory containing config.json and params_file
+        destination: Output directory
+    """
+    os.makedirs(destination, exist_ok=True)
+    shutil.copyfile(os.path.join(source, "config.json"), os.path.join(destination, "config.json"))
+    with np.load(os.path.join(source, params_file)) as data:
+        save_mmap_checkpoint(destination, {key: data[key] for key in data.files})
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) != 4 or sys.argv[1] != "convert":
+        print("Usage: python checkpoint.py convert <npz_checkpoint_dir> <mmap_checkpoint_dir>")
+        sys.exit(1)
+
+    convert_npz_checkpoint(sys.argv[2], sys.argv[3])
+    print(f"Wrote memory-mapped checkpoint to {sys.argv[3]}")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Executor Layer for X-Analyst
+
+Keeps CPU-bound analysis off the asyncio event loop:
+- Process pool for the pure-Python text analyzers (they hold the GIL, so
+  only separate processes use more than one core)
+- Thread pool for NumPy/JAX model inference (releases the GIL during
+  array work, and shares the in-process model parameters)
+
+Pools are created lazily on first use and sized from environment variables.
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration (0 process workers runs text analysis on the thread pool instead)
+ANALYSIS_PROCESS_WORKERS = int(os.getenv("ANALYSIS_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+# Model threads mostly wait on the micro-batcher, so there can be more than cores
+MODEL_THREAD_WORKERS = int(os.getenv("MODEL_THREAD_WORKERS", "16"))
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get or create the process pool for pure-Python analyzers.
+
+    Workers are started with the "spawn" method so they never inherit
+    threads (uvicorn, JAX) from the serving process.
+
+    Returns:
+        ProcessPoolExecutor, or None when ANALYSIS_PROCESS_WORKERS is 0
+    """
+    global _process_pool
+
+    if ANALYSIS_PROCESS_WORKERS <= 0:
+        return None
+
+    with _lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=ANALYSIS_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started analysis process pool with {ANALYSIS_PROCESS_WORKERS} workers")
+
+    return _process_pool
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Get or create the thread pool for NumPy/JAX model work."""
+    global _thread_pool
+
+    with _lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(
+                max_workers=max(1, MODEL_THREAD_WORKERS),
+                thread_name_prefix="model-worker"
+            )
+            logger.info(f"Started model thread pool with {MODEL_THREAD_WORKERS} workers")
+
+    return _thread_pool
+
+
+async def _run_in(executor: Executor, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_in_process_pool(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a picklable, module-level function in the analysis process pool.
+
+    Falls back to the thread pool when the process pool is disabled or a
+    worker died (the broken pool is discarded and recreated on next use).
+    """
+    global _process_pool
+
+    pool = get_process_pool()
+    if pool is None:
+        return await run_in_thread_pool(func, *args, **kwargs)
+
+    try:
+        return await _run_in(pool, func, *args, **kwargs)
+    except BrokenProcessPool:
+        logger.error("Analysis process pool is broken - recreating and retrying on thread pool")
+        with _lock:
+            if _process_pool is pool:
+                _process_pool = None
+        pool.shutdown(wait=False)
+        return await run_in_thread_pool(func, *args, **kwargs)
+
+
+async def run_in_thread_pool(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a function in the model thread pool."""
+    return await _run_in(get_thread_pool(), func, *args, **kwargs)
+
+
+def start_executors() -> None:
+    """Create both pools and spawn every worker process ahead of the first job."""
+    get_thread_pool()
+    pool = get_process_pool()
+    if pool is not None:
+        # Workers are spawned on demand; a round of no-op tasks starts them all
+        for future in [pool.submit(os.getpid) for _ in range(ANALYSIS_PROCESS_WORKERS)]:
+            future.result()
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down both pools."""
+    global _process_pool, _thread_pool
+
+    with _lock:
+        pools = [_process_pool, _thread_pool]
+        _process_pool = None
+        _thread_pool = None
+
+    for pool in pools:
+        if pool is not None:
+            pool.shutdown(wait=wait)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Candidate Feature Store
+
+Caches per-candidate feature rows (features, scores, head predictions) keyed
+by post_id plus a hash of the content they were computed from. Rows live in
+one contiguous array, so a batch of hot candidates is served with a single
+gather, and only the misses go through the vectorized compute function.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+# Candidate fields a feature row is computed from
+CONTENT_FIELDS = ("text", "author_id", "media_type")
+
+# Fields identifying a stored row
+KEY_FIELDS = ("post_id",) + CONTENT_FIELDS
+
+# Memory per stored row beyond the row itself (about 185 bytes measured):
+# the integer key, its LRU entry and the slot index
+ENTRY_OVERHEAD_BYTES = 192
+
+
+def candidate_key(candidate: Dict[str, Any]) -> int:
+    """
+    Store key for a candidate: a hash of its post_id and content.
+
+    An edited post (same post_id, new text or media) gets a new key, so
+    stale rows are never served; they age out of the store instead. Fields
+    are hashed in str() form, so JSON lists or objects in any field work
+    as well as strings. The store lives in one process, so Python's 64-bit
+    hash is used: it is cached on the strings and far cheaper than a
+    cryptographic digest, and the key holds no reference to the request.
+    """
+    return hash(tuple([str(candidate.get(field, "")) for field in KEY_FIELDS]))
+
+
+class CandidateFeatureStore:
+    """
+    Size-bounded LRU store of candidate feature rows.
+
+    compute_fn maps a list of candidates to a (len(candidates), width) array
+    in one vectorized pass. The store holds at most max_bytes of rows plus
+    their per-entry overhead and evicts the least recently used rows beyond
+    that.
+    """
+
+    def __init__(
+        self,
+        compute_fn: Callable[[List[Dict[str, Any]]], np.ndarray],
+        width: int,
+        max_bytes: int = 32 * 1024 * 1024,
+        dtype: Any = np.float64
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            compute_fn: Computes feature rows for a batch of candidates
+            width: Number of columns per row
+            max_bytes: Memory budget for stored rows and their keys (0 disables the store)
+            dtype: Row dtype
+        """
+        self.compute_fn = compute_fn
+        self.width = width
+        self.dtype = np.dtype(dtype)
+        self.row_bytes = self.width * self.dtype.itemsize
+        self.entry_bytes = self.row_bytes + ENTRY_OVERHEAD_BYTES
+        self.capacity = max(0, int(max_bytes)) // self.entry_bytes
+        # Row storage grows by doubling up to capacity
+        self._rows = np.empty((0, width), dtype=self.dtype)
+        self._slots: "OrderedDict[int, int]" = OrderedDict()
+        self._free: List[int] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def rows(self, candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Feature rows for a batch of candidates, computing only the misses.
+
+        Args:
+            candidates: Candidate posts
+
+        Returns:
+            Array of shape (len(candidates), width), in candidate order
+        """
+        if not self.enabled:
+            return self.compute_fn(candidates)
+
+        keys = [candidate_key(candidate) for candidate in candidates]
+        out = np.empty((len(candidates), self.width), dtype=self.dtype)
+
+        # Duplicate candidates within a batch are computed once
+        missing: Dict[int, List[int]] = {}
+        hit_positions, hit_slots = [], []
+        with self._lock:
+            for position, key in enumerate(keys):
+                slot = self._slots.get(key)
+                if slot is None:
+                    missing.setdefault(key, []).append(position)
+                else:
+                    self._slots.move_to_end(key)
+                    hit_positions.append(position)
+                    hit_slots.append(slot)
+            if hit_slots:
+                out[hit_positions] = self._rows[hit_slots]
+            self.hits += len(hit_slots)
+            self.misses += len(keys) - len(hit_slots)
+
+        if missing:
+            first_positions = [positions[0] for positions in missing.values()]
+            computed = np.asarray(self.compute_fn([candidates[p] for p in first_positions]), dtype=self.dtype)
+            for row, positions in zip(computed, missing.values()):
+                out[positions] = row
+            self._store(list(missing), computed)
+
+        return out
+
+    def _store(self, keys: List[int], rows: np.ndarray) -> None:
+        """Insert freshly computed rows, evicting least recently used rows as needed."""
+        # A batch larger than the store keeps only its last rows
+        if len(keys) > self.capacity:
+            keys, rows = keys[-self.capacity:], rows[-self.capacity:]
+
+        with self._lock:
+            indices, slots = [], []
+            for index, key in enumerate(keys):
+                # Another thread may have stored the same key meanwhile
+                if key in self._slots:
+                    continue
+                slot = self._allocate_slot()
+                self._slots[key] = slot
+                indices.append(index)
+                slots.append(slot)
+            if slots:
+                self._rows[slots] = rows[indices]
+
+    def _allocate_slot(self) -> int:
+        """Free slot index, growing storage or evicting the LRU row (lock held)."""
+        if self._free:
+            return self._free.pop()
+
+        if len(self._rows) < self.capacity:
+            grown = min(self.capacity, max(1024, 2 * len(self._rows)))
+            rows = np.empty((grown, self.width), dtype=self.dtype)
+            rows[:len(self._rows)] = self._rows
+            self._free.extend(range(grown - 1, len(self._rows), -1))
+            slot = len(self._rows)
+            self._rows = rows
+            return slot
+
+        _, slot = self._slots.popitem(last=False)
+        self.evictions += 1
+        return slot
+
+    def clear(self) -> None:
+        """Drop every row (counters are kept)."""
+        with self._lock:
+            self._slots.clear()
+            self._free = list(range(len(self._rows) - 1, -1, -1))
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._slots),
+                "capacity": self.capacity,
+                "bytes": len(self._slots) * self.entry_bytes,
+                "allocated_bytes": self._rows.nbytes + len(self._slots) * ENTRY_OVERHEAD_BYTES,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cold-Start Import Time Report
+
+Imports each module in a fresh interpreter with `python -X importtime` and
+reports the total import time, the slowest top-level packages, and whether
+any module that should load lazily (JAX, Haiku) was pulled in at import.
+A nonzero exit status signals a budget or lazy-import violation, so the
+report can guard cold start in CI or before a deploy.
+
+Usage:
+    python import_report.py [module ...] [--budget-ms N] [--top N] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+DEFAULT_MODULES = ("agent", "main")
+
+# Loaded on first recommendation use or by the warmup thread, never at import
+LAZY_MODULES = ("jax", "jaxlib", "haiku", "phoenix_model", "quantization")
+
+
+def measure_imports(module: str) -> Dict[str, Any]:
+    """
+    Import module in a fresh interpreter and parse its -X importtime output.
+
+    Args:
+        module: Module name importable from this directory
+
+    Returns:
+        {"module", "ok", "total_ms", "packages": {top-level name: cumulative ms}, "modules": [...]}
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+    # Entries come in post-order: children are listed (one level deeper)
+    # before their parent, so the target module's direct imports are the
+    # depth-1 entries since the previous depth-0 entry (interpreter startup)
+    packages: Dict[str, float] = {}
+    children: Dict[str, float] = {}
+    imported: List[str] = []
+    total_ms = 0.0
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|")
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        name = raw_name.strip()
+        cumulative_ms = int(cumulative) / 1000
+        imported.append(name)
+
+        if depth == 1:
+            children[name] = cumulative_ms
+        elif depth == 0:
+            if name == module:
+                total_ms = cumulative_ms
+                packages = children
+            children = {}
+
+    return {
+        "module": module,
+        "ok": process.returncode == 0,
+        "error": process.stderr.strip().splitlines()[-1] if process.returncode else None,
+        "total_ms": round(total_ms, 1),
+        "packages": {name: round(ms, 1) for name, ms in sorted(packages.items(), key=lambda item: -item[1])},
+        "lazy_violations": sorted({name for name in imported if name.split(".")[0] in LAZY_MODULES})
+    }
+
+
+def print_report(report: Dict[str, Any], top: int) -> None:
+    """Human-readable summary of one module's imports."""
+    status = "ok" if report["ok"] else f"FAILED ({report['error']})"
+    print(f"import {report['module']}: {report['total_ms']:.1f} ms [{status}]")
+    for name, ms in list(report["packages"].items())[:top]:
+        print(f"  {ms:>9.1f} ms  {name}")
+    if report["lazy_violations"]:
+        print(f"  eagerly imported: {', '.join(report['lazy_violations'][:10])}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report cold-start import time")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES), help="Modules to import")
+    parser.add_argument("--budget-ms", type=float, help="Fail if any module takes longer to import")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list")
+    parser.add_argument("--json", action="store_true", help="Print the reports as JSON")
+    args = parser.parse_args()
+
+    reports = [measure_imports(module) for module in args.modules]
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            print_report(report, args.top)
+
+    failed = [
+        report["module"] for report in reports
+        if not report["ok"]
+        or report["lazy_violations"]
+        or (args.budget_ms is not None and report["total_ms"] > args.budget_ms)
+    ]
+    if failed:
+        print(f"Cold-start check failed for: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+JSON Encoding/Decoding Backend
+
+Uses orjson when it is installed (several times faster on large
+recommendation payloads) and the standard library otherwise. Set
+JSON_BACKEND=stdlib to force the fallback.
+
+Both backends raise json.JSONDecodeError on invalid input (orjson's error
+subclasses it), so callers handle one exception type.
+
+iter_array decodes a JSON array string one element at a time, for payloads
+too large to hold both as text and as parsed objects.
+"""
+import json
+import logging
+import os
+import re
+from typing import Any, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# "auto" uses orjson when available; "stdlib" always uses the json module
+JSON_BACKEND = os.getenv("JSON_BACKEND", "auto").lower()
+
+_USE_ORJSON = ORJSON_AVAILABLE and JSON_BACKEND != "stdlib"
+if JSON_BACKEND == "orjson" and not ORJSON_AVAILABLE:
+    logger.warning("JSON_BACKEND=orjson but orjson is not installed - using the stdlib json module")
+
+if _USE_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Insignificant whitespace between JSON tokens
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def backend_name() -> str:
+    """Name of the active backend ("orjson" or "stdlib")."""
+    return "orjson" if _USE_ORJSON else "stdlib"
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document.
+
+    orjson rejects some input the stdlib accepts (lone surrogate escapes
+    such as "\\ud800"), so documents it cannot parse are retried with the
+    stdlib parser, which raises for genuinely invalid JSON.
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON
+    """
+    if _USE_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Render obj as a JSON string (UTF-8 text, non-ASCII characters kept as is).
+
+    Output is compact (no spaces after separators) on both backends, so the
+    same value renders to the same text whichever backend is active. Values
+    orjson cannot encode (integers beyond 64 bits, unsupported types) go
+    through the stdlib encoder instead, which either handles them or raises
+    its usual TypeError.
+    """
+    if _USE_ORJSON:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def iter_array(text: str) -> Iterator[Any]:
+    """
+    Decode the elements of a JSON array string one at a time.
+
+    Each element is parsed with the stdlib scanner starting at its offset,
+    so only the element being consumed is materialized, never the full
+    list. The end of the document is checked after the last element.
+
+    Args:
+        text: JSON document whose top-level value is an array
+
+    Yields:
+        The array's elements, in order
+
+    Raises:
+        json.JSONDecodeError: If text is not a valid JSON array (raised when
+            the iteration reaches the invalid part)
+    """
+    end = _WHITESPACE.match(text, 0).end()
+    if text[end:end + 1] != "[":
+        raise json.JSONDecodeError("Expecting '['", text, end)
+
+    end = _WHITESPACE.match(text, end + 1).end()
+    if text[end:end + 1] != "]":
+        while True:
+            value, end = _decoder.raw_decode(text, end)
+            yield value
+
+            end = _WHITESPACE.match(text, end).end()
+            delimiter = text[end:end + 1]
+            if delimiter == "]":
+                break
+            if delimiter != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, end)
+            end = _WHITESPACE.match(text, end + 1).end()
+
+    end = _WHITESPACE.match(text, end + 1).end()
+    if end != len(text):
+        raise json.JSONDecodeError("Extra data", text, end)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Document-Frequency Table for TF-IDF Keyword Scoring
+
+Tracks in how many processed documents each keyword term appeared, so
+keyword relevance can be weighted by inverse document frequency and
+compared across documents. The table is persisted to a JSON file and
+updated as keyword jobs are processed.
+"""
+import atexit
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+KEYWORD_DF_PATH = os.getenv("KEYWORD_DF_PATH", "keyword_df.json")
+KEYWORD_DF_SAVE_EVERY = int(os.getenv("KEYWORD_DF_SAVE_EVERY", "50"))      # Documents between saves
+KEYWORD_DF_MAX_TERMS = int(os.getenv("KEYWORD_DF_MAX_TERMS", "200000"))    # Vocabulary bound
+
+
+class DocumentFrequencyTable:
+    """
+    Persisted term -> document-count table.
+
+    Thread-safe; the table is flushed to disk every save_every documents
+    (on a background thread, so jobs never wait on file I/O) and at
+    interpreter exit.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        save_every: int = KEYWORD_DF_SAVE_EVERY,
+        max_terms: int = KEYWORD_DF_MAX_TERMS
+    ):
+        """
+        Initialize the table, loading existing counts from path if present.
+
+        Args:
+            path: JSON file used for persistence (None keeps the table in memory)
+            save_every: Number of added documents between automatic saves
+            max_terms: Maximum vocabulary size before rare terms are pruned
+        """
+        self.path = path
+        self.save_every = max(1, save_every)
+        self.max_terms = max_terms
+        self.total_documents = 0
+        self.counts: Dict[str, int] = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        # Serializes writers so saves land in snapshot order
+        self._save_lock = threading.Lock()
+        self._save_thread: Optional[threading.Thread] = None
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def load(self) -> None:
+        """Load counts from the persistence file."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.total_documents = int(data.get("total_documents", 0))
+            self.counts = {term: int(count) for term, count in data.get("counts", {}).items()}
+            logger.info(f"Loaded document frequencies for {len(self.counts)} terms from {self.path}")
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load document frequency table from {self.path}: {e}")
+
+    def save(self) -> None:
+        """Atomically write counts to the persistence file."""
+        if not self.path:
+            return
+
+        with self._save_lock:
+            with self._lock:
+                data = {"total_documents": self.total_documents, "counts": dict(self.counts)}
+                self._unsaved = 0
+
+            # A unique temporary file in the target directory, so concurrent
+            # writers (threads or processes) never replace the table with a
+            # partially written one
+            tmp_path = None
+            try:
+                with tempfile.NamedTemporaryFile(
+                    "w",
+                    encoding="utf-8",
+                    dir=os.path.dirname(os.path.abspath(self.path)),
+                    prefix=f"{os.path.basename(self.path)}.",
+                    suffix=".tmp",
+                    delete=False
+                ) as f:
+                    tmp_path = f.name
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"Could not save document frequency table to {self.path}: {e}")
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
+    def save_in_background(self) -> threading.Thread:
+        """
+        Save on a background thread, unless a background save is already running.
+
+        Returns:
+            The thread performing (or already performing) the save
+        """
+        with self._lock:
+            if self._save_thread is None or not self._save_thread.is_alive():
+                self._save_thread = threading.Thread(target=self.save, name="keyword-df-save")
+                self._save_thread.start()
+            return self._save_thread
+
+    def add_document(self, terms: Iterable[str]) -> None:
+        """
+        Record one processed document.
+
+        Args:
+            terms: Distinct keyword terms that occur in the document
+        """
+        with self._lock:
+            self.total_documents += 1
+            counts = self.counts
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+
+            if len(counts) > self.max_terms:
+                self._prune()
+
+            self._unsaved += 1
+            should_save = self._unsaved >= self.save_every
+
+        if should_save:
+            self.save_in_background()
+
+    def _prune(self) -> None:
+        """Drop the rarest terms so the vocabulary shrinks to 90% of max_terms."""
+        keep = int(self.max_terms * 0.9)
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        self.counts = dict(ranked[:keep])
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency of a term."""
+        return math.log((1 + self.total_documents) / (1 + self.counts.get(term, 0))) + 1.0
+
+
+# Singleton instance for the document frequency table
+_df_table: Optional[DocumentFrequencyTable] = None
+_df_table_lock = threading.Lock()
+
+
+def get_document_frequency_table() -> DocumentFrequencyTable:
+    """
+    Get or create the global document frequency table.
+
+    Returns:
+        DocumentFrequencyTable persisted at KEYWORD_DF_PATH
+    """
+    global _df_table
+
+    with _df_table_lock:
+        if _df_table is None:
+            _df_table = DocumentFrequencyTable(path=KEYWORD_DF_PATH)
+            atexit.register(_df_table.save)
+
+    return _df_table
@@ -3,10 +3,17 @@
 X-Analyst - Main Entry Point
 
 AI-powered text analysis agent with Masumi payment integration.
-Supports sentiment analysis, summarization, statistics, keywords, and Phoenix recommendations.
+Supports sentiment analysis, summarization, statistics, keywords, batch analysis, and Phoenix recommendations.
 """
+import logging
 import os
 import sys
+import threading
+import time
+
+# Cold-start import cost (JAX/Haiku load later, on first recommendation or
+# in the warmup thread); python import_report.py breaks it down
+_import_start = time.perf_counter()
 
 # Load environment variables FIRST, before any other imports
 # This ensures .env file is loaded before masumi package tries to read env vars
@@ -22,6 +29,7 @@ if sys.version_info < (3, 9):
 try:
     from masumi import create_masumi_app, Config
     from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
     import uvicorn
     print("✓ Successfully imported masumi")
 except ImportError as e:
@@ -33,14 +41,60 @@ except ImportError as e:
     print("4. Python version: python --version (need 3.9+)")
     sys.exit(1)
 
-from agent import process_job
+from agent import process_job, process_job_json, get_result_cache, PHOENIX_AVAILABLE
+from executors import run_in_thread_pool, start_executors
+from metrics import PROMETHEUS_AVAILABLE, render_metrics
+from model_workers import model_workers_enabled, model_worker_stats, start_model_workers
+
+_import_seconds = time.perf_counter() - _import_start
 
 # Optional: enable debug logging for Masumi payment status (set DEBUG_MASUMI=1 when troubleshooting)
 if os.getenv("DEBUG_MASUMI", "").strip().lower() in ("1", "true", "yes"):
-    import logging
     logging.getLogger("masumi").setLevel(logging.DEBUG)
     print("✓ Masumi debug logging enabled (payment status responses will be logged)")
 
+logger = logging.getLogger(__name__)
+
+# Readiness: /availability reports unavailable until warmup has succeeded, so
+# jobs are never routed to a cold replica or one whose model failed to load
+_ready = threading.Event()
+_readiness_message = "Warming up (starting workers and model)"
+
+# Routes added by this module that need the warmed-up workers or model; they
+# answer 503 until ready (masumi's own routes are covered by availability())
+_WARM_ONLY_PATHS = ("/model_stats",)
+
+
+async def availability():
+    """Availability handler for masumi's /availability endpoint (unavailable until warmup succeeds)."""
+    return {
+        "status": "available" if _ready.is_set() else "unavailable",
+        "type": "masumi-agent",
+        "message": _readiness_message
+    }
+
+
+def warm_up():
+    """Start worker pools and run model warmup passes, then report ready (only on success)."""
+    global _readiness_message
+    try:
+        start_executors()
+        if PHOENIX_AVAILABLE and model_workers_enabled():
+            workers = start_model_workers()
+            print(f"✓ Started {workers['workers']} model workers "
+                  f"({workers['shared_bytes'] / 2**20:.1f} MiB shared parameters)")
+        elif PHOENIX_AVAILABLE:
+            from model_service import get_model_service
+            warmup = get_model_service().warmup()
+            print(f"✓ Model warmed up in {warmup['seconds']}s ({warmup['warmed_buckets']} shape buckets)")
+    except Exception as e:
+        logger.exception("Warmup failed - /availability stays unavailable")
+        _readiness_message = f"Warmup failed: {e}"
+        return
+
+    _readiness_message = "Server operational"
+    _ready.set()
+
 # Define input schema - Clean and concise for better UI presentation
 INPUT_SCHEMA = {
     "input_data": [
@@ -50,7 +104,7 @@ INPUT_SCHEMA = {
             "name": "Analysis Type",
             "data": {
                 "description": "Choose the type of analysis",
-                "values": ["sentiment", "summary", "stats", "keywords", "recommendations", "general"],
+                "values": ["sentiment", "summary", "stats", "keywords", "recommendations", "general", "batch"],
                 "default": "general"
             },
             "validations": []
@@ -82,6 +136,19 @@ INPUT_SCHEMA = {
                 {"validation": "max", "value": "100"}
             ]
         },
+        {
+            "id": "keyword_scoring",
+            "type": "option",
+            "name": "Keyword Scoring",
+            "data": {
+                "description": "Rank keywords by frequency or TF-IDF",
+                "values": ["frequency", "tfidf"],
+                "default": "frequency"
+            },
+            "validations": [
+                {"validation": "optional", "value": "true"}
+            ]
+        },
         {
             "id": "summary_sentences",
             "type": "number",
@@ -133,6 +200,31 @@ INPUT_SCHEMA = {
             "validations": [
                 {"validation": "optional", "value": "true"}
             ]
+        },
+        {
+            "id": "texts",
+            "type": "text",
+            "name": "Texts (Batch)",
+            "data": {
+                "description": "Texts to analyze in one job (optional for batch)",
+                "placeholder": "JSON: [\"first post\", {\"text\":\"second post\",\"analysis_type\":\"sentiment\"}]"
+            },
+            "validations": [
+                {"validation": "optional", "value": "true"}
+            ]
+        },
+        {
+            "id": "item_analysis_type",
+            "type": "option",
+            "name": "Batch Item Analysis",
+            "data": {
+                "description": "Analysis for batch texts without their own type",
+                "values": ["sentiment", "summary", "stats", "keywords", "general"],
+                "default": "general"
+            },
+            "validations": [
+                {"validation": "optional", "value": "true"}
+            ]
         }
     ]
 }
@@ -162,8 +254,9 @@ if __name__ == "__main__":
         agent_identifier=agent_identifier,
         network=network,
         seller_vkey=seller_vkey,
-        start_job_handler=process_job,
-        input_schema_handler=INPUT_SCHEMA
+        start_job_handler=process_job_json,
+        input_schema_handler=INPUT_SCHEMA,
+        availability_handler=availability
     )
 
     # *** ADD CORS MIDDLEWARE ***
@@ -176,6 +269,42 @@ if __name__ == "__main__":
         allow_headers=["*"],  # Allow all headers
     )
 
+    # Until warmup completes (and for good if it failed), this module's
+    # warm-only routes answer 503 instead of loading the model in a request
+    @app.middleware("http")
+    async def readiness_gate(request, call_next):
+        if request.url.path in _WARM_ONLY_PATHS and not _ready.is_set():
+            return JSONResponse(
+                status_code=503,
+                content={"status": "unavailable", "message": _readiness_message}
+            )
+        return await call_next(request)
+
+    # Result cache hit/miss counters for monitoring
+    @app.get("/cache_stats")
+    async def cache_stats():
+        return get_result_cache().stats()
+
+    # Phoenix inference counters (compiled shape buckets, hits, recompiles)
+    if PHOENIX_AVAILABLE:
+        from model_service import get_model_service
+
+        @app.get("/model_stats")
+        async def model_stats():
+            if model_workers_enabled():
+                return await run_in_thread_pool(model_worker_stats)
+            return get_model_service().inference_stats()
+
+    # Prometheus metrics: per-stage job latency, validation failures, cache
+    # hits, mock fallbacks and in-flight jobs (needs prometheus-client)
+    if PROMETHEUS_AVAILABLE:
+        from fastapi import Response
+
+        @app.get("/metrics")
+        async def metrics():
+            body, content_type = render_metrics()
+            return Response(content=body, media_type=content_type)
+
     # Display startup information
     print("\n" + "="*70)
     print("🚀 Starting X-Analyst Agent Server...")
@@ -183,12 +312,22 @@ if __name__ == "__main__":
     print(f"Python Version:           {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
     print(f"Agent Identifier:         {agent_identifier}")
     print(f"Network:                  {network}")
+    print(f"Import Time:              {_import_seconds:.2f}s")
     print(f"API Documentation:        http://127.0.0.1:{port}/docs")
     print(f"Availability Check:       http://127.0.0.1:{port}/availability")
     print(f"Input Schema:             http://127.0.0.1:{port}/input_schema")
     print(f"Start Job:                http://127.0.0.1:{port}/start_job")
+    print(f"Cache Stats:              http://127.0.0.1:{port}/cache_stats")
+    if PHOENIX_AVAILABLE:
+        print(f"Model Stats:              http://127.0.0.1:{port}/model_stats")
+    if PROMETHEUS_AVAILABLE:
+        print(f"Metrics:                  http://127.0.0.1:{port}/metrics")
     print("="*70 + "\n")
 
+    # Warm up worker pools and the model in the background; /availability
+    # reports ready once this succeeds
+    threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+
     # Run server
     uvicorn.run(app, host=host, port=port)
 
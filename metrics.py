@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Prometheus Metrics for X-Analyst
+
+Per-stage job latency histograms, counters for validation failures, result
+cache lookups and mock-model fallbacks, an in-flight jobs gauge and a
+histogram of micro-batch sizes.
+
+prometheus-client is optional: without it every metric is a no-op and
+main.py does not expose /metrics.
+
+Metrics live in the process that records them, so scoring done in model
+worker processes (PHOENIX_MODEL_WORKERS) does not report mock fallbacks.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    logger.info("prometheus-client not installed - metrics disabled")
+
+# Job stages, in processing order ("score" is the micro-batched model call
+# within "analyze", from submission to result)
+STAGES = ("parse", "validate", "analyze", "score", "serialize")
+
+# Parse and serialize take well under a millisecond for small jobs
+STAGE_BUCKETS_SECONDS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Requests per micro-batched model call
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+class _NoopMetric:
+    """Stands in for every metric type when prometheus-client is missing."""
+
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+    def observe(self, amount: float) -> None:
+        pass
+
+
+if PROMETHEUS_AVAILABLE:
+    JOB_STAGE_SECONDS = Histogram(
+        "xanalyst_job_stage_seconds",
+        "Time spent in each job processing stage",
+        ["analysis_type", "stage"],
+        buckets=STAGE_BUCKETS_SECONDS
+    )
+    VALIDATION_FAILURES = Counter(
+        "xanalyst_validation_failures_total",
+        "Jobs rejected by input parsing or validation",
+        ["analysis_type"]
+    )
+    RESULT_CACHE_HITS = Counter(
+        "xanalyst_result_cache_hits_total",
+        "Jobs served from the result cache",
+        ["analysis_type"]
+    )
+    RESULT_CACHE_MISSES = Counter(
+        "xanalyst_result_cache_misses_total",
+        "Result cache lookups that had to run the analysis",
+        ["analysis_type"]
+    )
+    MOCK_FALLBACKS = Counter(
+        "xanalyst_mock_fallbacks_total",
+        "Phoenix calls that fell back to mock predictions after an error",
+        ["path"]
+    )
+    JOBS_IN_FLIGHT = Gauge(
+        "xanalyst_jobs_in_flight",
+        "Jobs currently being processed"
+    )
+    MODEL_BATCH_SIZE = Histogram(
+        "xanalyst_model_batch_size",
+        "Requests per micro-batched model call",
+        buckets=BATCH_SIZE_BUCKETS
+    )
+else:
+    JOB_STAGE_SECONDS = VALIDATION_FAILURES = RESULT_CACHE_HITS = RESULT_CACHE_MISSES = _NoopMetric()
+    MOCK_FALLBACKS = JOBS_IN_FLIGHT = MODEL_BATCH_SIZE = _NoopMetric()
+
+
+def observe_stage(analysis_type: str, stage: str, seconds: float) -> None:
+    """Record the duration of one job stage."""
+    JOB_STAGE_SECONDS.labels(analysis_type=analysis_type, stage=stage).observe(seconds)
+
+
+def observe_batch_size(size: int) -> None:
+    """Record the number of requests in one micro-batched model call."""
+    MODEL_BATCH_SIZE.observe(size)
+
+
+@contextmanager
+def time_stage(analysis_type: str, stage: str) -> Iterator[None]:
+    """Time the enclosed block as one job stage (also when it returns early or raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(analysis_type, stage, time.perf_counter() - start)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Current metrics in the Prometheus text exposition format.
+
+    Returns:
+        (body, content type)
+    """
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -5,26 +5,219 @@ Model Service for Phoenix Recommendation System
 This module provides a service layer for loading and serving predictions
 from the Phoenix Grok-based recommendation model.
 """
+import heapq
+import importlib.util
+import json
 import logging
 import os
-from typing import Dict, Any, List, Optional, Tuple
+import re
+import threading
+import time
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 import numpy as np
 
+import json_codec
+from batching import MicroBatcher
+from feature_store import CandidateFeatureStore
+from metrics import MOCK_FALLBACKS
+
 logger = logging.getLogger(__name__)
 
-# Try importing JAX dependencies (optional for now)
-try:
-    import jax
-    import jax.numpy as jnp
-    import haiku as hk
-    JAX_AVAILABLE = True
-    logger.info("JAX and Haiku successfully imported")
-except ImportError:
-    JAX_AVAILABLE = False
+# Version tag of the Phoenix model served; part of downstream cache keys
+MODEL_VERSION = os.getenv("PHOENIX_MODEL_VERSION", "phoenix-grok-v1")
+
+# Micro-batching of concurrent scoring requests (max batch size 1 disables
+# it). Requests queued while a batch runs always join the next one; a
+# nonzero window also holds each batch's first request that long for more
+PHOENIX_BATCH_WINDOW_MS = float(os.getenv("PHOENIX_BATCH_WINDOW_MS", "0"))
+PHOENIX_MAX_BATCH_SIZE = int(os.getenv("PHOENIX_MAX_BATCH_SIZE", "16"))
+
+# Requests with more candidates than this are ranked in streaming chunks of
+# this size, keeping only a bounded top-k heap (matches the largest
+# candidate shape bucket of the real model)
+PHOENIX_RANKING_CHUNK_SIZE = int(os.getenv("PHOENIX_RANKING_CHUNK_SIZE", "1024"))
+
+# Memory budget of the candidate feature store (0 disables it)
+PHOENIX_FEATURE_STORE_MAX_BYTES = int(os.getenv("PHOENIX_FEATURE_STORE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# JAX/Haiku are optional and take seconds to import, so only check that they
+# are installed here; phoenix_model imports them when a real model is loaded
+# (on first recommendation use or in the startup warmup thread)
+JAX_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ("jax", "haiku"))
+if not JAX_AVAILABLE:
     logger.warning("JAX/Haiku not available - using mock predictions for development")
 
 
+# Engagement heads predicted per candidate, in output order
+ENGAGEMENT_HEADS = ("like", "repost", "reply", "click", "profile_click", "video_view")
+
+# Mock model heuristics
+ENGAGEMENT_KEYWORDS = ("ai", "ml", "tech", "news", "breaking", "important")
+KEYWORD_BOOST = 0.1
+MAX_POST_LENGTH = 280.0  # Normalize by max tweet length
+_HEAD_WEIGHTS = np.array([0.8, 0.3, 0.2, 0.6, 0.1, 0.4])
+# Each pattern consumes the rest of the candidate after a hit, so a scan
+# yields at most one match per candidate
+_KEYWORD_PATTERNS = [re.compile(re.escape(kw) + "[^\x00]*") for kw in ENGAGEMENT_KEYWORDS]
+
+# Candidate feature columns: text length, one hit flag per engagement keyword, is-video flag
+FEATURE_LENGTH = 0
+FEATURE_KEYWORDS = slice(1, 1 + len(ENGAGEMENT_KEYWORDS))
+FEATURE_VIDEO = 1 + len(ENGAGEMENT_KEYWORDS)
+NUM_FEATURES = FEATURE_VIDEO + 1
+
+# Feature store row columns: features, then score, then one column per head
+ROW_SCORE = NUM_FEATURES
+ROW_HEADS = slice(ROW_SCORE + 1, ROW_SCORE + 1 + len(ENGAGEMENT_HEADS))
+ROW_WIDTH = ROW_HEADS.stop
+
+
+class CandidateInputError(ValueError):
+    """Candidates decoded while ranking turned out to be invalid."""
+
+
+def candidate_features(candidates: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Compute the mock model's feature matrix for a batch of candidates.
+
+    Keyword hits are found by scanning all lowercased texts joined into one
+    string and mapping match offsets back to candidates, so the cost is a
+    few C-level scans instead of a Python loop per candidate and keyword.
+
+    Args:
+        candidates: Candidate posts ({"text": str, "media_type": str, ...})
+
+    Returns:
+        float64 array of shape (len(candidates), NUM_FEATURES)
+    """
+    n = len(candidates)
+    features = np.zeros((n, NUM_FEATURES))
+    if n == 0:
+        return features
+
+    texts = [candidate.get("text", "") for candidate in candidates]
+    lowered = [text.lower() for text in texts]
+    lengths = np.fromiter(map(len, lowered), dtype=np.int64, count=n)
+    features[:, FEATURE_LENGTH] = np.fromiter(map(len, texts), dtype=np.int64, count=n)
+    features[:, FEATURE_VIDEO] = [candidate.get("media_type") == "video" for candidate in candidates]
+
+    # Texts are joined with a separator no keyword contains, so matches never
+    # span candidates; ends[i] is the offset one past candidate i's separator
+    joined = "\x00".join(lowered)
+    ends = np.cumsum(lengths + 1)
+    for column, pattern in enumerate(_KEYWORD_PATTERNS, start=FEATURE_KEYWORDS.start):
+        starts = np.fromiter((m.start() for m in pattern.finditer(joined)), dtype=np.int64)
+        if starts.size:
+            features[np.searchsorted(ends, starts, side="right"), column] = 1.0
+
+    return features
+
+
+def score_candidate_features(features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score candidates from their feature matrix.
+
+    Args:
+        features: Array from candidate_features, shape (n, NUM_FEATURES)
+
+    Returns:
+        (scores, heads): scores of shape (n,) and per-head engagement
+        predictions of shape (n, len(ENGAGEMENT_HEADS))
+    """
+    base_score = np.minimum(features[:, FEATURE_LENGTH] / MAX_POST_LENGTH, 1.0)
+
+    # Boost for certain keywords (simulate engagement patterns); added one
+    # keyword at a time to match sequential float accumulation exactly
+    keyword_boost = np.zeros(len(features))
+    for column in range(FEATURE_KEYWORDS.start, FEATURE_KEYWORDS.stop):
+        keyword_boost += np.where(features[:, column] > 0, KEYWORD_BOOST, 0.0)
+
+    scores = np.minimum(base_score + keyword_boost, 1.0)
+
+    # Generate mock engagement predictions; video views only for video posts
+    heads = scores[:, None] * _HEAD_WEIGHTS
+    heads[:, -1] = np.where(features[:, FEATURE_VIDEO] > 0, heads[:, -1], 0.0)
+    return scores, heads
+
+
+def candidate_rows(candidates: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Compute feature store rows (features, score, heads) for a batch of candidates.
+
+    Args:
+        candidates: Candidate posts
+
+    Returns:
+        float64 array of shape (len(candidates), ROW_WIDTH)
+    """
+    features = candidate_features(candidates)
+    scores, heads = score_candidate_features(features)
+    return np.column_stack([features, scores, heads])
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, in rank order.
+
+    Uses argpartition so only the selected k are sorted. Ties are broken by
+    input order, matching a stable descending sort of all scores.
+
+    Args:
+        scores: Candidate scores, shape (n,)
+        k: Number of indices to return (clamped to [0, n])
+
+    Returns:
+        Candidate indices, best first
+    """
+    n = len(scores)
+    k = max(0, min(int(k), n))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+
+    if k < n:
+        kth_score = scores[np.argpartition(-scores, k - 1)[:k]].min()
+        above = np.flatnonzero(scores > kth_score)
+        tied = np.flatnonzero(scores == kth_score)[:k - len(above)]
+        selected = np.concatenate([above, tied])
+    else:
+        selected = np.arange(n)
+
+    return selected[np.lexsort((selected, -scores[selected]))]
+
+
+def build_predictions(
+    candidates: List[Dict[str, Any]],
+    scores: np.ndarray,
+    heads: np.ndarray,
+    order: np.ndarray
+) -> List[Dict[str, Any]]:
+    """
+    Build ranked prediction dicts for the candidates selected by order.
+
+    Args:
+        candidates: Candidate posts
+        scores: Candidate scores, shape (n,)
+        heads: Engagement predictions, shape (n, len(ENGAGEMENT_HEADS))
+        order: Candidate indices in rank order (may select a subset)
+
+    Returns:
+        [{"post_id", "score", "predictions", "rank"}] in rank order
+    """
+    score_list = scores[order].tolist()
+    head_rows = heads[order].tolist()
+    return [
+        {
+            "post_id": candidates[index].get("post_id", "unknown"),
+            "score": score,
+            "predictions": dict(zip(ENGAGEMENT_HEADS, head_row)),
+            "rank": rank
+        }
+        for rank, (index, score, head_row) in enumerate(zip(order.tolist(), score_list, head_rows), start=1)
+    ]
+
+
 class PhoenixModelService:
     """
     Service for loading and serving Phoenix recommendation model predictions.
@@ -36,7 +229,10 @@ class PhoenixModelService:
     def __init__(
         self,
         model_path: Optional[str] = None,
-        use_mock: bool = False
+        use_mock: bool = False,
+        quantization: str = "none",
+        shared_params: Optional[Dict[str, Any]] = None,
+        micro_batching: bool = True
     ):
         """
         Initialize the Phoenix model service.
@@ -44,38 +240,82 @@ class PhoenixModelService:
         Args:
             model_path: Path to trained model checkpoint
             use_mock: If True, use mock predictions instead of real model
+            quantization: Weight format for CPU inference ("none" or "int8")
+            shared_params: Manifest of parameters published to shared memory
+                by a loader process (see model_workers); used instead of
+                reading model_path
+            micro_batching: Gather concurrent scoring calls into batches
+                (pointless in a model worker, which runs one task at a time)
         """
         self.model_path = model_path
+        self.quantization = quantization
+        self.shared_params = shared_params
+        self._shared_segment = None
         self.use_mock = use_mock or not JAX_AVAILABLE
         self.model = None
         self.params = None
 
+        # Concurrent requests are gathered into one batched scoring call
+        self.batcher = None
+        if micro_batching and PHOENIX_MAX_BATCH_SIZE > 1:
+            self.batcher = MicroBatcher(
+                self.score_candidates_batch,
+                single_fn=lambda request: self.score_candidates(*request),
+                window_ms=PHOENIX_BATCH_WINDOW_MS,
+                max_batch_size=PHOENIX_MAX_BATCH_SIZE,
+                name="phoenix-batcher"
+            )
+
+        # Mock scores depend only on the candidate, so hot candidates are
+        # served from the feature store instead of being recomputed
+        self.feature_store = CandidateFeatureStore(
+            candidate_rows,
+            width=ROW_WIDTH,
+            max_bytes=PHOENIX_FEATURE_STORE_MAX_BYTES
+        )
+
         if self.use_mock:
             logger.info("Using mock model for development/testing")
         else:
-            logger.info(f"Initializing Phoenix model from: {model_path}")
+            logger.info(f"Initializing Phoenix model from: {shared_params['segment'] if shared_params else model_path}")
             self._load_model()
 
+    @property
+    def model_version(self) -> str:
+        """Version tag identifying which predictor produces results."""
+        return f"{MODEL_VERSION}-mock" if self.use_mock else MODEL_VERSION
+
     def _load_model(self):
-        """Load the trained Phoenix model from checkpoint."""
-        if not self.model_path or not os.path.exists(self.model_path):
+        """Load the trained Phoenix model from checkpoint or shared memory."""
+        if self.shared_params is None and (not self.model_path or not os.path.exists(self.model_path)):
             logger.warning(f"Model path not found: {self.model_path}. Using mock mode.")
             self.use_mock = True
             return
 
         try:
-            # TODO: Implement actual model loading from checkpoint
-            # This would involve:
-            # 1. Loading model config
-            # 2. Initializing Haiku model
-            # 3. Loading trained parameters
-            # 4. Compiling inference function
+            # Imported here: the Haiku model definition needs JAX
+            from phoenix_model import PhoenixConfig, PhoenixInference, load_checkpoint, unflatten_params
+
+            if self.shared_params is not None:
+                # Read-only views of the loader process's copy; the segment
+                # must stay attached as long as the model uses them
+                from shared_params import SharedParams
+                self._shared_segment = SharedParams.attach(self.shared_params)
+                config = PhoenixConfig.from_dict(self.shared_params["config"])
+                params = unflatten_params(self._shared_segment.arrays())
+            else:
+                # Memory-mapped checkpoints are opened lazily, not read onto the heap
+                config, params = load_checkpoint(self.model_path)
+            # Inference is compiled lazily per padded shape bucket
+            self.model = PhoenixInference(config, params, quantization=self.quantization)
+            self.params = self.model.params
 
             logger.info("Model loaded successfully")
 
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             logger.warning("Falling back to mock mode")
+            MOCK_FALLBACKS.labels(path="load").inc()
             self.use_mock = True
 
     def predict_engagement(
@@ -116,6 +356,28 @@ class PhoenixModelService:
                     }
                 ]
         """
+        scores, heads = self._score(user_history, candidates)
+
+        # Sort by score (stable, so ties keep input order) and assign ranks
+        order = np.argsort(-scores, kind="stable")
+        return build_predictions(candidates, scores, heads, order)
+
+    def score_candidates(
+        self,
+        user_history: List[Dict[str, Any]],
+        candidates: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score candidate posts without ranking them.
+
+        Args:
+            user_history: List of user's past engagements
+            candidates: List of candidate posts
+
+        Returns:
+            (scores, heads): scores of shape (n,) and engagement predictions
+            of shape (n, len(ENGAGEMENT_HEADS)), in candidate order
+        """
         if self.use_mock:
             return self._mock_predict(user_history, candidates)
 
@@ -123,71 +385,118 @@ class PhoenixModelService:
             return self._real_predict(user_history, candidates)
         except Exception as e:
             logger.error(f"Prediction error: {e}. Falling back to mock predictions.")
+            MOCK_FALLBACKS.labels(path="predict").inc()
             return self._mock_predict(user_history, candidates)
 
+    def score_candidates_batch(
+        self,
+        requests: List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Score several (user_history, candidates) requests in one batched pass.
+
+        Errors are raised rather than answered with mock predictions: one
+        malformed request must not decide the scores of the whole batch.
+        The micro-batcher then scores each request with score_candidates,
+        which falls back to mock predictions per request.
+
+        Args:
+            requests: (user_history, candidates) pairs
+
+        Returns:
+            One (scores, heads) pair per request, in request order
+        """
+        if self.use_mock:
+            return self._mock_predict_batch(requests)
+        return self.model.predict_batch(requests)
+
+    def _score(
+        self,
+        user_history: List[Dict[str, Any]],
+        candidates: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score one request, through the micro-batcher when enabled."""
+        if self.batcher is not None:
+            return self.batcher.submit((user_history, candidates))
+        return self.score_candidates(user_history, candidates)
+
     def _real_predict(
         self,
         user_history: List[Dict[str, Any]],
         candidates: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """Real model prediction using Phoenix transformer."""
-        # TODO: Implement actual model inference
-        # This would involve:
-        # 1. Prepare input batch (hash features, embeddings)
-        # 2. Run forward pass through model
-        # 3. Extract logits and convert to probabilities
-        # 4. Compute weighted scores
+        if self.model is None:
+            raise RuntimeError("Phoenix model is not loaded")
 
-        raise NotImplementedError("Real model inference not yet implemented")
+        return self.model.predict(user_history, candidates)
 
     def _mock_predict(
         self,
         user_history: List[Dict[str, Any]],
         candidates: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Mock predictions for development/testing.
 
-        Uses simple heuristics based on text content.
+        Uses simple heuristics based on text content. Rows of candidates
+        seen before are gathered from the feature store; the rest are
+        computed in one batched array pass.
         """
-        results = []
+        rows = self.feature_store.rows(candidates)
+        return rows[:, ROW_SCORE], rows[:, ROW_HEADS]
 
-        for candidate in candidates:
-            post_id = candidate.get("post_id", "unknown")
-            text = candidate.get("text", "")
+    def _mock_predict_batch(
+        self,
+        requests: List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Mock predictions for several requests from one concatenated feature pass."""
+        all_candidates = [candidate for _, candidates in requests for candidate in candidates]
+        scores, heads = self._mock_predict([], all_candidates)
 
-            # Simple heuristic scoring based on text length and content
-            base_score = min(len(text) / 280.0, 1.0)  # Normalize by max tweet length
+        offsets = np.cumsum([len(candidates) for _, candidates in requests])[:-1]
+        return list(zip(np.split(scores, offsets), np.split(heads, offsets)))
 
-            # Boost for certain keywords (simulate engagement patterns)
-            engagement_keywords = ['ai', 'ml', 'tech', 'news', 'breaking', 'important']
-            keyword_boost = sum(0.1 for kw in engagement_keywords if kw.lower() in text.lower())
+    def warmup(self) -> Dict[str, Any]:
+        """
+        Run warmup forward passes so no request pays first-call costs.
 
-            score = min(base_score + keyword_boost, 1.0)
+        With a real model every shape bucket is compiled and executed once;
+        in mock mode a single tiny batch exercises the mock path.
 
-            # Generate mock engagement predictions
-            predictions = {
-                "like": score * 0.8,
-                "repost": score * 0.3,
-                "reply": score * 0.2,
-                "click": score * 0.6,
-                "profile_click": score * 0.1,
-                "video_view": score * 0.4 if candidate.get("media_type") == "video" else 0.0
-            }
+        Returns:
+            {"using_mock": bool, "warmed_buckets": int, "seconds": float}
+        """
+        start = time.perf_counter()
+        warmed_buckets = 0
 
-            results.append({
-                "post_id": post_id,
-                "score": score,
-                "predictions": predictions,
-                "rank": 0  # Will be assigned after sorting
-            })
+        if not self.use_mock and self.model is not None:
+            warmed_buckets = len(self.model.warmup())
+        else:
+            self._mock_predict(
+                [{"post_id": "warmup", "action": "like", "timestamp": 0}],
+                [{"post_id": "warmup", "text": "warmup", "media_type": "text"}]
+            )
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Model warmup finished in {elapsed:.2f}s ({warmed_buckets} buckets)")
+        return {"using_mock": self.use_mock, "warmed_buckets": warmed_buckets, "seconds": round(elapsed, 3)}
 
-        # Sort by score and assign ranks
-        results.sort(key=lambda x: x["score"], reverse=True)
-        for i, result in enumerate(results):
-            result["rank"] = i + 1
+    def inference_stats(self) -> Dict[str, Any]:
+        """
+        Inference counters (compiled shape buckets, bucket hits, compiles,
+        micro-batching and feature store hit rates).
 
-        return results
+        Returns:
+            Stats dict; model counters only present when a real model is loaded
+        """
+        stats = {"using_mock": self.use_mock}
+        if self.model is not None:
+            stats.update(self.model.stats())
+        if self.batcher is not None:
+            stats["batching"] = self.batcher.stats()
+        stats["feature_store"] = self.feature_store.stats()
+        return stats
 
     def rank_candidates(
         self,
@@ -206,17 +515,162 @@ class PhoenixModelService:
         Returns:
             Top-K ranked candidates with scores
         """
-        predictions = self.predict_engagement(user_history, candidates)
-        return predictions[:top_k]
+        if len(candidates) > PHOENIX_RANKING_CHUNK_SIZE:
+            return self.rank_candidates_streaming(user_history, candidates, top_k)
+
+        scores, heads = self._score(user_history, candidates)
+
+        # Only the returned top-K candidates are sorted and turned into dicts
+        return build_predictions(candidates, scores, heads, top_k_indices(scores, top_k))
+
+    def rank_candidates_streaming(
+        self,
+        user_history: List[Dict[str, Any]],
+        candidates: List[Dict[str, Any]],
+        top_k: int = 10,
+        chunk_size: int = PHOENIX_RANKING_CHUNK_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank candidates chunk by chunk, keeping only a bounded top-K heap.
+
+        Scoring memory is bounded by chunk_size and top_k instead of growing
+        with the number of candidates. Results match rank_candidates,
+        including ties keeping input order.
+
+        Args:
+            user_history: User's engagement history
+            candidates: List of candidate posts
+            top_k: Number of top results to return
+            chunk_size: Candidates scored per model call
+
+        Returns:
+            Top-K ranked candidates with scores
+        """
+        chunk_size = max(1, int(chunk_size))
+        chunks = (candidates[offset:offset + chunk_size] for offset in range(0, len(candidates), chunk_size))
+        return self.rank_candidate_chunks(user_history, chunks, top_k)
+
+    def rank_candidate_chunks(
+        self,
+        user_history: List[Dict[str, Any]],
+        chunks: Iterable[List[Dict[str, Any]]],
+        top_k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank candidates arriving in chunks, keeping only a bounded top-K heap.
+
+        Chunks are consumed one at a time and only the kept candidates are
+        referenced afterwards, so chunks may be produced lazily (e.g. while
+        decoding the request).
+
+        Args:
+            user_history: User's engagement history
+            chunks: Consecutive lists of candidate posts, in input order
+            top_k: Number of top results to return
+
+        Returns:
+            Top-K ranked candidates with scores
+        """
+        top_k = max(0, int(top_k))
+
+        # Min-heap of (score, -index, heads, candidate): the root is the
+        # worst kept candidate, and among equal scores the later one ranks lower
+        heap: List[Tuple[float, int, List[float], Dict[str, Any]]] = []
+        offset = 0
+        for chunk in chunks:
+            # Chunks already fill the largest shape bucket, so they skip the
+            # micro-batching window
+            scores, heads = self.score_candidates(user_history, chunk)
+
+            # Only the chunk's own top-K can enter the global top-K
+            selected = top_k_indices(scores, top_k)
+            for index, score, head_row in zip(
+                selected.tolist(), scores[selected].tolist(), heads[selected].tolist()
+            ):
+                entry = (score, -(offset + index), head_row, chunk[index])
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+                else:
+                    # The chunk's candidates come best first
+                    break
+            offset += len(chunk)
+
+        ranked = sorted(heap, key=lambda entry: entry[:2], reverse=True)
+        return build_predictions(
+            [candidate for _, _, _, candidate in ranked],
+            np.array([score for score, _, _, _ in ranked]),
+            np.array([head_row for _, _, head_row, _ in ranked]).reshape(len(ranked), len(ENGAGEMENT_HEADS)),
+            np.arange(len(ranked))
+        )
+
+    def rank_candidates_json(
+        self,
+        user_history: List[Dict[str, Any]],
+        candidates_json: str,
+        top_k: int = 10,
+        max_candidates: Optional[int] = None,
+        chunk_size: int = PHOENIX_RANKING_CHUNK_SIZE
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Rank candidates straight from their JSON array string.
+
+        Candidates are decoded incrementally and scored chunk by chunk, so
+        at most one chunk of candidate dicts exists next to the raw string
+        instead of the whole parsed list.
+
+        Args:
+            user_history: User's engagement history
+            candidates_json: JSON array of candidate posts
+            top_k: Number of top results to return
+            max_candidates: Reject inputs with more candidates than this
+            chunk_size: Candidates decoded and scored per model call
+
+        Returns:
+            (top-K ranked candidates, total number of candidates)
+
+        Raises:
+            CandidateInputError: If candidates_json is not a non-empty JSON
+                array of objects, or has more than max_candidates elements
+        """
+        chunk_size = max(1, int(chunk_size))
+        total = 0
+
+        def chunks() -> Iterator[List[Dict[str, Any]]]:
+            nonlocal total
+            elements = json_codec.iter_array(candidates_json)
+            while True:
+                try:
+                    chunk = list(islice(elements, chunk_size))
+                except json.JSONDecodeError as e:
+                    raise CandidateInputError(f"Invalid JSON in 'candidates' field: {e}") from None
+                if not chunk:
+                    return
+                total += len(chunk)
+                if max_candidates is not None and total > max_candidates:
+                    raise CandidateInputError(f"Too many candidates - maximum {max_candidates} allowed")
+                if not all(isinstance(candidate, dict) for candidate in chunk):
+                    raise CandidateInputError("'candidates' must be an array of objects")
+                yield chunk
+
+        recommendations = self.rank_candidate_chunks(user_history, chunks(), top_k)
+        if total == 0:
+            raise CandidateInputError("candidates list is required for recommendations")
+        return recommendations, total
 
 
 # Singleton instance for the model service
 _model_service: Optional[PhoenixModelService] = None
+_model_service_lock = threading.Lock()
 
 
 def get_model_service(
     model_path: Optional[str] = None,
-    use_mock: bool = None
+    use_mock: bool = None,
+    quantization: Optional[str] = None,
+    shared_params: Optional[Dict[str, Any]] = None,
+    micro_batching: bool = True
 ) -> PhoenixModelService:
     """
     Get or create the global model service instance.
@@ -224,27 +678,72 @@ def get_model_service(
     Args:
         model_path: Path to model checkpoint (only used on first call)
         use_mock: Force mock mode (only used on first call)
+        quantization: "none" or "int8" weights (only used on first call)
+        shared_params: Shared-memory parameter manifest (only used on first call)
+        micro_batching: Batch concurrent scoring calls (only used on first call)
 
     Returns:
         PhoenixModelService instance
     """
     global _model_service
 
-    if _model_service is None:
-        # Check environment variable for model path
-        if model_path is None:
-            model_path = os.getenv("PHOENIX_MODEL_PATH")
+    # Startup warmup and request threads may race to build the service
+    with _model_service_lock:
+        if _model_service is None:
+            # Check environment variable for model path
+            if model_path is None:
+                model_path = os.getenv("PHOENIX_MODEL_PATH")
+
+            # Check environment variable for mock mode
+            if use_mock is None:
+                use_mock = os.getenv("USE_MOCK_MODEL", "false").lower() == "true"
+
+            # Check environment variable for quantized CPU inference
+            if quantization is None:
+                quantization = os.getenv("PHOENIX_QUANTIZATION", "none").lower()
+
+            _model_service = PhoenixModelService(
+                model_path=model_path,
+                use_mock=use_mock,
+                quantization=quantization,
+                shared_params=shared_params,
+                micro_batching=micro_batching
+            )
+
+    return _model_service
 
-        # Check environment variable for mock mode
-        if use_mock is None:
-            use_mock = os.getenv("USE_MOCK_MODEL", "false").lower() == "true"
 
-        _model_service = PhoenixModelService(
-            model_path=model_path,
-            use_mock=use_mock
+def serving_model_version() -> str:
+    """
+    Tag identifying which predictor serves recommendations, without loading it.
+
+    Uses the in-process service once it exists (it may have fallen back to
+    mock predictions) and otherwise the configured checkpoint, so callers
+    such as result cache keys never build the service themselves. With
+    model workers the serving process never builds it at all.
+
+    Returns:
+        "<MODEL_VERSION>-mock", or MODEL_VERSION with the checkpoint path and
+        weight format for a real model
+    """
+    model_path = os.getenv("PHOENIX_MODEL_PATH")
+    quantization = os.getenv("PHOENIX_QUANTIZATION", "none").lower()
+
+    service = _model_service
+    if service is not None:
+        use_mock = service.use_mock
+        model_path, quantization = service.model_path, service.quantization
+    else:
+        use_mock = (
+            os.getenv("USE_MOCK_MODEL", "false").lower() == "true"
+            or not JAX_AVAILABLE
+            or not model_path
+            or not os.path.exists(model_path)
         )
 
-    return _model_service
+    if use_mock:
+        return f"{MODEL_VERSION}-mock"
+    return f"{MODEL_VERSION}:{os.path.abspath(model_path) if model_path else 'shared'}:{quantization}"
 
 
 # Example usage
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Multi-Process Phoenix Serving with Shared-Memory Parameters
+
+With PHOENIX_MODEL_WORKERS > 0, recommendation scoring runs in a pool of
+dedicated model processes instead of the serving process:
+- The serving process is the loader: it reads the checkpoint once
+  (quantizing it when PHOENIX_QUANTIZATION=int8) and publishes the
+  parameters to POSIX shared memory.
+- Each worker attaches read-only views of that segment, so N workers hold
+  roughly one model's worth of parameters, and a restarted or added worker
+  does not read the checkpoint again.
+
+Jobs and their state stay in the serving process; only scoring calls are
+sent to the workers.
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from shared_params import SharedParams
+
+logger = logging.getLogger(__name__)
+
+# Number of model worker processes (0 serves the model in-process)
+PHOENIX_MODEL_WORKERS = int(os.getenv("PHOENIX_MODEL_WORKERS", "0"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_shared: Optional[SharedParams] = None
+_lock = threading.Lock()
+
+
+def model_workers_enabled() -> bool:
+    return PHOENIX_MODEL_WORKERS > 0
+
+
+def publish_model() -> Optional[SharedParams]:
+    """
+    Load the configured checkpoint and publish its parameters to shared memory.
+
+    Returns:
+        Owning SharedParams, or None when serving mock predictions
+    """
+    model_path = os.getenv("PHOENIX_MODEL_PATH")
+    use_mock = os.getenv("USE_MOCK_MODEL", "false").lower() == "true"
+    quantization = os.getenv("PHOENIX_QUANTIZATION", "none").lower()
+    if use_mock or not model_path or not os.path.exists(model_path):
+        logger.warning(f"No model checkpoint to share ({model_path}); model workers use mock predictions")
+        return None
+
+    from phoenix_model import flatten_params, load_checkpoint
+    from quantization import quantize_params
+
+    config, params = load_checkpoint(model_path)
+    if quantization == "int8":
+        # Quantized once here instead of in every worker
+        params = quantize_params(params)
+
+    shared = SharedParams.publish(flatten_params(params))
+    shared.manifest["config"] = asdict(config)
+    shared.manifest["quantization"] = quantization
+    return shared
+
+
+def _init_worker(manifest: Optional[Dict[str, Any]]) -> None:
+    """Build this worker's model service on the shared parameters and warm it up."""
+    from model_service import get_model_service
+
+    # A worker runs one task at a time, so there is nothing to micro-batch
+    if manifest is None:
+        service = get_model_service(use_mock=True, micro_batching=False)
+    else:
+        service = get_model_service(
+            shared_params=manifest, quantization=manifest["quantization"], micro_batching=False
+        )
+    service.warmup()
+
+
+def _worker_rank(
+    user_history: List[Dict[str, Any]],
+    candidates: List[Dict[str, Any]],
+    top_k: int
+) -> Tuple[List[Dict[str, Any]], bool]:
+    from model_service import get_model_service
+
+    service = get_model_service()
+    return service.rank_candidates(user_history, candidates, top_k), service.use_mock
+
+
+def _worker_rank_json(
+    user_history: List[Dict[str, Any]],
+    candidates_json: str,
+    top_k: int,
+    max_candidates: Optional[int]
+) -> Tuple[List[Dict[str, Any]], int, bool]:
+    from model_service import get_model_service
+
+    service = get_model_service()
+    recommendations, total = service.rank_candidates_json(user_history, candidates_json, top_k, max_candidates)
+    return recommendations, total, service.use_mock
+
+
+def _worker_stats() -> Dict[str, Any]:
+    from model_service import get_model_service
+
+    return {"pid": os.getpid(), **get_model_service().inference_stats()}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Get or create the worker pool, publishing the parameters on first use."""
+    global _pool, _shared
+
+    with _lock:
+        if _pool is None:
+            if _shared is None:
+                _shared = publish_model()
+                atexit.register(shutdown_model_workers)
+
+            _pool = ProcessPoolExecutor(
+                max_workers=PHOENIX_MODEL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(_shared.manifest if _shared is not None else None,)
+            )
+            logger.info(f"Started {PHOENIX_MODEL_WORKERS} model worker processes")
+
+    return _pool
+
+
+def start_model_workers() -> Dict[str, Any]:
+    """
+    Publish the parameters and start (and warm up) every model worker.
+
+    Returns:
+        {"workers": int, "shared_bytes": int}
+    """
+    pool = _get_pool()
+    # Workers are spawned on demand; a round of no-op tasks starts them all,
+    # and each runs its warmup in the initializer first
+    for future in [pool.submit(os.getpid) for _ in range(PHOENIX_MODEL_WORKERS)]:
+        future.result()
+    return {"workers": PHOENIX_MODEL_WORKERS, "shared_bytes": _shared.nbytes if _shared is not None else 0}
+
+
+def _run_in_worker(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run fn(*args) in a model worker process (blocks the calling thread).
+
+    A broken pool (a worker died) is replaced once; the new workers attach
+    to the existing shared parameters instead of reloading the checkpoint.
+    """
+    global _pool
+
+    pool = _get_pool()
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        logger.error("Model worker pool is broken - restarting workers")
+        with _lock:
+            if _pool is pool:
+                _pool = None
+        pool.shutdown(wait=False)
+        return _get_pool().submit(fn, *args).result()
+
+
+def rank_candidates(
+    user_history: List[Dict[str, Any]],
+    candidates: List[Dict[str, Any]],
+    top_k: int = 10
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Rank candidates in a model worker process (blocks the calling thread).
+
+    Returns:
+        (top-K ranked candidates, whether mock predictions were used)
+    """
+    return _run_in_worker(_worker_rank, user_history, candidates, top_k)
+
+
+def rank_candidates_json(
+    user_history: List[Dict[str, Any]],
+    candidates_json: str,
+    top_k: int = 10,
+    max_candidates: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """
+    Rank candidates from their JSON array string in a model worker process.
+
+    Only the string is sent to the worker, which decodes it incrementally
+    (see PhoenixModelService.rank_candidates_json).
+
+    Returns:
+        (top-K ranked candidates, total number of candidates, whether mock
+        predictions were used)
+
+    Raises:
+        CandidateInputError: If the candidates are invalid
+    """
+    return _run_in_worker(_worker_rank_json, user_history, candidates_json, top_k, max_candidates)
+
+
+def model_worker_stats() -> Dict[str, Any]:
+    """Pool size, shared segment size and one worker's inference counters."""
+    pool = _get_pool()
+    return {
+        "workers": PHOENIX_MODEL_WORKERS,
+        "shared_memory": {
+            "segment": _shared.manifest["segment"] if _shared is not None else None,
+            "bytes": _shared.nbytes if _shared is not None else 0
+        },
+        "worker": pool.submit(_worker_stats).result()
+    }
+
+
+def shutdown_model_workers() -> None:
+    """Stop the workers and remove the shared parameter segment."""
+    global _pool, _shared
+
+    with _lock:
+        pool, shared = _pool, _shared
+        _pool = None
+        _shared = None
+
+    if pool is not None:
+        pool.shutdown(wait=True)
+    if shared is not None:
+        shared.close()
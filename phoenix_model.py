@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Phoenix Transformer - JAX/Haiku Inference
+
+Grok-style transformer that scores candidate posts against a user's
+engagement history:
+- History tokens embed (post_id, action); candidate tokens embed
+  (post_id, author_id, media_type). Ids are hashed into fixed vocabularies.
+- History tokens attend to the history only; each candidate attends to the
+  history and itself (candidate isolation), so scores do not depend on
+  which other candidates share the batch.
+- One logit per engagement head is read from every candidate token.
+
+Inference is compiled with jax.jit per padded shape bucket, so variable
+request sizes reuse a small set of executables instead of recompiling.
+Optionally weights are int8-quantized for CPU serving (see quantization.py).
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import jax
+import jax.numpy as jnp
+import haiku as hk
+
+from cache import LRUCache
+from checkpoint import is_mmap_checkpoint, load_mmap_checkpoint
+from model_service import ENGAGEMENT_HEADS
+from quantization import QUANTIZATION_MODES, Int8Embed, Int8Linear, is_quantized, params_nbytes, quantize_params
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of each head in the final ranking score
+HEAD_SCORE_WEIGHTS = np.array([1.0, 2.0, 1.5, 0.5, 0.3, 0.7], dtype=np.float32)
+
+# Categorical vocabularies (index 0 is padding, last index is unknown)
+ACTIONS = ("<pad>", "like", "repost", "reply", "click", "profile_click", "video_view", "<unk>")
+MEDIA_TYPES = ("<pad>", "text", "image", "video", "<unk>")
+_ACTION_IDS = {name: i for i, name in enumerate(ACTIONS)}
+_MEDIA_IDS = {name: i for i, name in enumerate(MEDIA_TYPES)}
+
+# Padded shape buckets: requests are padded up to the next bucket size
+HISTORY_BUCKETS = tuple(int(x) for x in os.getenv("PHOENIX_HISTORY_BUCKETS", "16,64,256").split(","))
+CANDIDATE_BUCKETS = tuple(int(x) for x in os.getenv("PHOENIX_CANDIDATE_BUCKETS", "16,64,256,1024").split(","))
+BATCH_BUCKETS = tuple(int(x) for x in os.getenv("PHOENIX_BATCH_BUCKETS", "1,4,16").split(","))
+
+# Encoded user-history cache (repeat calls for one user skip re-encoding)
+HISTORY_CACHE_MAX_ENTRIES = int(os.getenv("PHOENIX_HISTORY_CACHE_MAX_ENTRIES", "100000"))
+HISTORY_CACHE_MAX_BYTES = int(os.getenv("PHOENIX_HISTORY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+_HISTORY_ENTRY_OVERHEAD_BYTES = 256  # Approximate per-entry bookkeeping (tuple, arrays, key)
+
+CONFIG_FILE = "config.json"
+PARAMS_FILE = "params.npz"
+
+
+@dataclass
+class PhoenixConfig:
+    """Model hyperparameters (stored as config.json next to the checkpoint)."""
+    hash_vocab_size: int = 65536
+    embed_dim: int = 128
+    num_layers: int = 2
+    num_heads: int = 4
+    ffn_multiplier: int = 4
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PhoenixConfig":
+        fields = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in data.items() if key in fields})
+
+
+def hash_id(value: Any, vocab_size: int) -> int:
+    """Stable hash of an id into [1, vocab_size) (0 is reserved for padding)."""
+    return 1 + zlib.crc32(str(value).encode("utf-8")) % (vocab_size - 1)
+
+
+def bucket_size(length: int, buckets: Sequence[int]) -> int:
+    """Smallest bucket that fits length (the largest bucket if none does)."""
+    for size in buckets:
+        if length <= size:
+            return size
+    return buckets[-1]
+
+
+def _linear(output_size: int, name: str, quantized: bool, with_bias: bool = True) -> hk.Module:
+    """hk.Linear, or its int8 counterpart with the same parameter path."""
+    if quantized:
+        return Int8Linear(output_size, with_bias=with_bias, name=name)
+    return hk.Linear(output_size, with_bias=with_bias, name=name)
+
+
+def _embed(vocab_size: int, embed_dim: int, name: str, quantized: bool) -> hk.Module:
+    """hk.Embed, or its int8 counterpart with the same parameter path."""
+    if quantized:
+        return Int8Embed(vocab_size, embed_dim, name=name)
+    return hk.Embed(vocab_size, embed_dim, name=name)
+
+
+class TransformerBlock(hk.Module):
+    """Pre-norm transformer block: masked multi-head attention + GELU FFN."""
+
+    def __init__(self, config: PhoenixConfig, quantized: bool = False, name: Optional[str] = None):
+        super().__init__(name=name)
+        self.config = config
+        self.quantized = quantized
+
+    def __call__(self, x: jnp.ndarray, mask: jnp.ndarray) -> jnp.ndarray:
+        config = self.config
+        head_dim = config.embed_dim // config.num_heads
+        batch, seq_len, _ = x.shape
+
+        h = hk.RMSNorm(axis=-1, name="attn_norm")(x)
+        qkv = _linear(3 * config.embed_dim, "qkv", self.quantized, with_bias=False)(h)
+        qkv = qkv.reshape(batch, seq_len, 3, config.num_heads, head_dim)
+        q, k, v = qkv[:, :, 0], qkv[:, :, 1], qkv[:, :, 2]
+
+        logits = jnp.einsum("bqhd,bkhd->bhqk", q, k) / np.sqrt(head_dim).astype(np.float32)
+        logits = jnp.where(mask[:, None, :, :], logits, jnp.finfo(logits.dtype).min)
+        weights = jax.nn.softmax(logits, axis=-1)
+        attended = jnp.einsum("bhqk,bkhd->bqhd", weights, v).reshape(batch, seq_len, config.embed_dim)
+        x = x + _linear(config.embed_dim, "attn_out", self.quantized, with_bias=False)(attended)
+
+        h = hk.RMSNorm(axis=-1, name="ffn_norm")(x)
+        h = _linear(config.ffn_multiplier * config.embed_dim, "ffn_in", self.quantized)(h)
+        h = _linear(config.embed_dim, "ffn_out", self.quantized)(jax.nn.gelu(h))
+        return x + h
+
+
+class PhoenixTransformer(hk.Module):
+    """History/candidate transformer producing per-candidate engagement logits."""
+
+    def __init__(self, config: PhoenixConfig, quantized: bool = False, name: Optional[str] = "phoenix"):
+        super().__init__(name=name)
+        self.config = config
+        self.quantized = quantized
+
+    def __call__(self, history: Dict[str, jnp.ndarray], candidates: Dict[str, jnp.ndarray]) -> jnp.ndarray:
+        config = self.config
+        post_embed = _embed(config.hash_vocab_size, config.embed_dim, "post_embed", self.quantized)
+        author_embed = _embed(config.hash_vocab_size, config.embed_dim, "author_embed", self.quantized)
+        action_embed = _embed(len(ACTIONS), config.embed_dim, "action_embed", self.quantized)
+        media_embed = _embed(len(MEDIA_TYPES), config.embed_dim, "media_embed", self.quantized)
+
+        history_tokens = post_embed(history["post_ids"]) + action_embed(history["actions"])
+        candidate_tokens = (
+            post_embed(candidates["post_ids"])
+            + author_embed(candidates["author_ids"])
+            + media_embed(candidates["media_types"])
+        )
+        x = jnp.concatenate([history_tokens, candidate_tokens], axis=1)
+
+        # Every token may attend to valid history tokens and to itself
+        history_len = history_tokens.shape[1]
+        seq_len = x.shape[1]
+        key_is_history = jnp.arange(seq_len) < history_len
+        history_valid = jnp.concatenate(
+            [history["mask"], jnp.zeros_like(candidates["mask"])], axis=1
+        )
+        mask = (key_is_history & history_valid)[:, None, :] | jnp.eye(seq_len, dtype=bool)[None]
+
+        for layer in range(config.num_layers):
+            x = TransformerBlock(config, self.quantized, name=f"block_{layer}")(x, mask)
+
+        x = hk.RMSNorm(axis=-1, name="final_norm")(x[:, history_len:])
+        return _linear(len(ENGAGEMENT_HEADS), "engagement_heads", self.quantized)(x)
+
+
+def build_forward(config: PhoenixConfig, quantized: bool = False) -> hk.Transformed:
+    """
+    Haiku-transformed forward pass returning engagement logits [B, C, heads].
+
+    With quantized=True the forward pass expects parameters from
+    quantization.quantize_params.
+    """
+    def forward(history, candidates):
+        return PhoenixTransformer(config, quantized)(history, candidates)
+
+    return hk.without_apply_rng(hk.transform(forward))
+
+
+def init_params(config: PhoenixConfig, seed: int = 0) -> hk.Params:
+    """Randomly initialized parameters (for development checkpoints and tests)."""
+    empty = encode_history([], 0, config)
+    history, candidates = pad_inputs([empty], [[]], 1, HISTORY_BUCKETS[0], CANDIDATE_BUCKETS[0], config)
+    return build_forward(config).init(jax.random.PRNGKey(seed), history, candidates)
+
+
+def flatten_params(params: hk.Params) -> Dict[str, np.ndarray]:
+    """Flatten {module: {name: array}} into {"module/name": array}."""
+    return {
+        f"{module}/{name}": np.asarray(value)
+        for module, module_params in params.items()
+        for name, value in module_params.items()
+    }
+
+
+def unflatten_params(flat: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Inverse of flatten_params."""
+    params: Dict[str, Dict[str, Any]] = {}
+    for key, value in flat.items():
+        module, name = key.rsplit("/", 1)
+        params.setdefault(module, {})[name] = value
+    return params
+
+
+def save_checkpoint(path: str, config: PhoenixConfig, params: hk.Params) -> None:
+    """Write config.json and params.npz into the checkpoint directory."""
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(asdict(config), f, indent=2)
+    np.savez(os.path.join(path, PARAMS_FILE), **flatten_params(params))
+
+
+def load_checkpoint(path: str) -> Tuple[PhoenixConfig, Dict[str, Dict[str, Any]]]:
+    """
+    Read config.json and the parameters from the checkpoint directory.
+
+    Checkpoints in the memory-mapped layout (manifest.json + one .npy per
+    tensor) are opened lazily via mmap; otherwise params.npz is read.
+    """
+    with open(os.path.join(path, CONFIG_FILE), "r", encoding="utf-8") as f:
+        config = PhoenixConfig.from_dict(json.load(f))
+
+    if is_mmap_checkpoint(path):
+        return config, unflatten_params(load_mmap_checkpoint(path))
+
+    with np.load(os.path.join(path, PARAMS_FILE)) as data:
+        params = unflatten_params({key: data[key] for key in data.files})
+    return config, params
+
+
+class EncodedHistory(NamedTuple):
+    """Model-ready encoding of one user history (unpadded, most recent last)."""
+    post_ids: np.ndarray
+    actions: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.post_ids.nbytes + self.actions.nbytes
+
+
+def history_fingerprint(items: List[Dict[str, Any]], max_len: int) -> int:
+    """
+    Fingerprint of the history fields the encoder reads.
+
+    Only the last max_len items and their (post_id, action) pairs are
+    hashed, so histories that encode identically share one cache entry.
+    post_ids are hashed in the str() form the encoder hashes. The cache
+    lives in one process, so Python's 64-bit hash is used: it costs a
+    fraction of encoding the history, unlike a JSON dump plus digest.
+    """
+    recent = items[max(len(items) - max_len, 0):]
+    return hash((
+        tuple(map(str, [item.get("post_id", "") for item in recent])),
+        tuple([item.get("action") for item in recent])
+    ))
+
+
+def encode_history(items: List[Dict[str, Any]], max_len: int, config: PhoenixConfig) -> EncodedHistory:
+    """
+    Hash a user history into id arrays, keeping its most recent max_len items.
+
+    Args:
+        items: Engagement history ({"post_id", "action", ...}), oldest first
+        max_len: Maximum number of items kept
+        config: Model config (hash vocabulary size)
+    """
+    items = items[max(len(items) - max_len, 0):]
+    vocab = config.hash_vocab_size
+    unknown_action = _ACTION_IDS["<unk>"]
+    return EncodedHistory(
+        post_ids=np.array([hash_id(item.get("post_id", ""), vocab) for item in items], dtype=np.int32),
+        actions=np.array([_ACTION_IDS.get(item.get("action"), unknown_action) for item in items], dtype=np.int32)
+    )
+
+
+def pad_inputs(
+    histories: List[EncodedHistory],
+    candidate_lists: List[List[Dict[str, Any]]],
+    batch: int,
+    history_len: int,
+    num_candidates: int,
+    config: PhoenixConfig
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Hash candidates and pad requests into fixed-shape model inputs.
+
+    Histories longer than history_len keep their most recent (last) items.
+
+    Args:
+        histories: One encoded engagement history per batch row
+        candidate_lists: One candidate list per batch row (each <= num_candidates)
+        batch: Padded batch size (>= len(histories))
+        history_len: Padded history length
+        num_candidates: Padded candidate count
+        config: Model config (hash vocabulary size)
+
+    Returns:
+        (history, candidates) dicts of int32 id arrays and bool masks
+    """
+    vocab = config.hash_vocab_size
+    history = {
+        "post_ids": np.zeros((batch, history_len), dtype=np.int32),
+        "actions": np.zeros((batch, history_len), dtype=np.int32),
+        "mask": np.zeros((batch, history_len), dtype=bool),
+    }
+    candidates = {
+        "post_ids": np.zeros((batch, num_candidates), dtype=np.int32),
+        "author_ids": np.zeros((batch, num_candidates), dtype=np.int32),
+        "media_types": np.zeros((batch, num_candidates), dtype=np.int32),
+        "mask": np.zeros((batch, num_candidates), dtype=bool),
+    }
+    unknown_media = _MEDIA_IDS["<unk>"]
+
+    for row, encoded in enumerate(histories):
+        n = min(len(encoded.post_ids), history_len)
+        if n:
+            history["post_ids"][row, :n] = encoded.post_ids[-n:]
+            history["actions"][row, :n] = encoded.actions[-n:]
+            history["mask"][row, :n] = True
+
+    for row, items in enumerate(candidate_lists):
+        n = len(items)
+        candidates["post_ids"][row, :n] = [hash_id(item.get("post_id", ""), vocab) for item in items]
+        candidates["author_ids"][row, :n] = [hash_id(item.get("author_id", ""), vocab) for item in items]
+        candidates["media_types"][row, :n] = [
+            _MEDIA_IDS.get(item.get("media_type") or "text", unknown_media) for item in items
+        ]
+        candidates["mask"][row, :n] = True
+
+    return history, candidates
+
+
+def _predict(apply, params, history, candidates):
+    """Engagement probabilities and weighted ranking scores."""
+    probabilities = jax.nn.sigmoid(apply(params, history, candidates))
+    scores = probabilities @ (HEAD_SCORE_WEIGHTS / HEAD_SCORE_WEIGHTS.sum())
+    return scores, probabilities
+
+
+class PhoenixInference:
+    """
+    Bucketed, JIT-compiled Phoenix inference.
+
+    Inputs are padded to (batch, history, candidate) bucket shapes and each
+    bucket's executable is compiled once and cached. Hit and compile
+    counters expose recompilation behaviour. With quantization="int8",
+    float32 parameters are quantized once at construction.
+    """
+
+    def __init__(
+        self,
+        config: PhoenixConfig,
+        params: hk.Params,
+        history_buckets: Sequence[int] = HISTORY_BUCKETS,
+        candidate_buckets: Sequence[int] = CANDIDATE_BUCKETS,
+        batch_buckets: Sequence[int] = BATCH_BUCKETS,
+        quantization: str = "none"
+    ):
+        """
+        Initialize inference.
+
+        Args:
+            config: Model config
+            params: Model parameters (float32, or already int8-quantized)
+            history_buckets: Allowed padded history lengths (ascending)
+            candidate_buckets: Allowed padded candidate counts (ascending)
+            batch_buckets: Allowed padded batch sizes (ascending)
+            quantization: "none" or "int8" (per-channel int8 weights)
+
+        Raises:
+            ValueError: If quantization is not a supported mode
+        """
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unsupported quantization '{quantization}'. Must be one of: {', '.join(QUANTIZATION_MODES)}")
+
+        self.config = config
+        self.quantization = quantization
+        if quantization == "int8" and not is_quantized(params):
+            params = quantize_params(params)
+        # Placed on device once. On CPU, aligned memory-mapped arrays are
+        # wrapped without copying, so parameters stay backed by the page cache.
+        self.params = jax.device_put(params)
+        self.param_bytes = params_nbytes(self.params)
+        self.history_buckets = tuple(sorted(history_buckets))
+        self.candidate_buckets = tuple(sorted(candidate_buckets))
+        self.batch_buckets = tuple(sorted(batch_buckets))
+        self.history_cache = LRUCache(
+            max_entries=HISTORY_CACHE_MAX_ENTRIES,
+            max_bytes=HISTORY_CACHE_MAX_BYTES,
+            sizeof=lambda encoded: encoded.nbytes + _HISTORY_ENTRY_OVERHEAD_BYTES
+        )
+        self._apply = build_forward(config, quantized=quantization == "int8").apply
+        self._compiled: Dict[Tuple[int, int, int], Any] = {}
+        self._lock = threading.Lock()
+        self.bucket_hits = 0
+        self.compiles = 0
+        self.compile_seconds = 0.0
+
+    def _executable(self, shape: Tuple[int, int, int], history, candidates):
+        """Compiled executable for a padded (batch, history, candidates) shape."""
+        with self._lock:
+            executable = self._compiled.get(shape)
+            if executable is not None:
+                self.bucket_hits += 1
+                return executable
+
+            start = time.perf_counter()
+            executable = jax.jit(functools.partial(_predict, self._apply)).lower(
+                self.params, history, candidates
+            ).compile()
+            elapsed = time.perf_counter() - start
+
+            self._compiled[shape] = executable
+            self.compiles += 1
+            self.compile_seconds += elapsed
+            logger.info(f"Compiled Phoenix inference for bucket {shape} in {elapsed:.2f}s")
+            return executable
+
+    def predict(
+        self,
+        user_history: List[Dict[str, Any]],
+        candidates: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score candidates for one user.
+
+        Returns:
+            (scores, heads): shapes (n,) and (n, len(ENGAGEMENT_HEADS))
+        """
+        return self.predict_batch([(user_history, candidates)])[0]
+
+    def predict_batch(
+        self,
+        requests: List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Score several (user_history, candidates) requests in padded batches.
+
+        Each request becomes one batch row per chunk of at most the largest
+        candidate bucket. Rows are sorted by size so similarly sized rows
+        share a batch, then padded to (batch, history, candidates) buckets.
+
+        Returns:
+            One (scores, heads) pair per request, in request order
+        """
+        num_heads = len(ENGAGEMENT_HEADS)
+        outputs = [
+            (np.empty(len(candidates), dtype=np.float64), np.empty((len(candidates), num_heads), dtype=np.float64))
+            for _, candidates in requests
+        ]
+
+        chunk = self.candidate_buckets[-1]
+        histories = [self.encode_history(history) for history, _ in requests]
+        rows = [
+            (index, start, histories[index], candidates[start:start + chunk])
+            for index, (_, candidates) in enumerate(requests)
+            for start in range(0, len(candidates), chunk)
+        ]
+        rows.sort(key=lambda row: (len(row[3]), len(row[2].post_ids)))
+
+        max_batch = self.batch_buckets[-1]
+        for group_start in range(0, len(rows), max_batch):
+            group = rows[group_start:group_start + max_batch]
+            shape = (
+                bucket_size(len(group), self.batch_buckets),
+                bucket_size(max(len(row[2].post_ids) for row in group), self.history_buckets),
+                bucket_size(max(len(row[3]) for row in group), self.candidate_buckets)
+            )
+            history_in, candidates_in = pad_inputs(
+                [row[2] for row in group], [row[3] for row in group], *shape, config=self.config
+            )
+            batch_scores, batch_heads = self._executable(shape, history_in, candidates_in)(
+                self.params, history_in, candidates_in
+            )
+            batch_scores = np.asarray(batch_scores)
+            batch_heads = np.asarray(batch_heads)
+
+            for row_index, (index, start, _, part) in enumerate(group):
+                scores, heads = outputs[index]
+                scores[start:start + len(part)] = batch_scores[row_index, :len(part)]
+                heads[start:start + len(part)] = batch_heads[row_index, :len(part)]
+
+        return outputs
+
+    def encode_history(self, user_history: List[Dict[str, Any]]) -> EncodedHistory:
+        """Encoded history, served from the fingerprint-keyed cache when possible."""
+        max_len = self.history_buckets[-1]
+        fingerprint = history_fingerprint(user_history, max_len)
+        encoded = self.history_cache.get(fingerprint)
+        if encoded is None:
+            encoded = encode_history(user_history, max_len, self.config)
+            self.history_cache.put(fingerprint, encoded)
+        return encoded
+
+    def bucket_shapes(self) -> List[Tuple[int, int, int]]:
+        """Every (batch, history, candidates) shape this instance serves."""
+        return [
+            (b, h, c)
+            for b in self.batch_buckets
+            for h in self.history_buckets
+            for c in self.candidate_buckets
+        ]
+
+    def warmup(self) -> List[Tuple[int, int, int]]:
+        """
+        Compile and run every bucket shape once on dummy inputs.
+
+        Returns:
+            Shapes that were warmed up
+        """
+        shapes = self.bucket_shapes()
+        for shape in shapes:
+            empty = encode_history([], 0, self.config)
+            history_in, candidates_in = pad_inputs([empty], [[]], *shape, config=self.config)
+            scores, _ = self._executable(shape, history_in, candidates_in)(
+                self.params, history_in, candidates_in
+            )
+            scores.block_until_ready()
+        return shapes
+
+    def stats(self) -> Dict[str, Any]:
+        """Compilation cache counters."""
+        with self._lock:
+            return {
+                "quantization": self.quantization,
+                "param_bytes": self.param_bytes,
+                "compiled_buckets": sorted(self._compiled),
+                "bucket_hits": self.bucket_hits,
+                "compiles": self.compiles,
+                "compile_seconds": round(self.compile_seconds, 3),
+                "history_cache": self.history_cache.stats()
+            }
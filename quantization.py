@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Int8 Weight Quantization for Phoenix CPU Inference
+
+Linear weights are stored as int8 with one float32 scale per output
+channel, embedding tables as int8 with one scale per row. Activations stay
+float32: matmuls run against the int8 weights cast in-graph and the scale
+is applied to the (much smaller) output, so weights are dequantized on the
+fly instead of being kept in float32.
+
+Parameter layout of a quantized module (replaces the float32 names):
+    Linear: w -> w_q (int8, [in, out]) + w_scale (float32, [out])
+    Embed:  embeddings -> embeddings_q (int8, [vocab, dim]) + embeddings_scale (float32, [vocab])
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import jax.numpy as jnp
+import haiku as hk
+
+# Supported values of the PHOENIX_QUANTIZATION setting
+QUANTIZATION_MODES = ("none", "int8")
+
+INT8_MAX = 127
+
+
+def quantize_per_channel(weights: np.ndarray, axis: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric int8 quantization with one scale per channel.
+
+    Args:
+        weights: float array
+        axis: Axis reduced to find each channel's range (the other axis
+            indexes the channels)
+
+    Returns:
+        (quantized int8 array, float32 scales) with weights ~= quantized * scale
+    """
+    weights = np.asarray(weights, dtype=np.float32)
+    max_abs = np.max(np.abs(weights), axis=axis, keepdims=True)
+    # All-zero channels get scale 1 so they quantize to exact zeros
+    scale = np.where(max_abs > 0, max_abs / INT8_MAX, 1.0).astype(np.float32)
+    quantized = np.clip(np.rint(weights / scale), -INT8_MAX, INT8_MAX).astype(np.int8)
+    return quantized, np.squeeze(scale, axis=axis)
+
+
+def quantize_params(params: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Convert float32 Phoenix parameters to the int8 layout.
+
+    Linear weights are quantized per output channel and embedding tables
+    per row; biases and norm scales are kept in float32.
+
+    Args:
+        params: {module: {name: array}} float parameters
+
+    Returns:
+        Parameters for the quantized forward pass
+    """
+    quantized: Dict[str, Dict[str, np.ndarray]] = {}
+    for module, module_params in params.items():
+        converted = {}
+        for name, value in module_params.items():
+            value = np.asarray(value)
+            if name == "w" and value.ndim == 2:
+                converted["w_q"], converted["w_scale"] = quantize_per_channel(value, axis=0)
+            elif name == "embeddings":
+                converted["embeddings_q"], converted["embeddings_scale"] = quantize_per_channel(value, axis=1)
+            else:
+                converted[name] = value
+        quantized[module] = converted
+    return quantized
+
+
+def is_quantized(params: Dict[str, Dict[str, Any]]) -> bool:
+    """Whether params are already in the int8 layout."""
+    return any("w_q" in module_params for module_params in params.values())
+
+
+def params_nbytes(params: Dict[str, Dict[str, Any]]) -> int:
+    """Total size of all parameter arrays in bytes."""
+    return sum(int(value.nbytes) for module_params in params.values() for value in module_params.values())
+
+
+class Int8Linear(hk.Module):
+    """Linear layer with per-output-channel int8 weights (drop-in for hk.Linear)."""
+
+    def __init__(self, output_size: int, with_bias: bool = True, name: Optional[str] = None):
+        super().__init__(name=name)
+        self.output_size = output_size
+        self.with_bias = with_bias
+
+    def __call__(self, x: jnp.ndarray) -> jnp.ndarray:
+        input_size = x.shape[-1]
+        w_q = hk.get_parameter("w_q", [input_size, self.output_size], jnp.int8, init=jnp.zeros)
+        w_scale = hk.get_parameter("w_scale", [self.output_size], jnp.float32, init=jnp.ones)
+
+        out = jnp.dot(x, w_q.astype(x.dtype)) * w_scale
+        if self.with_bias:
+            out = out + hk.get_parameter("b", [self.output_size], x.dtype, init=jnp.zeros)
+        return out
+
+
+class Int8Embed(hk.Module):
+    """Embedding table with per-row int8 entries (drop-in for hk.Embed lookups)."""
+
+    def __init__(self, vocab_size: int, embed_dim: int, name: Optional[str] = None):
+        super().__init__(name=name)
+        self.vocab_size = vocab_size
+        self.embed_dim = embed_dim
+
+    def __call__(self, ids: jnp.ndarray) -> jnp.ndarray:
+        table = hk.get_parameter("embeddings_q", [self.vocab_size, self.embed_dim], jnp.int8, init=jnp.zeros)
+        scale = hk.get_parameter("embeddings_scale", [self.vocab_size], jnp.float32, init=jnp.ones)
+        return table[ids].astype(jnp.float32) * scale[ids][..., None]
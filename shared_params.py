@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Model Parameters in POSIX Shared Memory
+
+A loader process copies every parameter tensor into one shared memory
+segment; other processes attach to it by name and get read-only NumPy
+views. N processes serving the same model hold one copy of its weights.
+
+The manifest returned by the loader is small and JSON-serializable, so it
+can be passed to worker processes as an initializer argument:
+
+    {"segment": name, "size": bytes, "tensors": {name: {offset, dtype, shape}}}
+"""
+import logging
+from multiprocessing import shared_memory
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Tensor offsets are aligned so views can be handed to JAX without copying
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class SharedParams:
+    """
+    Flat parameter tensors backed by one shared memory segment.
+
+    Use SharedParams.publish in the loader process and SharedParams.attach
+    in workers. Only the publisher unlinks the segment.
+    """
+
+    def __init__(self, segment: shared_memory.SharedMemory, manifest: Dict[str, Any], owner: bool):
+        self.segment = segment
+        self.manifest = manifest
+        self.owner = owner
+
+    @classmethod
+    def publish(cls, tensors: Mapping[str, np.ndarray], name: Optional[str] = None) -> "SharedParams":
+        """
+        Copy tensors into a new shared memory segment.
+
+        Args:
+            tensors: Flat {"module/name": array} parameters
+            name: Segment name (a random one when None)
+
+        Returns:
+            Owning SharedParams; its manifest lets other processes attach
+        """
+        layout = {}
+        size = 0
+        for tensor_name, value in sorted(tensors.items()):
+            value = np.asarray(value)
+            offset = _align(size)
+            layout[tensor_name] = {"offset": offset, "dtype": value.dtype.str, "shape": list(value.shape)}
+            size = offset + value.nbytes
+
+        segment = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        for tensor_name, entry in layout.items():
+            view = np.ndarray(entry["shape"], dtype=entry["dtype"], buffer=segment.buf, offset=entry["offset"])
+            view[...] = tensors[tensor_name]
+
+        manifest = {"segment": segment.name, "size": size, "tensors": layout}
+        logger.info(f"Published {len(layout)} tensors ({size / 2**20:.1f} MiB) to shared memory {segment.name}")
+        return cls(segment, manifest, owner=True)
+
+    @classmethod
+    def attach(cls, manifest: Dict[str, Any]) -> "SharedParams":
+        """Attach to a segment published by another process."""
+        segment = shared_memory.SharedMemory(name=manifest["segment"])
+        return cls(segment, manifest, owner=False)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Read-only views of every tensor.
+
+        The views reference the segment, so this object must outlive them.
+        """
+        arrays = {}
+        for tensor_name, entry in self.manifest["tensors"].items():
+            view = np.ndarray(entry["shape"], dtype=entry["dtype"], buffer=self.segment.buf, offset=entry["offset"])
+            view.flags.writeable = False
+            arrays[tensor_name] = view
+        return arrays
+
+    @property
+    def nbytes(self) -> int:
+        return self.manifest["size"]
+
+    def close(self) -> None:
+        """Detach from the segment, and remove it if this process published it."""
+        try:
+            self.segment.close()
+        except BufferError:
+            # Views are still alive; the mapping goes away with the process
+            logger.debug(f"Shared memory {self.segment.name} still referenced at close")
+        if self.owner:
+            self.segment.unlink()
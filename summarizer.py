@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Graph-Based Extractive Summarizer (TextRank)
+
+Sentences are nodes of a similarity graph; a sentence is central when it
+shares distinctive terms with many other central sentences. The steps:
+- Map each sentence's terms to ids in a sparse sentence-term matrix (COO
+  arrays) with IDF weights and L2-normalized rows.
+- Prune terms that cannot form an edge (one sentence) and, within a fixed
+  pair budget, the most widespread terms (lowest IDF, most pairs).
+- Compute cosine similarities from the co-occurring pairs with one
+  bincount, then rank sentences by PageRank power iteration.
+
+Work is bounded for any input size: documents with more than
+SUMMARY_MAX_SENTENCES sentences are first narrowed to the sentences most
+similar to the document centroid, and the pair budget caps the similarity
+computation.
+"""
+import os
+import re
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Sentences ranked by the graph; longer documents are pre-filtered by
+# centroid similarity (bounds the n x n similarity matrix)
+SUMMARY_MAX_SENTENCES = int(os.getenv("SUMMARY_MAX_SENTENCES", "1000"))
+
+# Co-occurring (sentence, sentence) term pairs scored; the most widespread
+# terms are pruned first when a document exceeds it
+SUMMARY_MAX_TERM_PAIRS = int(os.getenv("SUMMARY_MAX_TERM_PAIRS", "2000000"))
+
+# Terms found in at least this many sentences are multiplied as dense
+# columns instead of being expanded into sentence pairs
+DENSE_MIN_DF = 24
+
+# PageRank parameters
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+# Terms: runs of letters/digits of at least three characters
+_TERM_PATTERN = re.compile(r"[^\W_]{3,}")
+
+
+def sentence_term_matrix(
+    sentences: List[str],
+    stop_words: Iterable[str] = ()
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the sparse sentence-term matrix of a list of sentences.
+
+    Term ids are assigned in order of first occurrence, so the matrix (and
+    the floating-point summation order downstream) is the same in every
+    process, whatever its string hash seed.
+
+    Args:
+        sentences: Sentences to index
+        stop_words: Lowercase terms to ignore
+
+    Returns:
+        (rows, cols, weights): COO arrays of sentence index, term id and
+        IDF weight (terms count once per sentence), with L2-normalized
+        rows and entries sorted by term
+    """
+    stop_words = frozenset(stop_words)
+    vocabulary: Dict[str, int] = {}
+    lengths: List[int] = []
+    col_list: List[int] = []
+    for sentence in sentences:
+        ids = [
+            vocabulary.setdefault(term, len(vocabulary))
+            for term in _TERM_PATTERN.findall(sentence.lower())
+            if term not in stop_words
+        ]
+        lengths.append(len(ids))
+        col_list.extend(ids)
+
+    if not col_list:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+
+    # One unique pass over (term, sentence) keys drops repeated terms within
+    # a sentence and orders the entries by term
+    n = len(sentences)
+    rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    keys = np.unique(np.array(col_list, dtype=np.int64) * n + rows)
+    cols, rows = np.divmod(keys, n)
+
+    df = np.bincount(cols, minlength=len(vocabulary))
+    weights = np.log((1 + n) / (1 + df[cols])) + 1.0
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n))
+    return rows, cols, weights / norms[rows]
+
+
+def prune_terms(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    weights: np.ndarray,
+    max_pairs: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Drop terms that cannot contribute to the similarity graph within budget.
+
+    Terms found in a single sentence form no edge. A term found in k
+    sentences costs k * k pairs, so the most widespread terms are dropped
+    until the remaining pairs fit max_pairs.
+
+    Returns:
+        Filtered (rows, cols, weights), still grouped by term
+    """
+    df = np.bincount(cols)
+    shared = df >= 2
+
+    # Cheapest (rarest, most distinctive) terms are kept first
+    candidates = np.flatnonzero(shared)
+    by_df = candidates[np.argsort(df[candidates], kind="stable")]
+    within_budget = np.cumsum(df[by_df] * df[by_df]) <= max_pairs
+    keep_terms = np.zeros(len(df), dtype=bool)
+    keep_terms[by_df[within_budget]] = True
+
+    keep = keep_terms[cols]
+    return rows[keep], cols[keep], weights[keep]
+
+
+def similarity_matrix(rows: np.ndarray, cols: np.ndarray, weights: np.ndarray, n: int) -> np.ndarray:
+    """
+    Cosine similarities of n sentences from their pruned term matrix.
+
+    A term found in k sentences contributes the products of its k weights.
+    Rare terms are expanded into those k * k pairs with array arithmetic
+    and summed into the n x n matrix with one bincount; terms found in at
+    least DENSE_MIN_DF sentences are cheaper as columns of a dense matrix
+    multiplied by its transpose.
+
+    Returns:
+        float64 array of shape (n, n) with a zero diagonal
+    """
+    similarity = np.zeros((n, n))
+    if len(rows) == 0:
+        return similarity
+
+    # Entries are grouped by term: group starts and sizes per entry
+    boundaries = np.flatnonzero(np.diff(cols)) + 1
+    starts = np.concatenate([[0], boundaries])
+    sizes = np.diff(np.concatenate([starts, [len(cols)]]))
+    entry_size = np.repeat(sizes, sizes)
+
+    dense = entry_size >= DENSE_MIN_DF
+    if dense.any():
+        dense_cols = np.unique(cols[dense], return_inverse=True)[1]
+        matrix = np.zeros((n, dense_cols.max() + 1))
+        matrix[rows[dense], dense_cols] = weights[dense]
+        similarity += matrix @ matrix.T
+
+    sparse = ~dense
+    if sparse.any():
+        # Remaining groups are contiguous again after dropping the dense ones
+        rows, weights, entry_size = rows[sparse], weights[sparse], entry_size[sparse]
+        sparse_sizes = sizes[sizes < DENSE_MIN_DF]
+        entry_start = np.repeat(np.cumsum(sparse_sizes) - sparse_sizes, sparse_sizes)
+
+        # Pair every entry with each entry of its own group
+        left = np.repeat(np.arange(len(rows)), entry_size)
+        block_start = np.repeat(np.cumsum(entry_size) - entry_size, entry_size)
+        right = np.repeat(entry_start, entry_size) + (np.arange(len(left)) - block_start)
+        similarity += np.bincount(
+            rows[left] * n + rows[right],
+            weights=weights[left] * weights[right],
+            minlength=n * n
+        ).reshape(n, n)
+
+    np.fill_diagonal(similarity, 0.0)
+    return similarity
+
+
+def pagerank(similarity: np.ndarray) -> np.ndarray:
+    """
+    PageRank scores of a weighted, undirected sentence graph.
+
+    Sentences without edges spread their rank uniformly.
+
+    Args:
+        similarity: Symmetric (n, n) edge weights
+
+    Returns:
+        Scores of shape (n,) summing to 1
+    """
+    n = len(similarity)
+    out_weight = similarity.sum(axis=1)
+    dangling = out_weight == 0
+    transition = similarity / np.where(dangling, 1.0, out_weight)[:, None]
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        spread = scores @ transition + scores[dangling].sum() / n
+        updated = (1 - DAMPING) / n + DAMPING * spread
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def textrank(
+    sentences: List[str],
+    num_sentences: int,
+    stop_words: Iterable[str] = (),
+    max_sentences: int = SUMMARY_MAX_SENTENCES,
+    max_pairs: int = SUMMARY_MAX_TERM_PAIRS
+) -> List[int]:
+    """
+    Select the most central sentences of a document.
+
+    Args:
+        sentences: Document sentences, in order
+        num_sentences: Number of sentences to select
+        stop_words: Lowercase terms ignored when comparing sentences
+        max_sentences: Sentences ranked by the graph (longer documents are
+            pre-filtered by similarity to the document centroid)
+        max_pairs: Term pair budget for the similarity computation
+
+    Returns:
+        Indices of min(num_sentences, len(sentences)) sentences in document
+        order; ties prefer earlier sentences
+    """
+    n = len(sentences)
+    num_sentences = max(0, min(int(num_sentences), n))
+    if num_sentences == n:
+        return list(range(n))
+
+    rows, cols, weights = sentence_term_matrix(sentences, stop_words)
+
+    nodes = np.arange(n)
+    if n > max_sentences:
+        # Keep the sentences closest to the centroid, in document order
+        centroid = np.bincount(cols, weights=weights)
+        closeness = np.bincount(rows, weights=weights * centroid[cols], minlength=n)
+        nodes = np.sort(np.argsort(-closeness, kind="stable")[:max(max_sentences, num_sentences)])
+        node_of = np.full(n, -1)
+        node_of[nodes] = np.arange(len(nodes))
+        keep = node_of[rows] >= 0
+        rows, cols, weights = node_of[rows[keep]], cols[keep], weights[keep]
+
+    rows, cols, weights = prune_terms(rows, cols, weights, max_pairs)
+    scores = pagerank(similarity_matrix(rows, cols, weights, len(nodes)))
+
+    # Stable sort: equal scores keep document order
+    best = np.argsort(-scores, kind="stable")[:num_sentences]
+    return np.sort(nodes[best]).tolist()
@@ -0,0 +1,126 @@
+"""Tests for batch job validation, chunking and aggregation."""
+import asyncio
+import json
+
+import pytest
+
+import agent
+
+TEXTS = [
+    "This product is great and I love the excellent design.",
+    "Terrible service, the delivery was awful and slow.",
+    "Shipping took three days. Packaging was plain but intact.",
+]
+
+
+def run_job(texts, **fields):
+    input_data = {"analysis_type": "batch", "texts": json.dumps(texts), **fields}
+    return asyncio.run(agent.process_job("test_purchaser_123456789012", input_data))
+
+
+def test_batch_analyzes_every_item():
+    response = run_job(TEXTS + [{"text": TEXTS[0], "analysis_type": "stats"}])
+    assert response["status"] == "completed"
+    results = response["result"]["results"]
+    assert [item["analysis_type"] for item in results] == ["general"] * 3 + ["stats"]
+    assert results[3]["result"] == agent.calculate_statistics(TEXTS[0])
+    assert response["result"]["aggregate"]["by_analysis_type"] == {"general": 3, "stats": 1}
+
+
+def test_item_analysis_type_accepts_option_index():
+    response = run_job(TEXTS, item_analysis_type=0)
+    assert response["status"] == "completed"
+    assert {item["analysis_type"] for item in response["result"]["results"]} == {"sentiment"}
+
+
+@pytest.mark.parametrize("texts, error", [
+    ([], "Missing 'texts'"),
+    ([TEXTS[0], "too short"], "Item 1: text too short"),
+    ([TEXTS[0], ""], "Item 1: missing or invalid text"),
+    ([TEXTS[0], 42], "Item 1: missing or invalid text"),
+    ([{"analysis_type": "stats"}], "Item 0: missing or invalid text"),
+    ([TEXTS[0], {"text": TEXTS[1], "analysis_type": "recommendations"}], "Item 1: invalid analysis_type 'recommendations'"),
+    ([{"text": TEXTS[1], "analysis_type": 9}], "Item 0: invalid analysis_type '9'"),
+    ([{"text": TEXTS[1], "analysis_type": "sentimnet"}], "Item 0: invalid analysis_type 'sentimnet'"),
+])
+def test_invalid_items_fail_the_job(texts, error):
+    response = run_job(texts)
+    assert response["status"] == "failed"
+    assert response["error"].startswith(error)
+
+
+def test_invalid_item_analysis_type_fails_the_job():
+    response = run_job(TEXTS, item_analysis_type="batch")
+    assert response["status"] == "failed"
+    assert response["error"].startswith("Invalid item_analysis_type 'batch'")
+
+
+def test_batch_limits(monkeypatch):
+    monkeypatch.setattr(agent, "BATCH_MAX_ITEMS", 2)
+    assert run_job(TEXTS)["error"].startswith("Too many texts")
+
+    monkeypatch.setattr(agent, "BATCH_MAX_ITEMS", 10)
+    monkeypatch.setattr(agent, "BATCH_MAX_TOTAL_CHARS", 100)
+    assert run_job(TEXTS)["error"].startswith("Batch too large")
+
+
+def test_invalid_json_texts_fail_the_job():
+    input_data = {"analysis_type": "batch", "texts": "[not json"}
+    response = asyncio.run(agent.process_job("test_purchaser_123456789012", input_data))
+    assert response["status"] == "failed"
+    assert response["error"] == "Invalid JSON in 'texts' field"
+
+
+def test_chunks_keep_order_and_size():
+    items = [{"text": "x" * length, "analysis_type": "stats"} for length in (5, 5, 12, 1, 3, 4)]
+    chunks = agent.chunk_batch_items(items, 10)
+    assert [[len(item["text"]) for item in chunk] for chunk in chunks] == [[5, 5], [12], [1, 3, 4]]
+    assert [item for chunk in chunks for item in chunk] == items
+    assert agent.chunk_batch_items([], 10) == []
+
+
+def test_chunked_batch_matches_inline(monkeypatch):
+    items = agent.normalize_batch_items(TEXTS * 4, "general")
+    inline = asyncio.run(agent.run_batch_analysis(items, 5, 2))
+
+    async def run_inline(func, *args):
+        return func(*args)
+
+    monkeypatch.setattr(agent, "ANALYSIS_INLINE_MAX_CHARS", 0)
+    monkeypatch.setattr(agent, "BATCH_CHUNK_CHARS", 100)
+    monkeypatch.setattr(agent, "run_in_process_pool", run_inline)
+    assert asyncio.run(agent.run_batch_analysis(items, 5, 2)) == inline
+
+
+def test_aggregate_batch_results():
+    items = [
+        {"text": "a" * 10, "analysis_type": "general"},
+        {"text": "b" * 20, "analysis_type": "sentiment"},
+        {"text": "c" * 30, "analysis_type": "keywords"},
+        {"text": "d" * 40, "analysis_type": "summary"},
+    ]
+    results = [
+        {
+            "sentiment": {"sentiment": "positive"},
+            "stats": {"word_count": 7},
+            "keywords": [{"keyword": "great", "frequency": 2}, {"keyword": "design", "frequency": 1}],
+        },
+        {"sentiment": "positive"},
+        [{"keyword": "design", "frequency": 3}, {"keyword": "slow", "frequency": 1}],
+        {"summary": "d"},
+    ]
+    aggregate = agent.aggregate_batch_results(items, results, top_n=2)
+    assert aggregate == {
+        "items": 4,
+        "by_analysis_type": {"general": 1, "sentiment": 1, "keywords": 1, "summary": 1},
+        "total_characters": 100,
+        "sentiment_distribution": {"positive": 2},
+        "total_words": 7,
+        "top_keywords": [{"keyword": "design", "frequency": 4}, {"keyword": "great", "frequency": 2}],
+    }
+
+
+def test_aggregate_omits_sections_no_item_produced():
+    items = [{"text": "d" * 40, "analysis_type": "summary"}]
+    aggregate = agent.aggregate_batch_results(items, [{"summary": "d"}], top_n=5)
+    assert aggregate == {"items": 1, "by_analysis_type": {"summary": 1}, "total_characters": 40}
@@ -0,0 +1,185 @@
+"""Tests for the micro-batcher."""
+import threading
+import time
+
+from batching import MicroBatcher
+
+
+def test_lone_request_is_not_delayed():
+    batcher = MicroBatcher(lambda requests: [r * 2 for r in requests], window_ms=0)
+    batcher.submit(0)  # starts the dispatcher thread
+    start = time.perf_counter()
+    assert batcher.submit(21) == 42
+    assert time.perf_counter() - start < 0.05
+    assert batcher.stats()["largest_batch"] == 1
+
+
+def test_requests_queued_during_a_batch_form_the_next_batch():
+    release = threading.Event()
+    sizes = []
+
+    def batch_fn(requests):
+        sizes.append(len(requests))
+        if len(sizes) == 1:
+            release.wait(5)
+        return [r + 1 for r in requests]
+
+    batcher = MicroBatcher(batch_fn, window_ms=0, max_batch_size=16)
+    results = {}
+
+    def submit(value):
+        results[value] = batcher.submit(value)
+
+    first = threading.Thread(target=submit, args=(0,))
+    first.start()
+    while not sizes:
+        time.sleep(0.001)
+    others = [threading.Thread(target=submit, args=(i,)) for i in range(1, 6)]
+    for thread in others:
+        thread.start()
+    while batcher._queue.qsize() < 5:
+        time.sleep(0.001)
+    release.set()
+    for thread in [first] + others:
+        thread.join()
+
+    assert sizes == [1, 5]
+    assert results == {i: i + 1 for i in range(6)}
+    assert batcher.stats()["mean_batch_size"] == 3.0
+
+
+def submit_together(batcher, requests):
+    """Submit {key: request} from concurrent threads; returns each key's result or exception."""
+    outcomes = {}
+
+    def submit(key):
+        try:
+            outcomes[key] = batcher.submit(requests[key])
+        except Exception as e:
+            outcomes[key] = e
+
+    threads = [threading.Thread(target=submit, args=(key,)) for key in requests]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def double(value):
+    if value < 0:
+        raise ValueError(f"bad request {value}")
+    return value * 2
+
+
+def test_failed_batch_only_fails_the_bad_requests():
+    release = threading.Event()
+    batch_sizes = []
+
+    def batch_fn(requests):
+        batch_sizes.append(len(requests))
+        release.wait(5)  # hold the first batch so the rest queue up together
+        return [double(value) for value in requests]
+
+    batcher = MicroBatcher(batch_fn, single_fn=double, max_batch_size=16)
+    first = threading.Thread(target=batcher.submit, args=(0,))
+    first.start()
+    while not batch_sizes:
+        time.sleep(0.001)
+
+    values = [1, -2, 3, 4, -5]
+    outcomes = {}
+    waiter = threading.Thread(target=lambda: outcomes.update(submit_together(batcher, {v: v for v in values})))
+    waiter.start()
+    while batcher._queue.qsize() < len(values):
+        time.sleep(0.001)
+    release.set()
+    waiter.join()
+    first.join()
+
+    assert batch_sizes == [1, 5]
+    assert {value: outcomes[value] for value in (1, 3, 4)} == {1: 2, 3: 6, 4: 8}
+    for value in (-2, -5):
+        assert isinstance(outcomes[value], ValueError)
+        assert str(outcomes[value]) == f"bad request {value}"
+    assert batcher.stats()["failed_batches"] == 1
+
+
+def test_without_single_fn_batch_errors_reach_every_caller():
+    def batch_fn(requests):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher(batch_fn)
+    outcomes = submit_together(batcher, {1: 1, 2: 2})
+    assert all(isinstance(e, ValueError) and str(e) == "boom" for e in outcomes.values())
+
+
+def test_malformed_candidates_do_not_fail_concurrent_jobs():
+    from model_service import PhoenixModelService
+
+    service = PhoenixModelService(use_mock=True)
+    good = [{"post_id": "c1", "text": "great tech news"}, {"post_id": "c2", "text": "sports"}]
+    bad = [{"post_id": "c3", "text": None}]
+    expected = service.score_candidates([], good)[0].tolist()
+
+    # The first request holds the dispatcher so the next three form one batch
+    release = threading.Event()
+    score_batch = service.batcher.batch_fn
+    calls = []
+
+    def held_batch_fn(requests):
+        calls.append(len(requests))
+        if len(calls) == 1:
+            release.wait(5)
+        return score_batch(requests)
+
+    service.batcher.batch_fn = held_batch_fn
+    first = threading.Thread(target=service.batcher.submit, args=(([], good),))
+    first.start()
+    while not calls:
+        time.sleep(0.001)
+
+    outcomes = {}
+    requests = {1: ([], good), 2: ([], bad), 3: ([], good)}
+    waiter = threading.Thread(target=lambda: outcomes.update(submit_together(service.batcher, requests)))
+    waiter.start()
+    while service.batcher._queue.qsize() < 3:
+        time.sleep(0.001)
+    release.set()
+    waiter.join()
+    first.join()
+
+    assert calls == [1, 3]
+    assert isinstance(outcomes[2], AttributeError)
+    assert outcomes[1][0].tolist() == expected
+    assert outcomes[3][0].tolist() == expected
+
+
+def test_real_model_batch_failure_falls_back_per_request():
+    import numpy as np
+
+    from model_service import ENGAGEMENT_HEADS, PhoenixModelService
+
+    class FakeModel:
+        def predict(self, user_history, candidates):
+            if any(candidate.get("text") is None for candidate in candidates):
+                raise ValueError("malformed candidate")
+            return np.ones(len(candidates)), np.ones((len(candidates), len(ENGAGEMENT_HEADS)))
+
+        def predict_batch(self, requests):
+            return [self.predict(*request) for request in requests]
+
+    service = PhoenixModelService(use_mock=True, micro_batching=False)
+    service.use_mock = False
+    service.model = FakeModel()
+    batcher = MicroBatcher(
+        service.score_candidates_batch, single_fn=lambda request: service.score_candidates(*request)
+    )
+
+    good = [{"post_id": "c1", "text": "tech news"}]
+    bad = [{"post_id": "c2", "text": None, "author_id": "u1"}]
+    assert batcher.submit(([], good))[0].tolist() == [1.0]
+    # Only the bad request falls back to the mock, which cannot score it either
+    outcome = submit_together(batcher, {"good": ([], good), "bad": ([], bad)})
+    assert outcome["good"][0].tolist() == [1.0]
+    assert isinstance(outcome["bad"], AttributeError)
@@ -0,0 +1,82 @@
+"""Tests for the content hash and the LRU result cache."""
+import asyncio
+
+import agent
+from cache import LRUCache, content_hash, text_digest
+
+
+def test_content_hash_is_stable_and_order_sensitive():
+    assert content_hash("a", {"x": 1, "y": 2}) == content_hash("a", {"y": 2, "x": 1})
+    assert content_hash("a", "b") != content_hash("b", "a")
+
+
+def test_content_hash_accepts_lone_surrogates():
+    assert content_hash("bad \ud800 text") != content_hash("bad \udc00 text")
+
+
+def test_text_job_with_lone_surrogate_completes():
+    text = "Great product \ud800 but the shipping was slow."
+    response = asyncio.run(agent.process_job("test_purchaser_123456789012", {"text": text, "analysis_type": "sentiment"}))
+    assert response["status"] == "completed"
+    assert response["result"]["sentiment"] == "positive"
+
+
+def test_lru_evicts_least_recently_used_by_count():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_lru_evicts_by_bytes():
+    cache = LRUCache(max_entries=100, max_bytes=10, sizeof=len)
+    cache.put("a", "xxxx")
+    cache.put("b", "yyyy")
+    cache.put("c", "zzzz")
+    assert cache.get("a") is None
+    assert len(cache) == 2 and cache.total_bytes == 8
+
+
+def test_lru_replacing_a_key_updates_its_size():
+    cache = LRUCache(max_entries=10, max_bytes=10, sizeof=len)
+    cache.put("a", "xxxxxxxx")
+    cache.put("a", "xx")
+    assert cache.total_bytes == 2
+    cache.put("b", "yyyyyyyy")
+    assert cache.get("a") == "xx" and cache.evictions == 0
+
+
+def test_lru_skips_values_larger_than_the_budget():
+    cache = LRUCache(max_entries=10, max_bytes=4, sizeof=len)
+    cache.put("a", "xx")
+    cache.put("b", "yyyyyy")
+    assert cache.get("b") is None and cache.get("a") == "xx"
+
+
+def test_lru_disabled_and_ttl(monkeypatch):
+    disabled = LRUCache(max_entries=0)
+    disabled.put("a", 1)
+    assert disabled.get("a") is None
+
+    now = [100.0]
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(max_entries=10, ttl_seconds=5)
+    cache.put("a", 1)
+    now[0] += 4
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.expirations == 1 and len(cache) == 0
+
+
+def test_text_digest_matches_a_one_shot_digest():
+    import hashlib
+
+    text = "naïve \U0001F600 text \ud800 " * 1000
+    expected = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+    assert text_digest(text, chunk_chars=7) == expected
+    assert text_digest(text) == expected
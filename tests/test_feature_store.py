@@ -0,0 +1,50 @@
+"""Tests for the candidate feature store."""
+import numpy as np
+
+from feature_store import ENTRY_OVERHEAD_BYTES, CandidateFeatureStore, candidate_key
+
+
+def lengths(candidates):
+    """One-column rows: the text length."""
+    return np.array([[len(str(c.get("text", "")))] for c in candidates], dtype=np.float64)
+
+
+def test_key_accepts_json_lists_and_objects():
+    candidate = {"post_id": "p1", "text": "hi", "author_id": ["a", "b"], "media_type": {"kind": "video"}}
+    assert candidate_key(candidate) == candidate_key(dict(candidate))
+
+
+def test_edited_post_gets_a_new_key():
+    post = {"post_id": "p1", "text": "first version"}
+    assert candidate_key(post) != candidate_key({**post, "text": "second version"})
+
+
+def test_rows_are_computed_once_and_served_from_the_store():
+    calls = []
+
+    def compute(candidates):
+        calls.append(len(candidates))
+        return lengths(candidates)
+
+    store = CandidateFeatureStore(compute, width=1, max_bytes=1 << 20)
+    batch = [{"post_id": "a", "text": "xx"}, {"post_id": "b", "text": "yyy"}, {"post_id": "a", "text": "xx"}]
+    np.testing.assert_array_equal(store.rows(batch)[:, 0], [2, 3, 2])
+    np.testing.assert_array_equal(store.rows(batch[:2])[:, 0], [2, 3])
+    assert calls == [2]
+    assert store.hits == 2
+
+
+def test_budget_counts_entry_overhead_and_evicts_lru():
+    row_bytes = 8
+    store = CandidateFeatureStore(lengths, width=1, max_bytes=3 * (row_bytes + ENTRY_OVERHEAD_BYTES))
+    assert store.capacity == 3
+
+    posts = [{"post_id": str(i), "text": "x" * i} for i in range(4)]
+    store.rows(posts[:3])
+    store.rows(posts[:1])  # post 0 is now the most recently used
+    store.rows(posts[3:])
+    assert len(store) == 3 and store.evictions == 1
+    assert store.stats()["bytes"] <= 3 * (row_bytes + ENTRY_OVERHEAD_BYTES)
+
+    store.rows([posts[1]])
+    assert store.misses == 5  # post 1 was evicted and recomputed
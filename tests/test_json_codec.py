@@ -0,0 +1,63 @@
+"""Tests for the JSON backend and incremental array decoding."""
+import json
+
+import pytest
+
+import json_codec
+
+
+def test_loads_accepts_lone_surrogate_escapes():
+    assert json_codec.loads('["\\ud800 text"]') == ["\ud800 text"]
+
+
+def test_loads_rejects_invalid_json():
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads('{"a": ')
+
+
+def test_dumps_round_trips_lone_surrogates():
+    assert json.loads(json_codec.dumps({"text": "\ud800"})) == {"text": "\ud800"}
+
+
+def test_dumps_output_is_the_same_on_both_backends(monkeypatch):
+    value = {"text": "héllo, wörld", "scores": [1, 2.5, None], "nested": {"ok": True}}
+    rendered = json_codec.dumps(value)
+    monkeypatch.setattr(json_codec, "_USE_ORJSON", False)
+    assert json_codec.dumps(value) == rendered
+    assert rendered == '{"text":"héllo, wörld","scores":[1,2.5,null],"nested":{"ok":true}}'
+
+
+@pytest.mark.parametrize("text", [
+    "[]",
+    " [ ] ",
+    '[1,"two",{"three":[3]},null,true]',
+    '\n[ 1 ,\t"two" ,\r\n {"three": [3]} , null,true ]\n',
+    '[{"text": "a, b ] c"}, "[nested]"]',
+])
+def test_iter_array_matches_json_loads(text):
+    assert list(json_codec.iter_array(text)) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "   ",
+    '{"a": 1}',
+    "[1, 2",
+    "[1 2]",
+    "[1,]",
+    "[,1]",
+    "[1] x",
+    "[1]]",
+    '["unterminated]',
+])
+def test_iter_array_rejects_malformed_input(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(json_codec.iter_array(text))
+
+
+def test_iter_array_yields_elements_before_the_error():
+    elements = json_codec.iter_array('[1, 2, oops]')
+    assert next(elements) == 1
+    assert next(elements) == 2
+    with pytest.raises(json.JSONDecodeError):
+        next(elements)
@@ -0,0 +1,36 @@
+"""Tests for the persisted TF-IDF document-frequency table."""
+import json
+import threading
+
+from keyword_index import DocumentFrequencyTable
+
+
+def test_concurrent_saves_leave_a_complete_file(tmp_path):
+    path = tmp_path / "df.json"
+    table = DocumentFrequencyTable(path=str(path), save_every=1000)
+    for i in range(200):
+        table.add_document([f"term{i}", "shared"])
+
+    threads = [threading.Thread(target=table.save) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["total_documents"] == 200
+    assert data["counts"]["shared"] == 200
+    assert [p.name for p in tmp_path.iterdir()] == ["df.json"]
+
+
+def test_add_document_saves_in_the_background(tmp_path):
+    path = tmp_path / "df.json"
+    table = DocumentFrequencyTable(path=str(path), save_every=2)
+    table.add_document(["alpha"])
+    assert table._save_thread is None
+    table.add_document(["alpha", "beta"])
+    table._save_thread.join()
+
+    reloaded = DocumentFrequencyTable(path=str(path))
+    assert reloaded.total_documents == 2
+    assert reloaded.counts == {"alpha": 2, "beta": 1}
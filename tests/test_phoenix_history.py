@@ -0,0 +1,36 @@
+"""Tests for the user-history fingerprint behind the encoded-history cache."""
+import pytest
+
+pytest.importorskip("jax")
+pytest.importorskip("haiku")
+
+from phoenix_model import PhoenixConfig, encode_history, history_fingerprint  # noqa: E402
+
+HISTORY = [{"post_id": f"post{i}", "action": "like", "timestamp": i} for i in range(10)]
+
+
+def test_fingerprint_ignores_fields_the_encoder_does_not_read():
+    retimed = [{**item, "timestamp": 0} for item in HISTORY]
+    assert history_fingerprint(HISTORY, 256) == history_fingerprint(retimed, 256)
+
+
+def test_fingerprint_only_covers_the_encoded_window():
+    assert history_fingerprint(HISTORY, 4) == history_fingerprint(HISTORY[-4:], 4)
+    assert history_fingerprint(HISTORY, 5) != history_fingerprint(HISTORY[-4:], 5)
+
+
+def test_different_encodings_get_different_fingerprints():
+    config = PhoenixConfig()
+    variants = [
+        HISTORY,
+        HISTORY[:-1] + [{"post_id": "other", "action": "like"}],
+        HISTORY[:-1] + [{"post_id": "post9", "action": "repost"}],
+        HISTORY[:-1] + [{"action": "like"}],
+        HISTORY[:-1] + [{"post_id": None, "action": "like"}],
+    ]
+    encodings = {
+        (tuple(encode_history(v, 256, config).post_ids), tuple(encode_history(v, 256, config).actions))
+        for v in variants
+    }
+    fingerprints = {history_fingerprint(v, 256) for v in variants}
+    assert len(encodings) == len(fingerprints) == len(variants)
@@ -0,0 +1,77 @@
+"""Tests for top-k candidate ranking, in one pass and in streaming chunks."""
+import json
+
+import numpy as np
+import pytest
+
+from model_service import ENGAGEMENT_HEADS, CandidateInputError, PhoenixModelService, top_k_indices
+
+
+class FixedScoreService(PhoenixModelService):
+    """Scores each candidate with its own "s" field."""
+
+    def __init__(self):
+        super().__init__(use_mock=True, micro_batching=False)
+
+    def score_candidates(self, user_history, candidates):
+        scores = np.array([candidate["s"] for candidate in candidates], dtype=np.float64)
+        return scores, np.tile(scores[:, None], (1, len(ENGAGEMENT_HEADS)))
+
+    _score = score_candidates
+
+
+def reference_order(scores, k):
+    """Stable descending sort of every score."""
+    return np.argsort(-np.asarray(scores), kind="stable")[:max(k, 0)].tolist()
+
+
+@pytest.mark.parametrize("k", [0, 1, 3, 7, 50])
+def test_top_k_indices_matches_a_stable_sort(k):
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        scores = rng.integers(0, 5, size=30).astype(np.float64)  # many ties
+        assert top_k_indices(scores, k).tolist() == reference_order(scores, k)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 8, 1000])
+@pytest.mark.parametrize("top_k", [1, 5, 40])
+def test_streaming_heap_matches_one_pass_ranking_with_ties(chunk_size, top_k):
+    service = FixedScoreService()
+    rng = np.random.default_rng(chunk_size * 100 + top_k)
+    scores = rng.integers(0, 6, size=37).astype(float).tolist()
+    candidates = [{"post_id": f"c{i}", "s": score} for i, score in enumerate(scores)]
+
+    streamed = service.rank_candidates_streaming([], candidates, top_k, chunk_size=chunk_size)
+    one_pass = service.rank_candidates([], candidates, top_k)
+
+    expected = [f"c{i}" for i in reference_order(scores, top_k)]
+    assert [r["post_id"] for r in streamed] == expected
+    assert streamed == one_pass
+    assert [r["rank"] for r in streamed] == list(range(1, len(expected) + 1))
+
+
+def test_streaming_with_no_candidates_returns_nothing():
+    assert FixedScoreService().rank_candidate_chunks([], iter([]), 5) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 100])
+def test_ranking_from_json_matches_parsed_candidates(chunk_size):
+    service = FixedScoreService()
+    candidates = [{"post_id": f"c{i}", "s": float(i % 4)} for i in range(11)]
+    # Irregular whitespace around elements and at chunk boundaries
+    text = "\n[ " + " ,\n\t".join(json.dumps(c) for c in candidates) + " ]  "
+
+    ranked, total = service.rank_candidates_json([], text, 4, chunk_size=chunk_size)
+    assert total == 11
+    assert ranked == service.rank_candidates([], candidates, 4)
+
+
+@pytest.mark.parametrize("text, max_candidates, error", [
+    ("[]", None, "required"),
+    ('[{"s": 1}, 2]', None, "array of objects"),
+    ('[{"s": 1}, {"s": 2}', None, "Invalid JSON"),
+    ('[{"s": 1}, {"s": 2}, {"s": 3}]', 2, "Too many candidates"),
+])
+def test_ranking_from_json_rejects_invalid_candidates(text, max_candidates, error):
+    with pytest.raises(CandidateInputError, match=error):
+        FixedScoreService().rank_candidates_json([], text, 3, max_candidates, chunk_size=1)
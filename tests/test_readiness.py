@@ -0,0 +1,58 @@
+"""Tests for the startup warmup readiness gate."""
+import asyncio
+
+import pytest
+
+main = pytest.importorskip("main")
+
+
+@pytest.fixture(autouse=True)
+def reset_readiness(monkeypatch):
+    monkeypatch.setattr(main, "_ready", main.threading.Event())
+    monkeypatch.setattr(main, "_readiness_message", main._readiness_message)
+    monkeypatch.setattr(main, "PHOENIX_AVAILABLE", False)
+
+
+def test_failed_warmup_stays_unavailable(monkeypatch):
+    def fail():
+        raise RuntimeError("checkpoint missing")
+
+    monkeypatch.setattr(main, "start_executors", fail)
+    main.warm_up()
+    assert not main._ready.is_set()
+    assert "checkpoint missing" in main._readiness_message
+
+
+def test_successful_warmup_reports_ready(monkeypatch):
+    monkeypatch.setattr(main, "start_executors", lambda: None)
+    main.warm_up()
+    assert main._ready.is_set()
+    assert main._readiness_message == "Server operational"
+
+
+def test_availability_handler_follows_warmup(monkeypatch):
+    assert asyncio.run(main.availability())["status"] == "unavailable"
+
+    monkeypatch.setattr(main, "start_executors", lambda: None)
+    main.warm_up()
+    assert asyncio.run(main.availability()) == {
+        "status": "available", "type": "masumi-agent", "message": "Server operational"
+    }
+
+
+def test_availability_response_reaches_masumi_endpoint():
+    from fastapi.testclient import TestClient
+    from masumi import Config, create_masumi_app
+
+    app = create_masumi_app(
+        config=Config(payment_service_url="http://127.0.0.1:9", payment_api_key="x"),
+        agent_identifier="test-agent",
+        seller_vkey="abc",
+        start_job_handler=main.process_job_json,
+        input_schema_handler=main.INPUT_SCHEMA,
+        availability_handler=main.availability
+    )
+    client = TestClient(app)
+    assert client.get("/availability").json()["status"] == "unavailable"
+    main._ready.set()
+    assert client.get("/availability").json()["status"] == "available"
@@ -0,0 +1,95 @@
+"""Tests for recommendation job validation and ranking."""
+import asyncio
+import json
+
+import pytest
+
+import agent
+
+HISTORY = [{"post_id": "p1", "action": "like", "timestamp": 1734567890}]
+CANDIDATES = [{"post_id": f"c{i}", "text": f"candidate post number {i}", "author_id": "u1"} for i in range(5)]
+
+
+def run_job(**fields):
+    input_data = {"analysis_type": "recommendations", "user_history": json.dumps(HISTORY),
+                  "candidates": json.dumps(CANDIDATES), **fields}
+    return asyncio.run(agent.process_job("test_purchaser_123456789012", input_data))
+
+
+@pytest.mark.parametrize("top_k", [0, -1, "3", 2.5])
+def test_invalid_top_k_fails_the_job(top_k):
+    response = run_job(top_k=top_k)
+    assert response["status"] == "failed"
+    assert "top_k" in response["error"]
+
+
+def test_top_k_limits_the_recommendations():
+    response = run_job(top_k=2)
+    assert response["status"] == "completed"
+    assert [rec["rank"] for rec in response["result"]["recommendations"]] == [1, 2]
+
+
+def test_candidates_with_json_valued_fields_are_ranked():
+    candidates = [{"post_id": "c1", "text": "tech news", "author_id": {"id": 7}, "media_type": ["video"]}]
+    response = run_job(candidates=json.dumps(candidates), top_k=1)
+    assert response["status"] == "completed"
+    assert response["result"]["recommendations"][0]["post_id"] == "c1"
+
+
+def test_cache_key_does_not_build_the_model_service(monkeypatch):
+    import model_service
+
+    monkeypatch.setattr(model_service, "_model_service", None)
+    monkeypatch.setenv("USE_MOCK_MODEL", "false")
+    monkeypatch.setenv("PHOENIX_MODEL_PATH", "/nonexistent/checkpoint")
+    input_data = {"user_history": HISTORY, "candidates": CANDIDATES}
+    key = agent.build_cache_key(input_data, "recommendations", 10, 3)
+    assert model_service._model_service is None
+    assert key == agent.build_cache_key(input_data, "recommendations", 10, 3)
+
+
+def test_model_version_names_the_checkpoint(monkeypatch, tmp_path):
+    import model_service
+
+    monkeypatch.setattr(model_service, "_model_service", None)
+    monkeypatch.setattr(model_service, "JAX_AVAILABLE", True)
+    monkeypatch.setenv("USE_MOCK_MODEL", "false")
+    monkeypatch.setenv("PHOENIX_MODEL_PATH", str(tmp_path))
+    real = model_service.serving_model_version()
+    assert str(tmp_path) in real and not real.endswith("-mock")
+
+    monkeypatch.setenv("PHOENIX_QUANTIZATION", "int8")
+    assert model_service.serving_model_version() != real
+
+    monkeypatch.setenv("PHOENIX_MODEL_PATH", str(tmp_path / "missing"))
+    assert model_service.serving_model_version().endswith("-mock")
+
+
+@pytest.mark.parametrize("candidates, error", [
+    ('[{"post_id": "c1", "text": "x"}, ', "Invalid JSON"),
+    ('[1, 2]', "array of objects"),
+    (json.dumps(CANDIDATES), "Too many candidates"),
+])
+def test_streamed_candidate_errors_fail_the_job(monkeypatch, candidates, error):
+    monkeypatch.setattr(agent, "CANDIDATES_STREAMING_MIN_CHARS", 1)
+    monkeypatch.setattr(agent, "RECOMMENDATION_MAX_CANDIDATES", 3)
+    response = run_job(candidates=candidates)
+    assert response["status"] == "failed"
+    assert error in response["error"]
+    assert "result" not in response
+
+
+def test_streamed_candidates_rank_like_parsed_ones(monkeypatch):
+    parsed = run_job(top_k=3)
+    monkeypatch.setattr(agent, "CANDIDATES_STREAMING_MIN_CHARS", 1)
+    agent.get_result_cache().clear()
+    streamed = run_job(top_k=3)
+    assert streamed["status"] == "completed"
+    assert streamed["result"]["recommendations"] == parsed["result"]["recommendations"]
+
+
+def test_streamed_cache_key_digests_the_raw_string():
+    raw = json.dumps(CANDIDATES)
+    key = agent.build_cache_key({"user_history": HISTORY, "candidates": raw}, "recommendations", 10, 3)
+    assert key == agent.build_cache_key({"user_history": HISTORY, "candidates": raw}, "recommendations", 10, 3)
+    assert key != agent.build_cache_key({"user_history": HISTORY, "candidates": raw + " "}, "recommendations", 10, 3)
@@ -0,0 +1,98 @@
+"""Tests for the TextRank summarizer."""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from summarizer import prune_terms, sentence_term_matrix, similarity_matrix, textrank
+
+SENTENCES = [
+    "Solar panels convert sunlight into electricity for homes.",
+    "My cat sleeps all day on the warm windowsill.",
+    "Solar electricity lowers energy bills for many homes.",
+    "Battery storage keeps solar electricity available at night.",
+    "The bakery sells fresh bread every morning.",
+    "Homes with solar panels and battery storage need less grid energy.",
+]
+
+
+def test_selects_central_sentences_in_document_order():
+    selected = textrank(SENTENCES, 3)
+    assert selected == sorted(selected)
+    assert set(selected) <= {0, 2, 3, 5}
+    assert 1 not in selected and 4 not in selected
+
+
+@pytest.mark.parametrize("num_sentences, expected", [(0, []), (-2, []), (6, list(range(6))), (9, list(range(6)))])
+def test_sentence_count_is_clamped(num_sentences, expected):
+    assert textrank(SENTENCES, num_sentences) == expected
+
+
+def test_ties_prefer_earlier_sentences():
+    # Identical sentences have identical scores
+    sentences = ["Alpha beta gamma delta."] * 5
+    assert textrank(sentences, 2) == [0, 1]
+    # Sentences without shared terms all rank equally
+    assert textrank(["One apple.", "Two pears.", "Three plums.", "Four limes."], 2) == [0, 1]
+
+
+def test_long_documents_are_prefiltered_by_centroid_similarity():
+    on_topic = [f"Solar energy storage report number {i} covers solar energy." for i in range(30)]
+    off_topic = [f"Unrelated zebra {i} giraffe {i} llama {i}." for i in range(30)]
+    sentences = [s for pair in zip(on_topic, off_topic) for s in pair]
+
+    selected = textrank(sentences, 3, max_sentences=10)
+    assert len(selected) == 3 and selected == sorted(selected)
+    assert all(index % 2 == 0 for index in selected)
+
+
+def test_matrix_rows_are_normalized_and_grouped_by_term():
+    rows, cols, weights = sentence_term_matrix(SENTENCES + ["Solar solar SOLAR."])
+    assert np.all(np.diff(cols) >= 0)
+    norms = np.bincount(rows, weights=weights * weights)
+    np.testing.assert_allclose(norms[norms > 0], 1.0)
+    # Repeated terms count once per sentence
+    assert np.count_nonzero(rows == len(SENTENCES)) == 1
+
+
+def test_pruning_drops_single_sentence_and_most_widespread_terms():
+    rows = np.array([0, 1, 2, 3, 0, 1, 2])
+    cols = np.array([0, 0, 0, 0, 1, 1, 2])
+    weights = np.ones(7)
+    # term 0: 4 sentences (16 pairs), term 1: 2 sentences (4 pairs), term 2: 1 sentence
+    kept_rows, kept_cols, _ = prune_terms(rows, cols, weights, max_pairs=10)
+    assert kept_cols.tolist() == [1, 1]
+    assert kept_rows.tolist() == [0, 1]
+    assert prune_terms(rows, cols, weights, max_pairs=20)[1].tolist() == [0, 0, 0, 0, 1, 1]
+
+
+def test_similarity_matches_dense_cosine():
+    rows, cols, weights = sentence_term_matrix(SENTENCES * 5)  # terms spanning both dense and sparse paths
+    n = len(SENTENCES) * 5
+    dense = np.zeros((n, cols.max() + 1))
+    dense[rows, cols] = weights
+    expected = dense @ dense.T
+    np.fill_diagonal(expected, 0.0)
+    np.testing.assert_allclose(similarity_matrix(rows, cols, weights, n), expected, atol=1e-12)
+
+
+def test_results_do_not_depend_on_the_hash_seed():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "import random, benchmark\n"
+        "from summarizer import sentence_term_matrix, textrank\n"
+        "from text_document import TextDocument\n"
+        "sentences = list(TextDocument(benchmark.generate_text(20000, random.Random(3))).sentences)\n"
+        "rows, cols, weights = sentence_term_matrix(sentences)\n"
+        "print(textrank(sentences, 3), cols.tolist() == sorted(cols.tolist()), weights.sum().hex())\n"
+    )
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script], cwd=root, capture_output=True, text=True,
+            env={**os.environ, "PYTHONHASHSEED": seed}, check=True
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(outputs) == 1
@@ -0,0 +1,79 @@
+"""Tests for the shared text segmentation."""
+import asyncio
+
+import pytest
+
+import agent
+import text_document
+from text_document import TextDocument
+
+SURROGATE_TEXT = "Great product \ud800 overall. The shipping was slow \udfff but fine! Would buy again."
+
+SAMPLE_TEXTS = [
+    "",
+    "   ",
+    "One sentence without a stop",
+    "First one. Second one!  Third one?\tFourth (\"quoted.\") fifth.\n\nNew para\n \ngraph",
+    "Ends with a quote.\" Then (a bracket!) and... ellipsis? Yes.",
+    "Ünïcödé wörds, ÇAPS and \u00a0non-breaking\u2003spaces. Digits 123 and ٣٤٥ too!",
+    "İstanbul ΣΊΣΥΦΟΣ ǅ (punctuation) [only] {here}; ... !!! words: a, b.",
+    "seps\x1cand\x1dmore\x1e\x1f\x85text\u2028line\u2029para. end.",
+    SURROGATE_TEXT,
+]
+
+
+@pytest.fixture(params=["str", "numpy"])
+def segmentation(request, monkeypatch):
+    """Run a test once on the str path and once on the NumPy path."""
+    threshold = 0 if request.param == "numpy" else 1 << 30
+    monkeypatch.setattr(text_document, "VECTORIZE_MIN_CHARS", threshold)
+    monkeypatch.setattr(text_document, "CLASSIFY_MIN_CHARS", threshold)
+    return request.param
+
+
+@pytest.mark.parametrize("text", SAMPLE_TEXTS)
+def test_str_and_numpy_paths_agree(text, monkeypatch):
+    views = {}
+    for threshold in (0, 1 << 30):
+        monkeypatch.setattr(text_document, "VECTORIZE_MIN_CHARS", threshold)
+        monkeypatch.setattr(text_document, "CLASSIFY_MIN_CHARS", threshold)
+        doc = TextDocument(text * 3)
+        assert doc.vectorized == (threshold == 0)
+        views[threshold] = (
+            list(doc.words), list(doc.sentences), doc.char_classes,
+            doc.unique_words, doc.keyword_tokens
+        )
+    assert views[0] == views[1 << 30]
+
+
+def test_threshold_selects_path(monkeypatch):
+    monkeypatch.setattr(text_document, "VECTORIZE_MIN_CHARS", 10)
+    assert isinstance(TextDocument("short").words, list)
+    assert isinstance(TextDocument("long enough text").words, text_document.TextSpans)
+
+
+def test_keyword_tokens_are_lowercase_and_stripped():
+    doc = TextDocument("(Hello), WORLD! ... [x]")
+    assert doc.keyword_tokens == ["hello", "world", "", "x"]
+
+
+def test_lone_surrogates_are_segmented(segmentation):
+    doc = TextDocument(SURROGATE_TEXT)
+    if segmentation == "numpy":
+        assert doc.codes[SURROGATE_TEXT.index("\ud800")] == 0xD800
+    assert list(doc.words) == SURROGATE_TEXT.split()
+    assert len(doc.sentences) == 3
+    assert doc.char_classes == {
+        "alpha": sum(c.isalpha() for c in SURROGATE_TEXT),
+        "digit": sum(c.isdigit() for c in SURROGATE_TEXT),
+        "space": sum(c.isspace() for c in SURROGATE_TEXT),
+    }
+
+
+@pytest.mark.parametrize("analysis_type", ["stats", "keywords", "summary", "general"])
+def test_jobs_with_lone_surrogates_complete(analysis_type, segmentation):
+    response = asyncio.run(agent.process_job(
+        "test_purchaser_123456789012",
+        {"text": SURROGATE_TEXT, "analysis_type": analysis_type, "summary_sentences": 1}
+    ))
+    assert response["status"] == "completed"